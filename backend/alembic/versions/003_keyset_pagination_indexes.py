@@ -0,0 +1,45 @@
+"""keyset pagination indexes for products, orders, users
+
+Revision ID: 003_keyset
+Revises: 002_variants
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "003_keyset"
+down_revision: Union[str, None] = "002_variants"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 상품 목록: 활성 상품만 (created_at, id) / (selling_price, id) 정렬
+    op.create_index(
+        "ix_products_active_created_id",
+        "products",
+        ["created_at", "id"],
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "ix_products_active_price_id",
+        "products",
+        ["selling_price", "id"],
+        postgresql_where=sa.text("is_active"),
+    )
+    # 내 주문 목록 / 관리자 주문 목록
+    op.create_index("ix_orders_user_created_id", "orders", ["user_id", "created_at", "id"])
+    op.create_index("ix_orders_created_id", "orders", ["created_at", "id"])
+    # 관리자 회원 목록
+    op.create_index("ix_users_created_id", "users", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_id", "users")
+    op.drop_index("ix_orders_created_id", "orders")
+    op.drop_index("ix_orders_user_created_id", "orders")
+    op.drop_index("ix_products_active_price_id", "products")
+    op.drop_index("ix_products_active_created_id", "products")
@@ -0,0 +1,45 @@
+"""product search: generated search_text column + pg_trgm GIN index
+
+Revision ID: 004_search
+Revises: 003_keyset
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "004_search"
+down_revision: Union[str, None] = "003_keyset"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # STORED 생성 컬럼 추가는 테이블 재작성 (대량 데이터면 점검 시간에 실행)
+    op.add_column(
+        "products",
+        sa.Column(
+            "search_text",
+            sa.Text(),
+            sa.Computed(
+                "lower(coalesce(name, '') || ' ' || coalesce(name_ko, '') || ' ' "
+                "|| coalesce(brand, '') || ' ' || coalesce(category, ''))",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index(
+        "ix_products_search_trgm",
+        "products",
+        ["search_text"],
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_search_trgm", "products")
+    op.drop_column("products", "search_text")
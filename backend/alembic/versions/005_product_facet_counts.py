@@ -0,0 +1,49 @@
+"""product_facet_counts summary table (category x brand x price bucket)
+
+Revision ID: 005_facets
+Revises: 004_search
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "005_facets"
+down_revision: Union[str, None] = "004_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_facet_counts",
+        sa.Column("category", sa.String(100), nullable=False),
+        sa.Column("brand", sa.String(100), nullable=False),
+        sa.Column("price_bucket", sa.Integer(), nullable=False),
+        sa.Column("product_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("category", "brand", "price_bucket"),
+    )
+    # 초기 집계 (구간 경계는 app.services.facets.PRICE_BUCKETS와 동일)
+    op.execute(
+        """
+        INSERT INTO product_facet_counts (category, brand, price_bucket, product_count)
+        SELECT coalesce(category, ''), coalesce(brand, ''),
+               CASE WHEN selling_price < 10000 THEN 0
+                    WHEN selling_price < 30000 THEN 1
+                    WHEN selling_price < 50000 THEN 2
+                    WHEN selling_price < 100000 THEN 3
+                    WHEN selling_price < 200000 THEN 4
+                    ELSE 5 END AS price_bucket,
+               count(*)
+        FROM products
+        WHERE is_active
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("product_facet_counts")
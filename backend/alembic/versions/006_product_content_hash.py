@@ -0,0 +1,25 @@
+"""products.content_hash for sync change detection
+
+Revision ID: 006_content_hash
+Revises: 005_facets
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "006_content_hash"
+down_revision: Union[str, None] = "005_facets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 행은 NULL → 다음 sync에서 값 비교 후 해시만 기록 (변경 없으면 다른 컬럼은 쓰지 않음)
+    op.add_column("products", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("products", "content_hash")
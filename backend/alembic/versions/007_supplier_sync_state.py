@@ -0,0 +1,35 @@
+"""supplier_sync_states watermark table, products.removed_at
+
+Revision ID: 007_sync_state
+Revises: 006_content_hash
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "007_sync_state"
+down_revision: Union[str, None] = "006_content_hash"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "supplier_sync_states",
+        sa.Column("supplier_id", sa.Integer(), sa.ForeignKey("suppliers.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_full_sync_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_result", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("supplier_id"),
+    )
+    # 관리자가 끈 상품과 구분: sync가 비활성화한 상품만 다시 나타나면 재활성화
+    op.add_column("products", sa.Column("removed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("products", "removed_at")
+    op.drop_table("supplier_sync_states")
@@ -0,0 +1,40 @@
+"""shipment_events (shipment_id, event_time) unique, shipments.last_checked_at
+
+Revision ID: 008_tracking_dedup
+Revises: 007_sync_state
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "008_tracking_dedup"
+down_revision: Union[str, None] = "007_sync_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 중복 이벤트 정리 (가장 먼저 저장된 행만 유지) 후 유니크 제약 → INSERT ... ON CONFLICT DO NOTHING
+    op.execute(
+        """
+        DELETE FROM shipment_events a
+        USING shipment_events b
+        WHERE a.shipment_id = b.shipment_id
+          AND a.event_time = b.event_time
+          AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_shipment_events_shipment_time", "shipment_events", ["shipment_id", "event_time"]
+    )
+    op.add_column("shipments", sa.Column("last_checked_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_shipments_status_last_checked", "shipments", ["status", "last_checked_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shipments_status_last_checked", table_name="shipments")
+    op.drop_column("shipments", "last_checked_at")
+    op.drop_constraint("uq_shipment_events_shipment_time", "shipment_events", type_="unique")
@@ -0,0 +1,32 @@
+"""shipments.next_poll_at (adaptive tracking poll schedule)
+
+Revision ID: 009_shipment_next_poll
+Revises: 008_tracking_dedup
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "009_shipment_next_poll"
+down_revision: Union[str, None] = "008_tracking_dedup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 배송은 즉시 조회 대상 (server_default now()로 채움), 첫 조회 후 상태별 주기로 재계산
+    op.add_column(
+        "shipments",
+        sa.Column("next_poll_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.drop_index("ix_shipments_status_last_checked", table_name="shipments")
+    op.create_index("ix_shipments_status_next_poll", "shipments", ["status", "next_poll_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_shipments_status_next_poll", table_name="shipments")
+    op.create_index("ix_shipments_status_last_checked", "shipments", ["status", "last_checked_at"])
+    op.drop_column("shipments", "next_poll_at")
@@ -1,12 +1,17 @@
 """
 Admin API Router
 관리자 전용: 회원 목록, 주문 목록, 상품 목록
+조회 전용이므로 읽기 복제본(get_read_db) 사용
+목록은 page(OFFSET) 또는 cursor(keyset) 지원. 응답 본문이 배열이므로 다음 cursor는 X-Next-Cursor 헤더로 전달
 """
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.db.session import get_db
+from app.core.pagination import KeysetOrder, apply_keyset, split_page
+from app.db.session import get_read_db
+from app.db.loaders import ORDER_OUT_OPTIONS, PRODUCT_OUT_OPTIONS
 from app.db.models import User, Order, Product
 from app.core.deps import get_admin_user
 from app.schemas.user import UserOut
@@ -16,6 +21,24 @@ from app.db.models import OrderStatus as OrderStatusEnum
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+USER_NEWEST = KeysetOrder("newest", (User.created_at, User.id), descending=True)
+ORDER_NEWEST = KeysetOrder("newest", (Order.created_at, Order.id), descending=True)
+PRODUCT_NEWEST = KeysetOrder("newest", (Product.created_at, Product.id), descending=True)
+
+
+async def _fetch_page(db: AsyncSession, query, order: KeysetOrder, page: int, limit: int,
+                      cursor: Optional[str], response: Response) -> list:
+    """page/cursor 공통 조회. 다음 페이지가 있으면 X-Next-Cursor 헤더 설정."""
+    page_query = apply_keyset(query, order, cursor, limit)
+    if not cursor:
+        page_query = page_query.offset((page - 1) * limit)
+    result = await db.execute(page_query)
+    rows, next_cursor = split_page(order, result.scalars().all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
 
 def _order_to_out(order: Order) -> OrderOut:
     from app.schemas.order import OrderStatus as OrderStatusSchema
@@ -34,14 +57,15 @@ def _order_to_out(order: Order) -> OrderOut:
 
 @router.get("/users", response_model=List[UserOut])
 async def list_users(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값. 지정 시 page 무시"),
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """관리자: 전체 회원 목록 (가입일 최신순)."""
-    q = db.query(User).order_by(User.created_at.desc())
-    users = q.offset((page - 1) * limit).limit(limit).all()
+    users = await _fetch_page(db, select(User), USER_NEWEST, page, limit, cursor, response)
     return [
         UserOut(
             id=u.id,
@@ -58,33 +82,35 @@ async def list_users(
 
 @router.get("/orders", response_model=List[OrderOut])
 async def list_orders(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
     status: str | None = Query(None, description="주문 상태 필터"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값. 지정 시 page 무시"),
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """관리자: 전체 주문 목록 (최신순)."""
-    q = db.query(Order).order_by(Order.created_at.desc())
+    q = select(Order).options(*ORDER_OUT_OPTIONS)
     if status:
         try:
-            q = q.filter(Order.status == OrderStatusEnum(status))
+            q = q.where(Order.status == OrderStatusEnum(status))
         except ValueError:
             pass
-    orders = q.offset((page - 1) * limit).limit(limit).all()
+    orders = await _fetch_page(db, q, ORDER_NEWEST, page, limit, cursor, response)
     return [_order_to_out(o) for o in orders]
 
 
 @router.get("/stats")
 async def admin_stats(
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """관리자: 대시보드용 간단 통계."""
-    users_total = db.query(User).count()
-    orders_total = db.query(Order).count()
-    orders_paid = db.query(Order).filter(Order.paid_at.isnot(None)).count()
-    products_total = db.query(Product).count()
+    users_total = await db.scalar(select(func.count()).select_from(User))
+    orders_total = await db.scalar(select(func.count()).select_from(Order))
+    orders_paid = await db.scalar(select(func.count()).select_from(Order).where(Order.paid_at.isnot(None)))
+    products_total = await db.scalar(select(func.count()).select_from(Product))
     return {
         "users_total": users_total,
         "orders_total": orders_total,
@@ -95,15 +121,17 @@ async def admin_stats(
 
 @router.get("/products", response_model=List[ProductOut])
 async def list_products(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
     category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값. 지정 시 page 무시"),
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """관리자: 전체 상품 목록 (최신순)."""
-    q = db.query(Product).order_by(Product.created_at.desc())
+    q = select(Product).options(*PRODUCT_OUT_OPTIONS)
     if category:
-        q = q.filter(Product.category == category)
-    products = q.offset((page - 1) * limit).limit(limit).all()
+        q = q.where(Product.category == category)
+    products = await _fetch_page(db, q, PRODUCT_NEWEST, page, limit, cursor, response)
     return products
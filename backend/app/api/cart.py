@@ -3,10 +3,12 @@ Cart API Router
 장바구니 관리 API
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.db.session import get_db
+from app.db.loaders import CART_OUT_OPTIONS
 from app.db.models import Cart, CartItem, Product, User
 from app.schemas.order import CartItemAdd, CartItemUpdate, CartResponse, CartItemResponse
 from app.core.deps import get_current_user
@@ -18,14 +20,23 @@ FREE_SHIPPING_THRESHOLD = 50000  # KRW
 DEFAULT_SHIPPING_FEE = 3000  # KRW
 
 
-def get_or_create_cart(db: Session, user: User) -> Cart:
+async def _load_cart(db: AsyncSession, user_id: int):
+    """장바구니 + 아이템/상품/이미지 일괄 로드 (변경 후 재조회 시에도 최신값으로 덮어씀)"""
+    return await db.scalar(
+        select(Cart)
+        .where(Cart.user_id == user_id)
+        .options(*CART_OUT_OPTIONS)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def get_or_create_cart(db: AsyncSession, user: User) -> Cart:
     """사용자의 장바구니를 가져오거나 없으면 생성"""
-    cart = db.query(Cart).filter(Cart.user_id == user.id).first()
+    cart = await _load_cart(db, user.id)
     if not cart:
-        cart = Cart(user_id=user.id)
-        db.add(cart)
-        db.commit()
-        db.refresh(cart)
+        db.add(Cart(user_id=user.id))
+        await db.commit()
+        cart = await _load_cart(db, user.id)
     return cart
 
 
@@ -82,10 +93,10 @@ def calculate_cart_totals(cart: Cart) -> dict:
 @router.get("", response_model=CartResponse)
 async def get_cart(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """장바구니 조회"""
-    cart = get_or_create_cart(db, current_user)
+    cart = await get_or_create_cart(db, current_user)
     return calculate_cart_totals(cart)
 
 
@@ -93,14 +104,16 @@ async def get_cart(
 async def add_cart_item(
     item: CartItemAdd,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """장바구니에 상품 추가"""
     # 상품 존재 확인
-    product = db.query(Product).filter(
-        Product.id == item.product_id,
-        Product.is_active == True
-    ).first()
+    product = await db.scalar(
+        select(Product).where(
+            Product.id == item.product_id,
+            Product.is_active == True
+        )
+    )
     
     if not product:
         raise HTTPException(
@@ -115,14 +128,11 @@ async def add_cart_item(
             detail=f"재고가 부족합니다 (남은 수량: {product.stock})"
         )
     
-    cart = get_or_create_cart(db, current_user)
+    cart = await get_or_create_cart(db, current_user)
     
     # 001: (cart_id, product_id) 유일 — 같은 상품이면 수량만 추가
     variant_info = {"variant_id": item.variant_id} if item.variant_id else None
-    existing_item = db.query(CartItem).filter(
-        CartItem.cart_id == cart.id,
-        CartItem.product_id == item.product_id
-    ).first()
+    existing_item = next((ci for ci in cart.items if ci.product_id == item.product_id), None)
     
     if existing_item:
         existing_item.quantity += item.quantity
@@ -137,8 +147,8 @@ async def add_cart_item(
         )
         db.add(cart_item)
     
-    db.commit()
-    db.refresh(cart)
+    await db.commit()
+    cart = await _load_cart(db, current_user.id)
     
     return calculate_cart_totals(cart)
 
@@ -148,15 +158,12 @@ async def update_cart_item(
     item_id: int,
     update: CartItemUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """장바구니 아이템 수량 변경"""
-    cart = get_or_create_cart(db, current_user)
+    cart = await get_or_create_cart(db, current_user)
     
-    cart_item = db.query(CartItem).filter(
-        CartItem.id == item_id,
-        CartItem.cart_id == cart.id
-    ).first()
+    cart_item = next((ci for ci in cart.items if ci.id == item_id), None)
     
     if not cart_item:
         raise HTTPException(
@@ -173,8 +180,8 @@ async def update_cart_item(
         )
     
     cart_item.quantity = update.quantity
-    db.commit()
-    db.refresh(cart)
+    await db.commit()
+    cart = await _load_cart(db, current_user.id)
     
     return calculate_cart_totals(cart)
 
@@ -183,15 +190,12 @@ async def update_cart_item(
 async def remove_cart_item(
     item_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """장바구니에서 상품 제거"""
-    cart = get_or_create_cart(db, current_user)
+    cart = await get_or_create_cart(db, current_user)
     
-    cart_item = db.query(CartItem).filter(
-        CartItem.id == item_id,
-        CartItem.cart_id == cart.id
-    ).first()
+    cart_item = next((ci for ci in cart.items if ci.id == item_id), None)
     
     if not cart_item:
         raise HTTPException(
@@ -199,17 +203,17 @@ async def remove_cart_item(
             detail="장바구니 아이템을 찾을 수 없습니다"
         )
     
-    db.delete(cart_item)
-    db.commit()
+    await db.delete(cart_item)
+    await db.commit()
 
 
 @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
 async def clear_cart(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """장바구니 비우기"""
-    cart = get_or_create_cart(db, current_user)
+    cart = await get_or_create_cart(db, current_user)
     
-    db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
-    db.commit()
+    await db.execute(delete(CartItem).where(CartItem.cart_id == cart.id))
+    await db.commit()
@@ -5,10 +5,14 @@ Orders API Router
 import uuid
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.db.session import get_db
+from app.db.loaders import ORDER_OUT_OPTIONS
+from app.core.pagination import KeysetOrder, apply_keyset, split_page
 from app.db.models import User, Order, OrderItem, OrderStatus, Cart, CartItem, Address, Product
 from app.schemas.order import OrderCreate, OrderOut, OrderDetailOut, OrderListOut, OrderItemOut
 from app.core.deps import get_current_user
@@ -17,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+ORDER_NEWEST = KeysetOrder("newest", (Order.created_at, Order.id), descending=True)
+
 
 def _order_to_out(order: Order) -> OrderOut:
     """Order 모델 → OrderOut (payment_status는 paid_at 기준)."""
@@ -36,18 +42,24 @@ def _order_to_out(order: Order) -> OrderOut:
 async def list_orders(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor. 지정 시 page 무시"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    """내 주문 목록 (페이지네이션)."""
-    q = db.query(Order).filter(Order.user_id == current_user.id).order_by(Order.created_at.desc())
-    total = q.count()
-    items = q.offset((page - 1) * limit).limit(limit).all()
+    """내 주문 목록 (page 또는 cursor 페이지네이션, 최신순)."""
+    q = select(Order).where(Order.user_id == current_user.id)
+    total = await db.scalar(select(func.count()).select_from(q.subquery()))
+    page_query = apply_keyset(q.options(*ORDER_OUT_OPTIONS), ORDER_NEWEST, cursor, limit)
+    if not cursor:
+        page_query = page_query.offset((page - 1) * limit)
+    result = await db.execute(page_query)
+    items, next_cursor = split_page(ORDER_NEWEST, result.scalars().all(), limit)
     return OrderListOut(
         items=[_order_to_out(o) for o in items],
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -55,10 +67,14 @@ async def list_orders(
 async def get_order(
     order_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """주문 상세 조회 (본인만)."""
-    order = db.query(Order).filter(Order.id == order_id, Order.user_id == current_user.id).first()
+    order = await db.scalar(
+        select(Order)
+        .where(Order.id == order_id, Order.user_id == current_user.id)
+        .options(*ORDER_OUT_OPTIONS)
+    )
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="주문을 찾을 수 없습니다.")
     payment_status = "completed" if order.paid_at else "pending"
@@ -101,13 +117,22 @@ async def get_order(
 async def create_order(
     body: OrderCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """장바구니 기반 주문 생성. 주소는 address_id로 지정."""
-    address = db.query(Address).filter(Address.id == body.address_id, Address.user_id == current_user.id).first()
+    address = await db.scalar(
+        select(Address).where(Address.id == body.address_id, Address.user_id == current_user.id)
+    )
     if not address:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="배송지를 찾을 수 없습니다.")
-    cart = db.query(Cart).filter(Cart.user_id == current_user.id).first()
+    cart = await db.scalar(
+        select(Cart)
+        .where(Cart.user_id == current_user.id)
+        .options(
+            selectinload(Cart.items).selectinload(CartItem.product),
+            selectinload(Cart.items).selectinload(CartItem.variant),
+        )
+    )
     if not cart or not cart.items:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="장바구니가 비어 있습니다.")
     total = 0
@@ -150,7 +175,7 @@ async def create_order(
             notes=body.note,
         )
         db.add(order)
-        db.flush()
+        await db.flush()
         for d in order_items_data:
             oi = OrderItem(
                 order_id=order.id,
@@ -163,12 +188,12 @@ async def create_order(
                 variant_id=d.get("variant_id"),
             )
             db.add(oi)
-        db.query(CartItem).filter(CartItem.cart_id == cart.id).delete()
-        db.commit()
-        db.refresh(order)
+        await db.execute(delete(CartItem).where(CartItem.cart_id == cart.id))
+        await db.commit()
+        await db.refresh(order, attribute_names=["created_at", "items"])
         return _order_to_out(order)
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.exception("Order creation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
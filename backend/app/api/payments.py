@@ -4,7 +4,8 @@ Payments API Router
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.deps import get_current_user
@@ -65,10 +66,10 @@ class ApproveIn(BaseModel):
 async def prepare_payment(
     body: PrepareIn,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """결제 준비 (결제창 URL 등 반환)."""
-    order = db.query(Order).filter(Order.id == body.order_id, Order.user_id == current_user.id).first()
+    order = await db.scalar(select(Order).where(Order.id == body.order_id, Order.user_id == current_user.id))
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="주문을 찾을 수 없습니다.")
     if order.paid_at:
@@ -93,7 +94,7 @@ async def prepare_payment(
         )
     # 콜백에서 payment_id를 안정적으로 찾을 수 있도록 저장
     order.payment_id = result.payment_id
-    db.commit()
+    await db.commit()
     return {
         "payment_id": result.payment_id,
         "payment_url": payment_url,
@@ -109,13 +110,13 @@ async def approve_callback(
     gateway: str = "kakao_pay",
     payment_id: str | None = None,
     tid: str | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     PG 리다이렉트 콜백(GET).
     카카오/네이버 콜백을 수신해 서버에서 승인 확정까지 처리.
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = await db.get(Order, order_id)
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="주문을 찾을 수 없습니다.")
 
@@ -153,7 +154,7 @@ async def approve_callback(
     order.payment_id = result.payment_id
     order.paid_at = datetime.utcnow()
     order.status = OrderStatus.PAID
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -200,10 +201,10 @@ async def fail_callback(
 async def approve_payment(
     body: ApproveIn,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """결제 승인 (PG 리다이렉트 후 pg_token으로 호출). 성공 시 주문에 paid_at, payment_id 반영."""
-    order = db.query(Order).filter(Order.id == body.order_id, Order.user_id == current_user.id).first()
+    order = await db.scalar(select(Order).where(Order.id == body.order_id, Order.user_id == current_user.id))
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="주문을 찾을 수 없습니다.")
 
@@ -232,7 +233,7 @@ async def approve_payment(
     order.payment_id = result.payment_id
     order.paid_at = datetime.utcnow()
     order.status = OrderStatus.PAID
-    db.commit()
+    await db.commit()
     return {"success": True, "payment_id": result.payment_id, "status": result.status, "order_id": body.order_id, "data": result.data}
 
 
@@ -1,24 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.session import get_db
-from app.db.models import Product, ProductVariant
-from app.schemas.product import ProductOut, ProductListOut, ProductCreate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Tuple
+from app.core.cache import (
+    CATEGORIES_TAG, FACETS_TAG, PRODUCT_LIST_TAG, category_tag, product_tag, response_cache,
+)
+from app.core.config import settings
+from app.core.http_cache import is_not_modified, latest, make_etag, not_modified, with_validators
+from app.core.pagination import KeysetOrder, apply_keyset, split_page
+from app.db.session import get_read_db
+from app.db.loaders import PRODUCT_OUT_OPTIONS
+from app.db.models import Product, ProductFacetCount, ProductVariant
+from app.schemas.product import ProductOut, ProductListOut, ProductCreate, ProductFacetsOut
+from app.services.counting import count_rows
+from app.services.facets import PRICE_BUCKETS, get_facets, price_bucket_filter
+from app.services.search import normalize_query, search_filter, search_rank
 
 router = APIRouter()
 
+# 목록 정렬 (keyset 키: 마지막 컬럼 id로 유일성 보장)
+PRODUCT_ORDERS = {
+    "newest": KeysetOrder("newest", (Product.created_at, Product.id), descending=True),
+    "price_asc": KeysetOrder("price_asc", (Product.selling_price, Product.id), descending=False),
+    "price_desc": KeysetOrder("price_desc", (Product.selling_price, Product.id), descending=True),
+}
 
-@router.get("/categories/list")
-async def get_categories(db: Session = Depends(get_db)):
-    """카테고리 목록 (경로 충돌 방지로 상단 정의)"""
-    categories = db.query(Product.category).distinct().filter(Product.category.isnot(None)).all()
-    return [c[0] for c in categories if c[0]]
+
+@router.get("/categories/list", response_model=List[str])
+async def get_categories(request: Request, db: AsyncSession = Depends(get_read_db)):
+    """카테고리 목록 (활성 상품이 있는 카테고리, facet 집계 테이블 기준. 경로 충돌 방지로 상단 정의)
+    목록 응답이므로 ETag만 사용 (카테고리가 빠져도 최신 updated_at은 그대로일 수 있어 Last-Modified 없음)"""
+    version = (
+        await db.execute(select(func.max(ProductFacetCount.updated_at), func.count()))
+    ).one()
+    etag = make_etag("categories", *version)
+    last_modified = None
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    async def build():
+        result = await db.execute(
+            select(ProductFacetCount.category)
+            .distinct()
+            .where(ProductFacetCount.category != "")
+            .order_by(ProductFacetCount.category)
+        )
+        return result.scalars().all()
+
+    response = await response_cache.respond("categories", {"v": etag}, [CATEGORIES_TAG], build, List[str])
+    return with_validators(response, etag, last_modified)
+
+
+@router.get("/facets", response_model=ProductFacetsOut)
+async def get_product_facets(
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    price_bucket: Optional[int] = Query(None, ge=0, le=len(PRICE_BUCKETS) - 1),
+    search: Optional[str] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    카테고리/브랜드/가격 구간별 상품 수 (목록과 같은 필터)
+    - search/min_price/max_price가 없으면 집계 테이블에서 조회
+    """
+    search = normalize_query(search)
+    params = {
+        "category": category,
+        "brand": brand,
+        "price_bucket": price_bucket,
+        "search": search,
+        "min_price": min_price,
+        "max_price": max_price,
+    }
+
+    async def build():
+        return await get_facets(
+            db,
+            category=category,
+            brand=brand,
+            price_bucket=price_bucket,
+            search_condition=search_filter(search, db.get_bind().dialect.name) if search else None,
+            min_price=min_price,
+            max_price=max_price,
+        )
+
+    return await response_cache.respond("facets", params, [FACETS_TAG], build, ProductFacetsOut)
 
 
 @router.get("/external/{external_id}", response_model=ProductOut)
-async def get_product_by_external_id(external_id: str, db: Session = Depends(get_db)):
+async def get_product_by_external_id(external_id: str, db: AsyncSession = Depends(get_read_db)):
     """외부 ID로 상품 조회"""
-    product = db.query(Product).filter(Product.external_id == external_id).first()
+    product = await db.scalar(
+        select(Product).where(Product.external_id == external_id).options(*PRODUCT_OUT_OPTIONS).limit(1)
+    )
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -26,35 +102,168 @@ async def get_product_by_external_id(external_id: str, db: Session = Depends(get
 
 @router.get("/", response_model=ProductListOut)
 async def get_products(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     category: Optional[str] = None,
+    brand: Optional[str] = None,
+    price_bucket: Optional[int] = Query(None, ge=0, le=len(PRICE_BUCKETS) - 1, description="/facets의 가격 구간"),
     search: Optional[str] = None,
     min_price: Optional[int] = None,
     max_price: Optional[int] = None,
-    db: Session = Depends(get_db)
+    sort: Optional[Literal["relevance", "newest", "price_asc", "price_desc"]] = Query(
+        None, description="기본값: search가 있으면 relevance, 없으면 newest"
+    ),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor. 지정 시 skip 무시"),
+    with_total: bool = Query(True, description="false면 total을 계산하지 않음 (무한 스크롤 등)"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """상품 목록 조회"""
-    query = db.query(Product).filter(Product.is_active == True)
+    """
+    상품 목록 조회
+    - skip: OFFSET 방식 (얕은 페이지용)
+    - cursor: keyset 방식. 응답의 next_cursor를 그대로 넘기면 깊이와 무관하게 일정 비용
+    - total: PRODUCT_COUNT_EXACT_THRESHOLD 이하면 정확값(total_exact=true), 초과면 추정/캐시값
+    - search: 이름/한글명/브랜드/카테고리 검색 (app.services.search). relevance 정렬은 skip만 지원
+    - ETag: 필터 + 페이지 행의 id/updated_at. total 변화는 반영하지 않음 (Cache-Control max-age 내 지연 허용)
+    - Last-Modified/If-Modified-Since 미사용: 상품이 페이지에서 빠져도(비활성화, 필터 이탈) 남은 행의 최신 시각은
+      그대로라 잘못된 304가 됨. 조건부 요청은 ETag(행 id 목록 포함)로만 판단
+    """
+    search = normalize_query(search)
+    sort = sort or ("relevance" if search else "newest")
+    if sort == "relevance" and cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="relevance 정렬은 cursor를 지원하지 않습니다. skip을 사용하세요.",
+        )
+    dialect = db.get_bind().dialect.name
+    filters = {
+        "category": category,
+        "brand": brand,
+        "price_bucket": price_bucket,
+        "search": search,
+        "min_price": min_price,
+        "max_price": max_price,
+    }
+    query = _filtered_query(dialect, **filters)
+    page_query, order = _page_query(query, dialect, sort=sort, search=search, skip=skip, cursor=cursor, limit=limit)
+
+    # 검증자: 페이지 행의 (id, updated_at, synced_at)만 조회 → 일치하면 304 (본문 조회/직렬화 없음)
+    versions = (
+        await db.execute(page_query.with_only_columns(Product.id, Product.updated_at, Product.synced_at))
+    ).all()
+    params = {**filters, "skip": skip, "limit": limit, "sort": sort, "cursor": cursor, "with_total": with_total}
+    etag = make_etag("products", params, [tuple(v) for v in versions])
+    last_modified = None
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    async def build():
+        total, total_exact = None, False
+        if with_total:
+            total, total_exact = await count_rows(
+                db,
+                query,
+                cache_key=("products", *filters.values()),
+                exact_threshold=settings.PRODUCT_COUNT_EXACT_THRESHOLD,
+                cache_ttl=settings.PRODUCT_COUNT_CACHE_TTL,
+            )
+        result = await db.execute(page_query.options(*PRODUCT_OUT_OPTIONS))
+        if order is None:
+            products, next_cursor = result.scalars().all(), None
+        else:
+            products, next_cursor = split_page(order, result.scalars().all(), limit)
+        return {
+            "items": products,
+            "total": total,
+            "total_exact": total_exact,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+
+    tags = [category_tag(category)] if category else [PRODUCT_LIST_TAG]
+    response = await response_cache.respond("products", {"v": etag}, tags, build, ProductListOut)
+    return with_validators(response, etag, last_modified)
+
+
+def _filtered_query(
+    dialect: str,
+    *,
+    category: Optional[str],
+    brand: Optional[str],
+    price_bucket: Optional[int],
+    search: str,
+    min_price: Optional[int],
+    max_price: Optional[int],
+) -> Select:
+    """목록 필터 (정렬/페이지 제외). count와 페이지 조회가 공유."""
+    query = select(Product).where(Product.is_active == True)
     if category:
-        query = query.filter(Product.category == category)
+        query = query.where(Product.category == category)
+    if brand:
+        query = query.where(Product.brand == brand)
+    if price_bucket is not None:
+        query = query.where(price_bucket_filter(price_bucket))
     if search:
-        query = query.filter(
-            (Product.name_ko.ilike(f"%{search}%")) | (Product.name.ilike(f"%{search}%"))
-        )
+        query = query.where(search_filter(search, dialect))
     if min_price is not None:
-        query = query.filter(Product.selling_price >= min_price)
+        query = query.where(Product.selling_price >= min_price)
     if max_price is not None:
-        query = query.filter(Product.selling_price <= max_price)
-    total = query.count()
-    products = query.offset(skip).limit(limit).all()
-    return {"items": products, "total": total, "skip": skip, "limit": limit}
+        query = query.where(Product.selling_price <= max_price)
+    return query
+
+
+def _page_query(
+    query: Select,
+    dialect: str,
+    *,
+    sort: str,
+    search: str,
+    skip: int,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[Select, Optional[KeysetOrder]]:
+    """정렬 + 페이지. relevance는 OFFSET만 (KeysetOrder 없음), 나머지는 keyset(limit+1)."""
+    if sort == "relevance":
+        # 관련도 → 최신순 (DB가 관련도를 지원하지 않으면 최신순만)
+        rank = search_rank(search, dialect) if search else None
+        order_by = ([rank.desc()] if rank is not None else []) + PRODUCT_ORDERS["newest"].order_by()
+        return query.order_by(*order_by).offset(skip).limit(limit), None
+    order = PRODUCT_ORDERS[sort]
+    page_query = apply_keyset(query, order, cursor, limit)
+    if not cursor:
+        page_query = page_query.offset(skip)
+    return page_query, order
 
 
 @router.get("/{product_id}", response_model=ProductOut)
-async def get_product(product_id: int, db: Session = Depends(get_db)):
-    """상품 상세 조회"""
-    product = db.query(Product).filter(Product.id == product_id, Product.is_active == True).first()
-    if not product:
+async def get_product(product_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    """상품 상세 조회 (ETag/Last-Modified: updated_at, synced_at 기준)"""
+    version = (
+        await db.execute(
+            select(Product.updated_at, Product.synced_at).where(
+                Product.id == product_id, Product.is_active == True
+            )
+        )
+    ).first()
+    if version is None:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    etag = make_etag("product", product_id, *version)
+    last_modified = latest(version)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    async def build():
+        product = await db.scalar(
+            select(Product)
+            .where(Product.id == product_id, Product.is_active == True)
+            .options(*PRODUCT_OUT_OPTIONS)
+        )
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return product
+
+    response = await response_cache.respond(
+        "product", {"id": product_id, "v": etag}, [product_tag(product_id)], build, ProductOut
+    )
+    return with_validators(response, etag, last_modified)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.db.models import Supplier
@@ -11,16 +12,17 @@ router = APIRouter()
 
 
 @router.get("/")
-async def get_suppliers(db: Session = Depends(get_db)):
+async def get_suppliers(db: AsyncSession = Depends(get_db)):
     """공급처 목록"""
-    suppliers = db.query(Supplier).filter(Supplier.is_active == True).all()
+    result = await db.execute(select(Supplier).where(Supplier.is_active == True))
+    suppliers = result.scalars().all()
     return suppliers
 
 
 @router.get("/{supplier_id}")
-async def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
+async def get_supplier(supplier_id: int, db: AsyncSession = Depends(get_db)):
     """공급처 상세"""
-    supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
+    supplier = await db.get(Supplier, supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return supplier
@@ -29,21 +31,23 @@ async def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
 @router.post("/{supplier_id}/sync")
 async def sync_products(
     supplier_id: int,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, description="최대 상품 수 (없으면 전체 카탈로그)"),
+    mode: str = Query("full", pattern="^(full|delta)$", description="full: 전체 + 사라진 상품 비활성화, delta: 변경분만"),
+    db: AsyncSession = Depends(get_db)
 ):
     """공급처 상품 동기화"""
-    supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
+    supplier = await db.get(Supplier, supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     
     # Celery 태스크 큐잉
-    task = sync_supplier_products.delay(supplier_id=supplier_id, limit=limit)
+    task = sync_supplier_products.delay(supplier_id=supplier_id, limit=limit, mode=mode)
 
     return {
         "message": f"Sync started for {supplier.name}",
         "supplier_id": supplier.id,
         "limit": limit,
+        "mode": mode,
         "task_id": task.id,
         "status": "queued",
     }
@@ -56,12 +60,12 @@ async def create_supplier(
     code: str = None,
     api_key: str = None,
     api_secret: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """공급처 등록 (connector_type = supplier_type.value, code는 유일해야 함)"""
     connector_value = supplier_type.value if hasattr(supplier_type, "value") else str(supplier_type)
     code = (code or f"{connector_value}_{name[:20]}").strip().lower().replace(" ", "_")
-    existing = db.query(Supplier).filter(Supplier.code == code).first()
+    existing = await db.scalar(select(Supplier).where(Supplier.code == code))
     if existing:
         raise HTTPException(status_code=400, detail="이미 같은 code를 가진 공급처가 있습니다.")
     supplier = Supplier(
@@ -72,6 +76,6 @@ async def create_supplier(
         api_secret=api_secret,
     )
     db.add(supplier)
-    db.commit()
-    db.refresh(supplier)
+    await db.commit()
+    await db.refresh(supplier)
     return supplier
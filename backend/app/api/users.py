@@ -1,29 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 
 from app.db.session import get_db
 from app.db.models import User, Address
 from app.schemas.user import UserCreate, UserOut, TokenWithUser, UserLogin, AddressCreate, AddressResponse
+from app.core.config import settings
+from app.core.deps import RateLimitDep
 from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token, decode_token
 
 router = APIRouter()
+
+# 로그인/회원가입 무차별 대입 방지 (라우트별, IP 기준)
+auth_rate_limit = RateLimitDep(
+    max_requests=settings.RATE_LIMIT_AUTH_REQUESTS, window_seconds=settings.RATE_LIMIT_AUTH_WINDOW_SECONDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.query(User).filter(User.id == payload.get("sub")).first()
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
 
-@router.post("/register", response_model=UserOut)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+@router.post("/register", response_model=UserOut, dependencies=[Depends(auth_rate_limit)])
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     회원가입
     
@@ -32,7 +44,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     - 사용자 생성
     """
     # 이메일 중복 확인
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -62,25 +74,25 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
             phone=user_data.phone.strip() if user_data.phone else None
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         return user
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="회원가입 중 오류가 발생했습니다"
         )
 
 
-@router.post("/login", response_model=TokenWithUser)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@router.post("/login", response_model=TokenWithUser, dependencies=[Depends(auth_rate_limit)])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     로그인 (form: username=이메일, password=비밀번호)
     - 이메일과 비밀번호로 인증
     - JWT 토큰 및 사용자 정보 반환
     """
-    user = db.query(User).filter(User.email == form_data.username.lower().strip()).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username.lower().strip()))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -115,10 +127,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     }
 
 
-@router.post("/login/json", response_model=TokenWithUser)
-async def login_json(body: UserLogin, db: Session = Depends(get_db)):
+@router.post("/login/json", response_model=TokenWithUser, dependencies=[Depends(auth_rate_limit)])
+async def login_json(body: UserLogin, db: AsyncSession = Depends(get_db)):
     """로그인 (JSON body: email, password). SPA용."""
-    user = db.query(User).filter(User.email == body.email.lower().strip()).first()
+    user = await db.scalar(select(User).where(User.email == body.email.lower().strip()))
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="이메일 또는 비밀번호가 올바르지 않습니다")
     if not user.is_active:
@@ -146,14 +158,14 @@ async def update_me(
     name: Optional[str] = None,
     phone: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """사용자 정보 수정"""
     if name:
         current_user.name = name
     if phone:
         current_user.phone = phone
-    db.commit()
+    await db.commit()
     return {"message": "Updated successfully"}
 
 
@@ -174,10 +186,13 @@ def _address_to_response(a: Address) -> AddressResponse:
 @router.get("/addresses", response_model=List[AddressResponse])
 async def list_addresses(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """내 배송지 목록"""
-    addrs = db.query(Address).filter(Address.user_id == current_user.id).order_by(Address.is_default.desc()).all()
+    result = await db.execute(
+        select(Address).where(Address.user_id == current_user.id).order_by(Address.is_default.desc())
+    )
+    addrs = result.scalars().all()
     return [_address_to_response(a) for a in addrs]
 
 
@@ -185,11 +200,11 @@ async def list_addresses(
 async def create_address(
     body: AddressCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """배송지 추가"""
     if body.is_default:
-        db.query(Address).filter(Address.user_id == current_user.id).update({"is_default": False})
+        await db.execute(update(Address).where(Address.user_id == current_user.id).values(is_default=False))
     addr = Address(
         user_id=current_user.id,
         recipient_name=body.recipient_name,
@@ -201,6 +216,6 @@ async def create_address(
         country="KR",
     )
     db.add(addr)
-    db.commit()
-    db.refresh(addr)
+    await db.commit()
+    await db.refresh(addr)
     return _address_to_response(addr)
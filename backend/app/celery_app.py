@@ -3,6 +3,7 @@ Celery Configuration
 Celery 설정 및 앱 인스턴스
 """
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
 from app.core.config import settings
 
 # Celery 앱 생성
@@ -44,20 +45,32 @@ celery_app.conf.update(
     
     # 스케줄링 (Beat)
     beat_schedule={
-        # 매 6시간마다 상품 동기화
-        "sync-products-every-6-hours": {
+        # 변경분(delta) 상품 동기화: 워터마크 이후 변경된 상품만 (기본 15분)
+        "sync-products-delta": {
             "task": "app.tasks.product_sync.sync_all_suppliers",
-            "schedule": 6 * 60 * 60,  # 6시간
+            "schedule": settings.SYNC_DELTA_INTERVAL_SECONDS,
+            "kwargs": {"mode": "delta"},
+        },
+        # 전체 상품 동기화: 카탈로그 전체 대조 후 사라진 상품 비활성화 (기본 24시간)
+        "sync-products-full": {
+            "task": "app.tasks.product_sync.sync_all_suppliers",
+            "schedule": settings.SYNC_FULL_INTERVAL_SECONDS,
+            "kwargs": {"mode": "full"},
+        },
+        # 매일 facet 집계 전체 재계산
+        "rebuild-product-facets-daily": {
+            "task": "app.tasks.product_sync.rebuild_product_facets",
+            "schedule": 24 * 60 * 60,  # 24시간
         },
         # 매 1시간마다 주문 상태 업데이트
         "update-order-status-every-hour": {
             "task": "app.tasks.order_process.update_all_order_statuses",
             "schedule": 60 * 60,  # 1시간
         },
-        # 매 30분마다 배송 추적 업데이트
-        "update-shipments-every-30-min": {
+        # 배송 추적 업데이트: 다음 조회 시각(next_poll_at)이 된 배송만 조회 (기본 5분마다 확인)
+        "update-shipment-tracking": {
             "task": "app.tasks.order_process.update_shipment_tracking",
-            "schedule": 30 * 60,  # 30분
+            "schedule": settings.TRACKING_SWEEP_INTERVAL_SECONDS,
         },
     },
 )
@@ -71,3 +84,14 @@ class BaseTaskWithRetry(celery_app.Task):
     retry_backoff = True
     retry_backoff_max = 600  # 최대 10분
     retry_jitter = True
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_connector_http_clients(**kwargs):
+    """워커(프로세스) 종료 시 커넥터 HTTP 연결 정리 (prefork 자식 / solo·threads 풀)"""
+    from app.connectors import close_async_connectors
+    from app.connectors.http import close_clients
+
+    close_clients()
+    close_async_connectors()
@@ -1,8 +1,18 @@
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from .async_base import AsyncBaseConnector
 from .base import BaseConnector
-from .temu import TemuConnector
-from .aliexpress import AliExpressConnector
-from .amazon import AmazonConnector
+from .temu import AsyncTemuConnector, TemuConnector
+from .aliexpress import AliExpressConnector, AsyncAliExpressConnector
+from .amazon import AmazonConnector, AsyncAmazonConnector
+
+logger = logging.getLogger(__name__)
 
 CONNECTOR_MAP = {
     "temu": TemuConnector,
@@ -10,13 +20,23 @@ CONNECTOR_MAP = {
     "amazon": AmazonConnector,
 }
 
+ASYNC_CONNECTOR_MAP = {
+    "temu": AsyncTemuConnector,
+    "aliexpress": AsyncAliExpressConnector,
+    "amazon": AsyncAmazonConnector,
+}
 
-def get_connector(supplier_type: str) -> Optional[BaseConnector]:
+
+def get_connector(
+    supplier_type: str, config: Optional[dict] = None, supplier_id: Optional[int] = None
+) -> Optional[BaseConnector]:
     """
     공급처 타입에 맞는 커넥터 인스턴스 반환
     
     Args:
         supplier_type: 공급처 타입 문자열 (temu, aliexpress 등)
+        config: 공급처 config (refresh_token, marketplace_id, http 연결 설정, rate_limits 등)
+        supplier_id: 호출 제한 버킷 키 (없으면 같은 타입 커넥터끼리 버킷 공유)
     
     Returns:
         BaseConnector 인스턴스 또는 None
@@ -25,4 +45,142 @@ def get_connector(supplier_type: str) -> Optional[BaseConnector]:
     if not connector_class:
         return None
     
-    return connector_class()
+    return connector_class(config, supplier_id)
+
+
+def get_async_connector(
+    supplier_type: str, config: Optional[dict] = None, supplier_id: Optional[int] = None
+) -> Optional[AsyncBaseConnector]:
+    """get_connector의 비동기 버전 (AsyncClient를 소유하므로 `async with`로 사용)"""
+    connector_class = ASYNC_CONNECTOR_MAP.get(supplier_type.lower())
+    if not connector_class:
+        return None
+    
+    return connector_class(config, supplier_id)
+
+
+# 공급처 호출 1건: (결과 키, 공급처, 비동기 커넥터를 받아 코루틴을 만드는 함수)
+SupplierCall = Tuple[Hashable, Any, Callable[[AsyncBaseConnector], Awaitable[Any]]]
+
+
+def fan_out_by_supplier(calls: Iterable[SupplierCall]) -> Dict[Hashable, Any]:
+    """
+    동기 코드(Celery 태스크)에서 공급처 API 호출 여러 건을 동시에 실행.
+    공급처마다 비동기 커넥터 하나로 fan_out (공급처당 동시 요청 수 제한), 공급처끼리도 동시에.
+    워커 프로세스 전용 이벤트 루프에서 실행하고 공급처별 커넥터(AsyncClient)를 호출 간 재사용 → keep-alive 연결 유지
+    Returns: {결과 키: 결과 또는 예외} (커넥터가 없는 공급처의 호출은 ValueError)
+    """
+    by_supplier: Dict[int, Tuple[Any, list]] = {}
+    for key, supplier, call in calls:
+        by_supplier.setdefault(supplier.id, (supplier, []))[1].append((key, call))
+
+    async def _supplier_calls(supplier, items) -> Dict[Hashable, Any]:
+        connector = await _async_supplier_connector(supplier)
+        if connector is None:
+            return {key: ValueError(f"No connector for {supplier.connector_type}") for key, _ in items}
+        outcomes = await connector.fan_out([lambda call=call: call(connector) for _, call in items])
+        return {key: outcome for (key, _), outcome in zip(items, outcomes)}
+
+    async def _run() -> Dict[Hashable, Any]:
+        results: Dict[Hashable, Any] = {}
+        for partial in await asyncio.gather(*[_supplier_calls(s, items) for s, items in by_supplier.values()]):
+            results.update(partial)
+        return results
+
+    if not by_supplier:
+        return {}
+    return asyncio.run_coroutine_threadsafe(_run(), _worker_loop()).result()
+
+
+# 워커 프로세스 전용 이벤트 루프(데몬 스레드) + 공급처별 비동기 커넥터 (supplier id → (설정 지문, 인스턴스))
+# AsyncClient는 만든 루프에 묶이므로 호출마다 asyncio.run을 쓰면 매번 새 연결(TLS 핸드셰이크) → 루프를 유지
+# _async_registry는 루프 스레드에서만 접근
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_async_registry: Dict[int, Tuple[str, AsyncBaseConnector]] = {}
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    with _registry_lock:
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            # fork된 자식에는 부모의 루프 스레드가 없음: 부모 연결을 닫지 않고 참조만 버림
+            _async_registry.clear()
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="connector-fan-out", daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+async def _async_supplier_connector(supplier) -> Optional[AsyncBaseConnector]:
+    """get_supplier_connector의 비동기 버전. connector_type 또는 config가 바뀌면 이전 인스턴스를 닫고 새로 생성."""
+    fingerprint = _fingerprint(supplier.connector_type, supplier.config)
+    cached = _async_registry.get(supplier.id)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+    if cached:
+        await cached[1].aclose()
+    connector = get_async_connector(supplier.connector_type, supplier.config, supplier.id)
+    if connector is None:
+        _async_registry.pop(supplier.id, None)
+    else:
+        _async_registry[supplier.id] = (fingerprint, connector)
+    return connector
+
+
+def close_async_connectors(timeout: float = 5.0) -> int:
+    """이 프로세스의 비동기 커넥터를 닫고 전용 루프 종료 (워커 종료 시). 닫은 수 반환."""
+    global _loop
+    with _registry_lock:
+        loop = _loop if _loop_pid == os.getpid() else None
+        _loop = None
+    if loop is None or loop.is_closed():
+        return 0
+
+    async def _close() -> int:
+        connectors = [connector for _, connector in _async_registry.values()]
+        _async_registry.clear()
+        for connector in connectors:
+            try:
+                await connector.aclose()
+            except Exception as e:
+                logger.warning("async connector close failed: %s", e)
+        return len(connectors)
+
+    try:
+        return asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+# 프로세스 단위 공급처별 커넥터 (supplier id → (설정 지문, 인스턴스))
+_registry: Dict[int, Tuple[str, BaseConnector]] = {}
+_registry_lock = threading.Lock()
+
+
+def _fingerprint(connector_type: str, config: Optional[Dict[str, Any]]) -> str:
+    raw = json.dumps([connector_type, config or {}], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_supplier_connector(supplier) -> Optional[BaseConnector]:
+    """
+    공급처별로 재사용하는 커넥터 인스턴스 (태스크 간 공유, 워커 프로세스 단위)
+    connector_type 또는 config가 바뀌면 새로 생성.
+    """
+    fingerprint = _fingerprint(supplier.connector_type, supplier.config)
+    with _registry_lock:
+        cached = _registry.get(supplier.id)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        connector = get_connector(supplier.connector_type, supplier.config, supplier.id)
+        if connector is None:
+            _registry.pop(supplier.id, None)
+        else:
+            _registry[supplier.id] = (fingerprint, connector)
+        return connector
+
+
+def clear_connector_registry() -> None:
+    with _registry_lock:
+        _registry.clear()
@@ -1,36 +1,28 @@
 import hashlib
 import hmac
 import logging
+import random
 import time
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-import httpx
-from .base import BaseConnector
-from .exceptions import (
-    ConnectorAPIError,
-    ConnectorAuthError,
-    ConnectorRateLimitError,
-    ConnectorResponseError,
-    ConnectorTimeoutError,
-)
+from .async_base import AsyncBaseConnector
+from .base import BaseConnector, ConnectorRequest, ProductPage
+from .exceptions import ConnectorAuthError, ConnectorResponseError
+from .protocol import ConnectorProtocol
 
 logger = logging.getLogger(__name__)
 
 
-class AliExpressConnector(BaseConnector):
-    """
-    AliExpress 공급처 커넥터 (스텁 구현)
-    실제 구현 시 AliExpress Open API 연동 필요
-    https://developers.aliexpress.com/
-    """
+class AliExpressProtocol(ConnectorProtocol):
+    """AliExpress Open API 서명/파라미터/응답 파싱 (AliExpressConnector, AsyncAliExpressConnector 공통)."""
     
+    NAME = "AliExpress"
     BASE_URL = "https://api-sg.aliexpress.com"
     TIMEOUT_SECONDS = 15
     MAX_RETRIES = 3
-
-    def _is_test_mode(self, config: Optional[Dict[str, Any]]) -> bool:
-        cfg = config or self.config or {}
-        return bool(cfg.get("test_mode"))
+    MAX_PAGE_SIZE = 200
+    SUPPORTS_SINCE = True
 
     def _build_auth_params(self, api_key: str, api_secret: str, method: str, extra: Dict[str, Any]) -> Dict[str, Any]:
         if not api_key or not api_secret:
@@ -49,46 +41,14 @@ class AliExpressConnector(BaseConnector):
         params["sign"] = hmac.new(api_secret.encode("utf-8"), sign_source.encode("utf-8"), hashlib.sha256).hexdigest().upper()
         return params
 
-    def _request(self, *, api_key: str, api_secret: str, method: str, extra_params: Dict[str, Any]) -> Dict[str, Any]:
-        params = self._build_auth_params(api_key, api_secret, method, extra_params)
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                with httpx.Client(timeout=self.TIMEOUT_SECONDS) as client:
-                    response = client.get(f"{self.BASE_URL}/sync", params=params)
-
-                if response.status_code == 401:
-                    raise ConnectorAuthError("AliExpress authentication failed")
-                if response.status_code == 429:
-                    logger.warning("AliExpress rate limited: method=%s attempt=%s", method, attempt)
-                    if attempt == self.MAX_RETRIES:
-                        raise ConnectorRateLimitError("AliExpress API rate limited")
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-                if response.status_code >= 500 and attempt < self.MAX_RETRIES:
-                    logger.warning("AliExpress upstream error: status=%s method=%s attempt=%s", response.status_code, method, attempt)
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, dict):
-                    raise ConnectorResponseError("AliExpress API returned non-object JSON")
-                return data
-            except httpx.TimeoutException as exc:
-                logger.warning("AliExpress timeout: method=%s attempt=%s", method, attempt)
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorTimeoutError("AliExpress API timed out") from exc
-            except httpx.HTTPStatusError as exc:
-                code = exc.response.status_code
-                raise ConnectorAPIError(
-                    f"AliExpress API error ({code})",
-                    status_code=code,
-                    retryable=code >= 500,
-                ) from exc
-            except httpx.HTTPError as exc:
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorAPIError("AliExpress transport error", retryable=True) from exc
-        raise ConnectorAPIError("AliExpress request retries exhausted", retryable=True)
+    def _build_request(self, *, api_key: str, api_secret: str, method: str, extra_params: Dict[str, Any]) -> ConnectorRequest:
+        return ConnectorRequest(
+            method="GET",
+            url=f"{self.BASE_URL}/sync",
+            label=f"method={method}",
+            endpoint="orders" if method.startswith("aliexpress.trade.") else "catalog",
+            params=self._build_auth_params(api_key, api_secret, method, extra_params),
+        )
 
     def _normalize_product(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         return {
@@ -109,34 +69,134 @@ class AliExpressConnector(BaseConnector):
             "images": raw.get("images", []),
         }
 
-    def fetch_products(
+    def _product_page_params(self, cursor: Optional[str], page_size: int, since: Optional[datetime], category: Optional[str]) -> Dict[str, Any]:
+        """page_no 기반 페이지네이션 (cursor = 다음 page_no)"""
+        payload = {
+            "page_no": int(cursor or 1),
+            "page_size": page_size,
+            "category_id": category,
+            "gmt_modified_start": since.strftime("%Y-%m-%d %H:%M:%S") if since else None,
+        }
+        return {k: v for k, v in payload.items() if v is not None}
+
+    def _parse_product_page(self, data: Dict[str, Any], page_no: int, page_size: int) -> ProductPage:
+        result = data.get("result", {})
+        products = result.get("products", [])
+        if not isinstance(products, list):
+            raise ConnectorResponseError("AliExpress products payload is invalid")
+        total = result.get("total_count")
+        has_more = len(products) == page_size and (total is None or page_no * page_size < int(total))
+        return ProductPage(
+            [self._normalize_product(p) for p in products],
+            str(page_no + 1) if has_more else None,
+        )
+
+    def _sample_product(self, external_id: str) -> Dict:
+        return {
+            "external_id": external_id,
+            "title": f"AliExpress Product {external_id}",
+            "title_ko": f"알리익스프레스 상품 {external_id}",
+            "price": 7.99,
+            "stock": 300,
+            "images": ["https://picsum.photos/400/400"],
+            "description": "Product description"
+        }
+
+    def _test_order(self, order_data: Dict) -> Optional[Dict]:
+        if self._is_test_mode(order_data.get("config") if isinstance(order_data, dict) else None):
+            return {"order_id": "ALI-TEST-ORDER", "status": "placed"}
+        return None
+
+    def _parse_placed_order(self, data: Dict[str, Any]) -> Dict:
+        result = data.get("result", {})
+        order_id = result.get("order_id")
+        if not order_id:
+            raise ConnectorResponseError("AliExpress order response missing order_id")
+        return {"order_id": str(order_id), "status": result.get("status", "placed"), "raw": data}
+
+    def _parse_order_status(self, order_id: str, data: Dict[str, Any]) -> Dict:
+        result = data.get("result", {})
+        status = result.get("order_status")
+        if not status:
+            raise ConnectorResponseError("AliExpress order status missing order_status")
+        return {
+            "order_id": order_id,
+            "status": status,
+            "tracking_number": result.get("tracking_number"),
+            "courier": result.get("logistics_provider"),
+            "raw": data,
+        }
+
+    def _sample_tracking_info(self) -> Dict:
+        now = datetime.utcnow()
+        
+        return {
+            "current_status": "in_transit",
+            "events": [
+                {
+                    "status": "in_transit",
+                    "description": "Departed from origin country",
+                    "location": "Guangzhou, China",
+                    "time": now - timedelta(days=3)
+                },
+                {
+                    "status": "processing",
+                    "description": "Package processed at facility",
+                    "location": "Shenzhen, China",
+                    "time": now - timedelta(days=4)
+                },
+                {
+                    "status": "picked_up",
+                    "description": "Package received by carrier",
+                    "location": "Seller Warehouse",
+                    "time": now - timedelta(days=6)
+                }
+            ]
+        }
+
+    def _sample_stock(self, product_id: str, variant_id: Optional[str]) -> Dict:
+        return {
+            "product_id": product_id,
+            "variant_id": variant_id,
+            "in_stock": True,
+            "quantity": random.randint(50, 500)
+        }
+
+
+class AliExpressConnector(AliExpressProtocol, BaseConnector):
+    """
+    AliExpress 공급처 커넥터 (스텁 구현)
+    실제 구현 시 AliExpress Open API 연동 필요
+    https://developers.aliexpress.com/
+    """
+
+    def _request(self, *, api_key: str, api_secret: str, method: str, extra_params: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._build_request(api_key=api_key, api_secret=api_secret, method=method, extra_params=extra_params)
+        return self._execute(lambda: request)
+
+    def fetch_product_page(
         self,
         api_key: str = None,
         api_secret: str = None,
         config: Dict = None,
-        limit: int = 100,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
         category: str = None
-    ) -> List[Dict]:
+    ) -> ProductPage:
+        """page_no 기반 페이지네이션 (cursor = 다음 page_no)"""
         if self._is_test_mode(config):
-            return self._fetch_products_test_data(limit)
+            return self._test_product_page("ali-test", 2.5, 30, config, cursor, page_size)
 
-        payload = {
-            "page_size": min(limit, 200),
-            "category_id": category,
-        }
+        params = self._product_page_params(cursor, page_size, since, category)
         data = self._request(
             api_key=api_key,
             api_secret=api_secret,
             method="aliexpress.ds.product.get",
-            extra_params={k: v for k, v in payload.items() if v is not None},
+            extra_params=params,
         )
-        products = data.get("result", {}).get("products", [])
-        if not isinstance(products, list):
-            raise ConnectorResponseError("AliExpress products payload is invalid")
-        return [self._normalize_product(p) for p in products]
-
-    def _fetch_products_test_data(self, limit: int) -> List[Dict]:
-        return [{"external_id": f"ali-test-{i}", "price": 2.5 + i, "stock": 30, "variants": []} for i in range(min(limit, 5))]
+        return self._parse_product_page(data, params["page_no"], page_size)
     
     def get_product(
         self,
@@ -145,15 +205,7 @@ class AliExpressConnector(BaseConnector):
         external_id: str
     ) -> Optional[Dict]:
         """단일 상품 조회"""
-        return {
-            "external_id": external_id,
-            "title": f"AliExpress Product {external_id}",
-            "title_ko": f"알리익스프레스 상품 {external_id}",
-            "price": 7.99,
-            "stock": 300,
-            "images": ["https://picsum.photos/400/400"],
-            "description": "Product description"
-        }
+        return self._sample_product(external_id)
     
     def place_order(
         self,
@@ -161,8 +213,9 @@ class AliExpressConnector(BaseConnector):
         api_secret: str,
         order_data: Dict
     ) -> Dict:
-        if self._is_test_mode(order_data.get("config") if isinstance(order_data, dict) else None):
-            return {"order_id": "ALI-TEST-ORDER", "status": "placed"}
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
 
         data = self._request(
             api_key=api_key,
@@ -170,11 +223,7 @@ class AliExpressConnector(BaseConnector):
             method="aliexpress.trade.order.create",
             extra_params={"param_order_request": order_data},
         )
-        result = data.get("result", {})
-        order_id = result.get("order_id")
-        if not order_id:
-            raise ConnectorResponseError("AliExpress order response missing order_id")
-        return {"order_id": str(order_id), "status": result.get("status", "placed"), "raw": data}
+        return self._parse_placed_order(data)
     
     def cancel_order(
         self,
@@ -201,50 +250,7 @@ class AliExpressConnector(BaseConnector):
             method="aliexpress.trade.order.get",
             extra_params={"order_id": order_id},
         )
-        result = data.get("result", {})
-        status = result.get("order_status")
-        if not status:
-            raise ConnectorResponseError("AliExpress order status missing order_status")
-        return {
-            "order_id": order_id,
-            "status": status,
-            "tracking_number": result.get("tracking_number"),
-            "courier": result.get("logistics_provider"),
-            "raw": data,
-        }
-    
-    def get_tracking_info(
-        self,
-        tracking_number: str,
-        courier: str = None
-    ) -> Dict:
-        """배송 추적 정보 조회"""
-        from datetime import datetime, timedelta
-        now = datetime.utcnow()
-        
-        return {
-            "current_status": "in_transit",
-            "events": [
-                {
-                    "status": "in_transit",
-                    "description": "Departed from origin country",
-                    "location": "Guangzhou, China",
-                    "time": now - timedelta(days=3)
-                },
-                {
-                    "status": "processing",
-                    "description": "Package processed at facility",
-                    "location": "Shenzhen, China",
-                    "time": now - timedelta(days=4)
-                },
-                {
-                    "status": "picked_up",
-                    "description": "Package received by carrier",
-                    "location": "Seller Warehouse",
-                    "time": now - timedelta(days=6)
-                }
-            ]
-        }
+        return self._parse_order_status(order_id, data)
     
     def check_stock(
         self,
@@ -254,13 +260,7 @@ class AliExpressConnector(BaseConnector):
         variant_id: str = None
     ) -> Dict:
         """재고 확인"""
-        import random
-        return {
-            "product_id": product_id,
-            "variant_id": variant_id,
-            "in_stock": True,
-            "quantity": random.randint(50, 500)
-        }
+        return self._sample_stock(product_id, variant_id)
     
     def calculate_shipping(
         self,
@@ -295,3 +295,55 @@ class AliExpressConnector(BaseConnector):
             "destination_country": destination_country,
             "options": shipping_options
         }
+
+
+class AsyncAliExpressConnector(AliExpressProtocol, AsyncBaseConnector):
+    """AliExpressConnector의 비동기 버전."""
+
+    async def _request(self, *, api_key: str, api_secret: str, method: str, extra_params: Dict[str, Any]) -> Dict[str, Any]:
+        request = self._build_request(api_key=api_key, api_secret=api_secret, method=method, extra_params=extra_params)
+        return await self._execute(lambda: request)
+
+    async def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        category: str = None
+    ) -> ProductPage:
+        if self._is_test_mode(config):
+            return self._test_product_page("ali-test", 2.5, 30, config, cursor, page_size)
+
+        params = self._product_page_params(cursor, page_size, since, category)
+        data = await self._request(
+            api_key=api_key, api_secret=api_secret, method="aliexpress.ds.product.get", extra_params=params
+        )
+        return self._parse_product_page(data, params["page_no"], page_size)
+
+    async def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+        return self._sample_product(external_id)
+
+    async def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
+        data = await self._request(
+            api_key=api_key,
+            api_secret=api_secret,
+            method="aliexpress.trade.order.create",
+            extra_params={"param_order_request": order_data},
+        )
+        return self._parse_placed_order(data)
+
+    async def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
+        data = await self._request(
+            api_key=api_key, api_secret=api_secret, method="aliexpress.trade.order.get", extra_params={"order_id": order_id}
+        )
+        return self._parse_order_status(order_id, data)
+
+    async def check_stock(self, api_key: str, api_secret: str, product_id: str, variant_id: str = None) -> Dict:
+        return self._sample_stock(product_id, variant_id)
@@ -1,120 +1,102 @@
+import asyncio
 import logging
-import time
-from typing import Any, Dict, List, Optional
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
-from .base import BaseConnector
-from .exceptions import (
-    ConnectorAPIError,
-    ConnectorAuthError,
-    ConnectorRateLimitError,
-    ConnectorResponseError,
-    ConnectorTimeoutError,
-)
+
+from .async_base import AsyncBaseConnector
+from .base import BaseConnector, ConnectorRequest, ProductPage
+from .exceptions import ConnectorAuthError, ConnectorError, ConnectorResponseError
+from .http import get_client
+from .protocol import ConnectorProtocol, RetryRequest
+from .tokens import token_cache, token_key
 
 logger = logging.getLogger(__name__)
 
 
-class AmazonConnector(BaseConnector):
-    """
-    Amazon 공급처 커넥터 (스텁 구현)
-    실제 구현 시 Amazon Product Advertising API 또는 SP-API 연동 필요
-    https://developer.amazon.com/
-    """
+class AmazonProtocol(ConnectorProtocol):
+    """Amazon SP-API 토큰/파라미터/응답 파싱 (AmazonConnector, AsyncAmazonConnector 공통)."""
     
+    NAME = "Amazon"
     BASE_URL = "https://webservices.amazon.com"
     TOKEN_URL = "https://api.amazon.com/auth/o2/token"
     TIMEOUT_SECONDS = 20
     MAX_RETRIES = 3
+    MAX_PAGE_SIZE = 20
+    BULK_STATUS_SIZE = 50  # getOrders AmazonOrderIds 최대 개수
+    # SP-API 사용 계획 기본값 (searchCatalogItems 2/s, getOrder 0.5/s burst 30, getOrders 1/60s burst 20)
+    RATE_LIMITS = {
+        "catalog": {"rate": 2, "burst": 2},
+        "orders": {"rate": 0.5, "burst": 30},
+        "order_list": {"rate": 1 / 60, "burst": 20},
+    }
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        super().__init__(config)
-        self._access_token: Optional[str] = None
-        self._token_expiry: float = 0
-
-    def _is_test_mode(self, config: Optional[Dict[str, Any]]) -> bool:
-        cfg = config or self.config or {}
-        return bool(cfg.get("test_mode"))
+    def _token_http(self) -> httpx.Client:
+        return get_client("AmazonConnector", self.TIMEOUT_SECONDS, self.config.get("http"))
 
-    def _refresh_access_token(self, api_key: str, api_secret: str) -> str:
+    def _refresh_access_token(self, api_key: str, api_secret: str) -> Tuple[str, int]:
+        """LWA 토큰 엔드포인트 호출 (동기, 비동기 커넥터는 스레드에서). (access_token, expires_in)"""
         refresh_token = self.config.get("refresh_token")
         if not refresh_token:
             raise ConnectorAuthError("Amazon refresh_token is required in connector config")
-        with httpx.Client(timeout=self.TIMEOUT_SECONDS) as client:
-            response = client.post(
-                self.TOKEN_URL,
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": api_key,
-                    "client_secret": api_secret,
-                },
-            )
+        response = self._token_http().post(
+            self.TOKEN_URL,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": api_key,
+                "client_secret": api_secret,
+            },
+        )
         if response.status_code >= 400:
             raise ConnectorAuthError(f"Amazon token refresh failed ({response.status_code})")
         data = response.json()
         token = data.get("access_token")
         if not token:
             raise ConnectorAuthError("Amazon token response missing access_token")
-        self._access_token = token
-        self._token_expiry = time.time() + int(data.get("expires_in", 3600)) - 60
-        return token
+        return token, int(data.get("expires_in", 3600))
 
-    def _get_access_token(self, api_key: str, api_secret: str) -> str:
-        if self._access_token and time.time() < self._token_expiry:
-            return self._access_token
-        return self._refresh_access_token(api_key, api_secret)
+    def _token_key(self, api_key: str) -> str:
+        return token_key("amazon", api_key, self.config.get("refresh_token"))
 
-    def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{self.BASE_URL}{path}"
+    def _get_access_token(self, api_key: str, api_secret: str) -> str:
+        """워커 간 공유 토큰 (Redis, 만료 전 갱신, 갱신은 한 곳에서만)"""
+        return token_cache.get(self._token_key(api_key), lambda: self._refresh_access_token(api_key, api_secret))
 
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            token = self._get_access_token(api_key, api_secret)
-            headers = {
+    def _build_request(self, method: str, path: str, *, api_key: str, token: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> ConnectorRequest:
+        return ConnectorRequest(
+            method=method,
+            url=f"{self.BASE_URL}{path}",
+            label=f"path={path}",
+            endpoint=self._endpoint(method, path),
+            params=params,
+            json=json_body,
+            headers={
                 "x-amz-access-token": token,
                 "Content-Type": "application/json",
-            }
-            try:
-                with httpx.Client(timeout=self.TIMEOUT_SECONDS) as client:
-                    response = client.request(method, url, params=params, json=json_body, headers=headers)
-
-                if response.status_code == 401:
-                    if attempt < self.MAX_RETRIES:
-                        self._access_token = None
-                        logger.warning("Amazon auth expired, refreshing token: path=%s", path)
-                        continue
-                    raise ConnectorAuthError("Amazon authentication failed")
-                if response.status_code == 429:
-                    logger.warning("Amazon rate limit: path=%s attempt=%s", path, attempt)
-                    if attempt == self.MAX_RETRIES:
-                        raise ConnectorRateLimitError("Amazon API rate limited")
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-                if response.status_code >= 500 and attempt < self.MAX_RETRIES:
-                    logger.warning("Amazon upstream error: status=%s path=%s attempt=%s", response.status_code, path, attempt)
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, dict):
-                    raise ConnectorResponseError("Amazon API returned non-object JSON")
-                return data
-            except httpx.TimeoutException as exc:
-                logger.warning("Amazon timeout: path=%s attempt=%s", path, attempt)
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorTimeoutError("Amazon API timed out") from exc
-            except httpx.HTTPStatusError as exc:
-                code = exc.response.status_code
-                raise ConnectorAPIError(
-                    f"Amazon API error ({code})",
-                    status_code=code,
-                    retryable=code >= 500,
-                ) from exc
-            except httpx.HTTPError as exc:
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorAPIError("Amazon transport error", retryable=True) from exc
-        raise ConnectorAPIError("Amazon request retries exhausted", retryable=True)
+            },
+            auth_key=self._token_key(api_key),
+        )
+
+    def _endpoint(self, method: str, path: str) -> str:
+        """호출 제한 분류 (SP-API 사용 계획 단위)"""
+        if path.startswith("/catalog/"):
+            return "catalog"
+        if method == "GET" and path == "/orders/v0/orders":
+            return "order_list"
+        return "orders"
+
+    def _check_response(self, response: httpx.Response, request: ConnectorRequest, attempt: int) -> Dict[str, Any]:
+        # 만료/폐기된 토큰: 공유 캐시에서 지우고 새 토큰으로 재시도
+        if response.status_code == 401:
+            if attempt < self.MAX_RETRIES:
+                token_cache.invalidate(request.auth_key)
+                logger.warning("Amazon auth expired, refreshing token: %s", request.label)
+                raise RetryRequest(0)
+            raise ConnectorAuthError("Amazon authentication failed")
+        return super()._check_response(response, request, attempt)
 
     def _normalize_product(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         summaries = (raw.get("summaries") or [{}])[0]
@@ -137,42 +119,29 @@ class AmazonConnector(BaseConnector):
             "title": summaries.get("itemName"),
             "images": [img.get("link") for img in raw.get("images", []) if img.get("link")],
         }
-    
-    def fetch_products(
-        self,
-        api_key: str = None,
-        api_secret: str = None,
-        config: Dict = None,
-        limit: int = 100,
-        category: str = None
-    ) -> List[Dict]:
-        if self._is_test_mode(config):
-            return self._fetch_products_test_data(limit)
 
+    def _product_page_params(self, config: Optional[Dict], cursor: Optional[str], page_size: int, category: Optional[str]) -> Dict[str, Any]:
+        """Catalog Items API: pageToken/pagination.nextToken. 변경 시각 필터는 미지원"""
         query = ((config or {}).get("query") or "best seller")
         params = {
             "marketplaceIds": self.config.get("marketplace_id", "ATVPDKIKX0DER"),
             "keywords": query,
-            "pageSize": min(limit, 20),
+            "pageSize": page_size,
         }
         if category:
             params["category"] = category
-        data = self._request("GET", "/catalog/2022-04-01/items", api_key=api_key, api_secret=api_secret, params=params)
+        if cursor:
+            params["pageToken"] = cursor
+        return params
+
+    def _parse_product_page(self, data: Dict[str, Any]) -> ProductPage:
         products = data.get("items", [])
         if not isinstance(products, list):
             raise ConnectorResponseError("Amazon products payload is invalid")
-        return [self._normalize_product(p) for p in products]
+        next_token = (data.get("pagination") or {}).get("nextToken")
+        return ProductPage([self._normalize_product(p) for p in products], next_token)
 
-    def _fetch_products_test_data(self, limit: int) -> List[Dict]:
-        return [{"external_id": f"amz-test-{i}", "price": 30.0 + i, "stock": 10, "variants": []} for i in range(min(limit, 5))]
-    
-    def get_product(
-        self,
-        api_key: str,
-        api_secret: str,
-        external_id: str
-    ) -> Optional[Dict]:
-        """단일 상품 조회"""
+    def _sample_product(self, external_id: str) -> Dict:
         return {
             "external_id": external_id,
             "asin": external_id.replace("amz-", ""),
@@ -187,23 +156,13 @@ class AmazonConnector(BaseConnector):
             "rating": 4.5,
             "review_count": 2500
         }
-    
-    def place_order(
-        self,
-        api_key: str,
-        api_secret: str,
-        order_data: Dict
-    ) -> Dict:
+
+    def _test_order(self, order_data: Dict) -> Optional[Dict]:
         if self._is_test_mode(order_data.get("config") if isinstance(order_data, dict) else None):
             return {"order_id": "AMZ-TEST-ORDER", "status": "placed"}
+        return None
 
-        data = self._request(
-            "POST",
-            "/orders/v0/orders",
-            api_key=api_key,
-            api_secret=api_secret,
-            json_body=order_data,
-        )
+    def _parse_placed_order(self, data: Dict[str, Any]) -> Dict:
         payload = data.get("payload", data)
         order_id = payload.get("AmazonOrderId") or payload.get("order_id")
         if not order_id:
@@ -214,33 +173,8 @@ class AmazonConnector(BaseConnector):
             "estimated_delivery": payload.get("LatestShipDate"),
             "raw": data,
         }
-    
-    def cancel_order(
-        self,
-        api_key: str,
-        api_secret: str,
-        order_id: str
-    ) -> Dict:
-        """주문 취소"""
-        return {
-            "order_id": order_id,
-            "status": "cancelled",
-            "refund_status": "pending",
-            "message": "Order cancelled successfully"
-        }
-    
-    def get_order_status(
-        self,
-        api_key: str,
-        api_secret: str,
-        order_id: str
-    ) -> Dict:
-        data = self._request(
-            "GET",
-            f"/orders/v0/orders/{order_id}",
-            api_key=api_key,
-            api_secret=api_secret,
-        )
+
+    def _parse_order_status(self, order_id: str, data: Dict[str, Any]) -> Dict:
         payload = data.get("payload", data)
         status = payload.get("OrderStatus") or payload.get("status")
         if not status:
@@ -253,14 +187,26 @@ class AmazonConnector(BaseConnector):
             "estimated_delivery": payload.get("LatestDeliveryDate"),
             "raw": data,
         }
-    
-    def get_tracking_info(
-        self,
-        tracking_number: str,
-        courier: str = None
-    ) -> Dict:
-        """배송 추적 정보 조회"""
-        from datetime import datetime, timedelta
+
+    def _order_statuses_params(self, order_ids: List[str]) -> Dict[str, Any]:
+        return {
+            "AmazonOrderIds": ",".join(order_ids),
+            "MarketplaceIds": self.config.get("marketplace_id", "ATVPDKIKX0DER"),
+        }
+
+    def _parse_order_statuses(self, order_ids: List[str], data: Dict[str, Any]) -> Dict[str, Union[Dict, Exception]]:
+        """getOrders 응답 → {order_id: 상태}. 응답에 없는 주문은 ConnectorResponseError"""
+        orders = (data.get("payload") or {}).get("Orders") or []
+        found = {str(order.get("AmazonOrderId")): order for order in orders}
+        results: Dict[str, Union[Dict, Exception]] = {}
+        for order_id in order_ids:
+            if order_id in found:
+                results[order_id] = self._parse_order_status(order_id, {"payload": found[order_id]})
+            else:
+                results[order_id] = ConnectorResponseError(f"Amazon order {order_id} missing from getOrders response")
+        return results
+
+    def _sample_tracking_info(self) -> Dict:
         now = datetime.utcnow()
         
         return {
@@ -292,6 +238,132 @@ class AmazonConnector(BaseConnector):
                 }
             ]
         }
+
+    def _sample_stock(self, product_id: str, variant_id: Optional[str]) -> Dict:
+        return {
+            "product_id": product_id,
+            "variant_id": variant_id,
+            "in_stock": True,
+            "quantity": random.randint(100, 1000),
+            "fulfillment_type": "FBA"  # Fulfillment by Amazon
+        }
+
+
+class AmazonConnector(AmazonProtocol, BaseConnector):
+    """
+    Amazon 공급처 커넥터 (스텁 구현)
+    실제 구현 시 Amazon Product Advertising API 또는 SP-API 연동 필요
+    https://developer.amazon.com/
+    """
+
+    def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # 시도마다 토큰 조회 (401 후 재시도는 새 토큰)
+        return self._execute(
+            lambda: self._build_request(
+                method,
+                path,
+                api_key=api_key,
+                token=self._get_access_token(api_key, api_secret),
+                params=params,
+                json_body=json_body,
+            )
+        )
+    
+    def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 20,
+        since: Optional[datetime] = None,
+        category: str = None
+    ) -> ProductPage:
+        """Catalog Items API: pageToken/pagination.nextToken. 변경 시각 필터는 미지원 (since 무시)"""
+        if self._is_test_mode(config):
+            return self._test_product_page("amz-test", 30.0, 10, config, cursor, page_size)
+
+        params = self._product_page_params(config, cursor, page_size, category)
+        data = self._request("GET", "/catalog/2022-04-01/items", api_key=api_key, api_secret=api_secret, params=params)
+        return self._parse_product_page(data)
+    
+    def get_product(
+        self,
+        api_key: str,
+        api_secret: str,
+        external_id: str
+    ) -> Optional[Dict]:
+        """단일 상품 조회"""
+        return self._sample_product(external_id)
+    
+    def place_order(
+        self,
+        api_key: str,
+        api_secret: str,
+        order_data: Dict
+    ) -> Dict:
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
+
+        data = self._request(
+            "POST",
+            "/orders/v0/orders",
+            api_key=api_key,
+            api_secret=api_secret,
+            json_body=order_data,
+        )
+        return self._parse_placed_order(data)
+    
+    def cancel_order(
+        self,
+        api_key: str,
+        api_secret: str,
+        order_id: str
+    ) -> Dict:
+        """주문 취소"""
+        return {
+            "order_id": order_id,
+            "status": "cancelled",
+            "refund_status": "pending",
+            "message": "Order cancelled successfully"
+        }
+    
+    def get_order_status(
+        self,
+        api_key: str,
+        api_secret: str,
+        order_id: str
+    ) -> Dict:
+        data = self._request(
+            "GET",
+            f"/orders/v0/orders/{order_id}",
+            api_key=api_key,
+            api_secret=api_secret,
+        )
+        return self._parse_order_status(order_id, data)
+    
+    def get_order_statuses(
+        self,
+        api_key: str,
+        api_secret: str,
+        order_ids: List[str]
+    ) -> Dict[str, Union[Dict, Exception]]:
+        """getOrders로 BULK_STATUS_SIZE건씩 일괄 조회"""
+        results: Dict[str, Union[Dict, Exception]] = {}
+        for start in range(0, len(order_ids), self.BULK_STATUS_SIZE):
+            chunk = order_ids[start:start + self.BULK_STATUS_SIZE]
+            try:
+                data = self._request(
+                    "GET", "/orders/v0/orders", api_key=api_key, api_secret=api_secret,
+                    params=self._order_statuses_params(chunk),
+                )
+            except ConnectorError as exc:
+                results.update({order_id: exc for order_id in chunk})
+                continue
+            results.update(self._parse_order_statuses(chunk, data))
+        return results
     
     def check_stock(
         self,
@@ -301,14 +373,7 @@ class AmazonConnector(BaseConnector):
         variant_id: str = None
     ) -> Dict:
         """재고 확인"""
-        import random
-        return {
-            "product_id": product_id,
-            "variant_id": variant_id,
-            "in_stock": True,
-            "quantity": random.randint(100, 1000),
-            "fulfillment_type": "FBA"  # Fulfillment by Amazon
-        }
+        return self._sample_stock(product_id, variant_id)
     
     def calculate_shipping(
         self,
@@ -391,3 +456,69 @@ class AmazonConnector(BaseConnector):
         )
         # 판매량 순으로 정렬된 것처럼 반환
         return products
+
+
+class AsyncAmazonConnector(AmazonProtocol, AsyncBaseConnector):
+    """AmazonConnector의 비동기 버전. 토큰 조회/갱신(Redis, LWA)은 동기 코드라 스레드에서 실행."""
+
+    async def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        async def build() -> ConnectorRequest:
+            token = await asyncio.to_thread(self._get_access_token, api_key, api_secret)
+            return self._build_request(method, path, api_key=api_key, token=token, params=params, json_body=json_body)
+
+        return await self._execute(build)
+
+    async def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 20,
+        since: Optional[datetime] = None,
+        category: str = None
+    ) -> ProductPage:
+        if self._is_test_mode(config):
+            return self._test_product_page("amz-test", 30.0, 10, config, cursor, page_size)
+
+        params = self._product_page_params(config, cursor, page_size, category)
+        data = await self._request("GET", "/catalog/2022-04-01/items", api_key=api_key, api_secret=api_secret, params=params)
+        return self._parse_product_page(data)
+
+    async def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+        return self._sample_product(external_id)
+
+    async def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
+        data = await self._request("POST", "/orders/v0/orders", api_key=api_key, api_secret=api_secret, json_body=order_data)
+        return self._parse_placed_order(data)
+
+    async def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
+        data = await self._request("GET", f"/orders/v0/orders/{order_id}", api_key=api_key, api_secret=api_secret)
+        return self._parse_order_status(order_id, data)
+
+    async def get_order_statuses(
+        self, api_key: str, api_secret: str, order_ids: List[str]
+    ) -> Dict[str, Union[Dict, BaseException]]:
+        """getOrders로 BULK_STATUS_SIZE건씩 일괄 조회 (묶음끼리는 fan_out)"""
+        chunks = [order_ids[i:i + self.BULK_STATUS_SIZE] for i in range(0, len(order_ids), self.BULK_STATUS_SIZE)]
+        pages = await self.fan_out([
+            lambda chunk=chunk: self._request(
+                "GET", "/orders/v0/orders", api_key=api_key, api_secret=api_secret,
+                params=self._order_statuses_params(chunk),
+            )
+            for chunk in chunks
+        ])
+        results: Dict[str, Union[Dict, BaseException]] = {}
+        for chunk, page in zip(chunks, pages):
+            if isinstance(page, BaseException):
+                results.update({order_id: page for order_id in chunk})
+            else:
+                results.update(self._parse_order_statuses(chunk, page))
+        return results
+
+    async def check_stock(self, api_key: str, api_secret: str, product_id: str, variant_id: str = None) -> Dict:
+        return self._sample_stock(product_id, variant_id)
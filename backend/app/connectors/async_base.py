@@ -0,0 +1,205 @@
+"""
+비동기 공급처 커넥터
+- 동기 커넥터(BaseConnector)와 같은 공급처별 Protocol(서명/파라미터/파싱)을 쓰고 전송만 httpx.AsyncClient
+- 재시도/호출 제한 대기는 asyncio.sleep → 대기 중에도 같은 루프의 다른 요청 진행 (Redis 버킷 호출은 스레드에서)
+- fan_out: 여러 호출을 세마포어(동시 요청 수 제한)로 묶어 동시에 실행 (주문 상태 조회, 배송 추적, 재고 확인 등)
+- AsyncClient는 이벤트 루프에 묶이므로 `async with` 블록(또는 aclose) 단위로 사용
+"""
+import asyncio
+import inspect
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar, Union
+
+import httpx
+
+from app.core.config import settings
+
+from . import circuit, ratelimit
+from .exceptions import ConnectorError, ConnectorRateLimitError
+from .http import build_async_client
+from .protocol import ConnectorProtocol, ConnectorRequest, ProductPage, RetryRequest
+
+T = TypeVar("T")
+
+
+class AsyncBaseConnector(ConnectorProtocol, ABC):
+    """
+    비동기 공급처 커넥터 기본 인터페이스.
+    메서드 의미는 BaseConnector와 같고 모두 코루틴.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, supplier_id: Optional[int] = None):
+        super().__init__(config, supplier_id)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = build_async_client(self.TIMEOUT_SECONDS, self.config.get("http"))
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _throttle(self, endpoint: str) -> None:
+        """BaseConnector._throttle의 비동기 버전"""
+        limit = self._rate_limit(endpoint)
+        if limit is None:
+            return
+        bucket = self._bucket(endpoint)
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(ratelimit.rate_limiter.acquire, bucket, *limit)
+            if wait <= 0:
+                return
+            waited += wait
+            if waited > settings.CONNECTOR_RATE_LIMIT_MAX_WAIT:
+                raise ConnectorRateLimitError(f"{self.NAME} client rate limit wait exceeded", retry_after=wait)
+            await asyncio.sleep(wait)
+
+    async def _hold(self, endpoint: str, seconds: float) -> bool:
+        """BaseConnector._hold의 비동기 버전"""
+        if self._rate_limit(endpoint) is None:
+            return False
+        return await asyncio.to_thread(ratelimit.rate_limiter.block, self._bucket(endpoint), seconds)
+
+    async def _execute(self, build: Callable[[], Union[ConnectorRequest, Awaitable[ConnectorRequest]]]) -> Dict[str, Any]:
+        """BaseConnector._execute의 비동기 버전 (build는 코루틴 함수여도 됨)"""
+        breaker = circuit.circuit_breaker
+        options = circuit.circuit_options(self.config.get("circuit"))
+        permit = await asyncio.to_thread(breaker.allow, self._owner(), self.NAME, options)
+        try:
+            data = await self._send(build)
+        except ConnectorError as exc:
+            await asyncio.to_thread(breaker.record, permit, self.NAME, options, exc)
+            raise
+        if permit.dirty:
+            await asyncio.to_thread(breaker.record, permit, self.NAME, options)
+        return data
+
+    async def _send(self, build: Callable[[], Union[ConnectorRequest, Awaitable[ConnectorRequest]]]) -> Dict[str, Any]:
+        """BaseConnector._send의 비동기 버전"""
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            request = build()
+            if inspect.isawaitable(request):
+                request = await request
+            await self._throttle(request.endpoint)
+            try:
+                response = await self._http().request(**request.send_kwargs())
+                return self._check_response(response, request, attempt)
+            except RetryRequest as retry:
+                if retry.retry_after is not None and await self._hold(request.endpoint, retry.retry_after):
+                    continue
+                if retry.delay:
+                    await asyncio.sleep(retry.delay)
+            except ConnectorRateLimitError as exc:
+                if exc.retry_after:
+                    await self._hold(request.endpoint, exc.retry_after)
+                raise
+            except httpx.HTTPError as exc:
+                error = self._transport_error(exc, request, attempt)
+                if error is not None:
+                    raise error from exc
+        raise self._retries_exhausted()
+
+    async def fan_out(
+        self,
+        calls: Iterable[Callable[[], Awaitable[T]]],
+        concurrency: Optional[int] = None,
+    ) -> List[Union[T, BaseException]]:
+        """
+        calls를 동시에 실행 (최대 concurrency개, 기본 config.max_concurrency 또는 CONNECTOR_ASYNC_CONCURRENCY)
+        Returns: 입력 순서대로 결과 또는 예외 (한 건 실패가 나머지를 취소하지 않음)
+        """
+        limit = concurrency or int(self.config.get("max_concurrency") or settings.CONNECTOR_ASYNC_CONCURRENCY)
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def _run(call: Callable[[], Awaitable[T]]) -> T:
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*[_run(call) for call in calls], return_exceptions=True)
+
+    @abstractmethod
+    async def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        category: str = None
+    ) -> ProductPage:
+        """BaseConnector.fetch_product_page 참고"""
+
+    async def iter_products(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        since: Optional[datetime] = None,
+        page_size: int = 100,
+        category: str = None,
+        max_items: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """BaseConnector.iter_products 참고 (async for)"""
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        cursor = None
+        yielded = 0
+        while True:
+            page = await self.fetch_product_page(
+                api_key,
+                api_secret,
+                config,
+                cursor=cursor,
+                page_size=page_size,
+                since=since,
+                category=category,
+            )
+            for item in page.items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+            if not page.next_cursor or not page.items:
+                return
+            cursor = page.next_cursor
+
+    @abstractmethod
+    async def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+        """단일 상품 상세 정보"""
+
+    @abstractmethod
+    async def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+        """외부 주문 생성. Returns: {order_id, status, ...}"""
+
+    @abstractmethod
+    async def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
+        """주문 상태 조회. Returns: {status, tracking_number, ...}"""
+
+    async def get_order_statuses(
+        self, api_key: str, api_secret: str, order_ids: List[str]
+    ) -> Dict[str, Union[Dict, BaseException]]:
+        """
+        여러 주문 상태 조회. 공급처 일괄 조회 API가 있으면 커넥터가 오버라이드,
+        기본은 건별 조회를 fan_out (동시 요청 수 제한). Returns: {order_id: 결과 또는 예외}
+        """
+        outcomes = await self.fan_out(
+            [lambda order_id=order_id: self.get_order_status(api_key, api_secret, order_id) for order_id in order_ids]
+        )
+        return dict(zip(order_ids, outcomes))
+
+    async def get_tracking_info(self, tracking_number: str, courier: str = None) -> Dict:
+        """배송 추적 정보 조회. Returns: {current_status, events: [...]}"""
+        return self._sample_tracking_info()
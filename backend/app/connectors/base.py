@@ -1,17 +1,145 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterator, Optional, Union
 
+import httpx
 
-class BaseConnector(ABC):
+from app.core.config import settings
+
+from . import circuit, ratelimit
+from .exceptions import ConnectorError, ConnectorRateLimitError
+from .http import get_client
+from .protocol import ConnectorProtocol, ConnectorRequest, ProductPage, RetryRequest
+
+__all__ = ["BaseConnector", "ConnectorRequest", "ProductPage"]
+
+
+class BaseConnector(ConnectorProtocol, ABC):
     """
     공급처 커넥터 기본 인터페이스.
     모든 공급처 커넥터는 이 클래스를 상속해야 함.
+    비동기 버전은 app.connectors.async_base.AsyncBaseConnector.
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
-        self.config = config or {}
+    def _http(self) -> httpx.Client:
+        """프로세스 단위로 재사용하는 HTTP 클라이언트 (연결 설정: config["http"], app.connectors.http)"""
+        return get_client(type(self).__name__, self.TIMEOUT_SECONDS, self.config.get("http"))
+    
+    def _throttle(self, endpoint: str) -> None:
+        """전송 전 호출 제한 버킷에서 토큰 획득 (없으면 대기, CONNECTOR_RATE_LIMIT_MAX_WAIT 초과 시 ConnectorRateLimitError)"""
+        limit = self._rate_limit(endpoint)
+        if limit is None:
+            return
+        bucket = self._bucket(endpoint)
+        waited = 0.0
+        while True:
+            wait = ratelimit.rate_limiter.acquire(bucket, *limit)
+            if wait <= 0:
+                return
+            waited += wait
+            if waited > settings.CONNECTOR_RATE_LIMIT_MAX_WAIT:
+                raise ConnectorRateLimitError(f"{self.NAME} client rate limit wait exceeded", retry_after=wait)
+            time.sleep(wait)
+
+    def _hold(self, endpoint: str, seconds: float) -> bool:
+        """Retry-After를 버킷에 기록 (모든 워커가 다음 _throttle에서 대기). 한도 미설정/Redis 장애면 False."""
+        return self._rate_limit(endpoint) is not None and ratelimit.rate_limiter.block(self._bucket(endpoint), seconds)
+
+    def _execute(self, build: Callable[[], ConnectorRequest]) -> Dict[str, Any]:
+        """
+        build()로 만든 요청을 전송하고 MAX_RETRIES까지 재시도 (요청은 시도마다 다시 구성: 토큰 갱신 등)
+        공급처 서킷이 열려 있으면 요청 없이 ConnectorCircuitOpenError, 결과(장애/응답)는 서킷에 반영
+        """
+        options = circuit.circuit_options(self.config.get("circuit"))
+        permit = circuit.circuit_breaker.allow(self._owner(), self.NAME, options)
+        try:
+            data = self._send(build)
+        except ConnectorError as exc:
+            circuit.circuit_breaker.record(permit, self.NAME, options, exc)
+            raise
+        circuit.circuit_breaker.record(permit, self.NAME, options)
+        return data
+
+    def _send(self, build: Callable[[], ConnectorRequest]) -> Dict[str, Any]:
+        """재시도 루프: 시도마다 호출 제한 토큰을 먼저 획득, 429/503의 Retry-After는 버킷 전체에 적용"""
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            request = build()
+            self._throttle(request.endpoint)
+            try:
+                response = self._http().request(**request.send_kwargs())
+                return self._check_response(response, request, attempt)
+            except RetryRequest as retry:
+                if retry.retry_after is not None and self._hold(request.endpoint, retry.retry_after):
+                    continue
+                if retry.delay:
+                    time.sleep(retry.delay)
+            except ConnectorRateLimitError as exc:
+                if exc.retry_after:
+                    self._hold(request.endpoint, exc.retry_after)
+                raise
+            except httpx.HTTPError as exc:
+                error = self._transport_error(exc, request, attempt)
+                if error is not None:
+                    raise error from exc
+        raise self._retries_exhausted()
     
     @abstractmethod
+    def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        category: str = None
+    ) -> ProductPage:
+        """
+        상품 목록 한 페이지 (cursor: 이전 페이지의 next_cursor, 첫 페이지는 None)
+        since: 이 시각 이후 변경된 상품만 (공급처가 지원하지 않으면 무시)
+        Returns: ProductPage(items=[{external_id, title, price, images, variants, ...}], next_cursor)
+        """
+        pass
+    
+    def iter_products(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        since: Optional[datetime] = None,
+        page_size: int = 100,
+        category: str = None,
+        max_items: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        전체 상품을 페이지 단위로 받아 하나씩 yield (메모리는 페이지 크기만큼만 사용)
+        max_items: 최대 개수 (None이면 마지막 페이지까지)
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        cursor = None
+        yielded = 0
+        while True:
+            page = self.fetch_product_page(
+                api_key,
+                api_secret,
+                config,
+                cursor=cursor,
+                page_size=page_size,
+                since=since,
+                category=category,
+            )
+            for item in page.items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+            if not page.next_cursor or not page.items:
+                return
+            cursor = page.next_cursor
+    
     def fetch_products(
         self,
         api_key: str = None,
@@ -21,10 +149,14 @@ class BaseConnector(ABC):
         category: str = None
     ) -> List[Dict]:
         """
-        상품 목록 가져오기
+        상품 목록 가져오기 (최대 limit개, 필요한 만큼 페이지 이동)
         Returns: [{external_id, title, price, images, variants, ...}]
         """
-        pass
+        return list(
+            self.iter_products(
+                api_key, api_secret, config, page_size=limit, category=category, max_items=limit
+            )
+        )
     
     @abstractmethod
     def get_product(
@@ -64,6 +196,24 @@ class BaseConnector(ABC):
         """
         pass
     
+    def get_order_statuses(
+        self,
+        api_key: str,
+        api_secret: str,
+        order_ids: List[str]
+    ) -> Dict[str, Union[Dict, Exception]]:
+        """
+        여러 주문 상태 조회 (공급처 일괄 조회 API가 있으면 커넥터가 오버라이드, 기본은 건별 조회)
+        Returns: {order_id: get_order_status 결과 또는 ConnectorError}
+        """
+        results: Dict[str, Union[Dict, Exception]] = {}
+        for order_id in order_ids:
+            try:
+                results[order_id] = self.get_order_status(api_key, api_secret, order_id)
+            except ConnectorError as exc:
+                results[order_id] = exc
+        return results
+    
     def get_tracking_info(
         self,
         tracking_number: str,
@@ -73,13 +223,4 @@ class BaseConnector(ABC):
         배송 추적 정보 조회
         Returns: {current_status, events: [{status, description, location, time}]}
         """
-        return {
-            "current_status": "in_transit",
-            "events": []
-        }
-    
-    def normalize_product(self, raw_data: Dict) -> Dict:
-        """
-        외부 데이터를 내부 형식으로 변환 (오버라이드 가능)
-        """
-        return raw_data
+        return self._sample_tracking_info()
@@ -0,0 +1,225 @@
+"""
+공급처 커넥터 서킷 브레이커 (워커 공유, Redis)
+- 공급처별 해시 connector-circuit:{공급처 id} {state, failures, open_until, probe_until, trips}
+- closed: 연속 장애(ConnectorTimeoutError, 재시도 가능한 ConnectorAPIError)가 failure_threshold에 도달하면 open
+- open: open_seconds 동안 요청 없이 즉시 ConnectorCircuitOpenError (워커 슬롯을 타임아웃 대기로 묶지 않음)
+- half_open: open 시간이 지나면 시험 요청 1건만 허용 (probe_seconds 동안 다른 요청은 계속 거부)
+  시험 요청이 응답을 받으면(성공 또는 장애가 아닌 오류) closed, 장애면 다시 open
+- 한도는 settings 기본값 + 공급처 config["circuit"] {"failure_threshold": 5, "open_seconds": 60}
+- Redis 장애 시 브레이커 없이 진행 (fail-open)
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_sync_redis
+
+from .exceptions import ConnectorAPIError, ConnectorCircuitOpenError, ConnectorRateLimitError, ConnectorTimeoutError
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "connector-circuit"
+_KEY_TTL_MS = 86400 * 1000  # 삭제된 공급처 상태 정리
+
+_NOW = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+"""
+
+# ARGV: probe_ms → {1: closed 허용 | 2: 시험 요청 허용 | 0: 거부, failures 또는 남은 ms}
+_ALLOW = _NOW + """
+local h = redis.call('HMGET', KEYS[1], 'state', 'open_until', 'probe_until', 'failures')
+local state = h[1] or 'closed'
+if state == 'closed' then
+    return {1, tonumber(h[4]) or 0}
+end
+local open_until = tonumber(h[2]) or 0
+if now < open_until then
+    return {0, open_until - now}
+end
+local probe_until = tonumber(h[3]) or 0
+if now < probe_until then
+    return {0, probe_until - now}
+end
+redis.call('HSET', KEYS[1], 'state', 'half_open', 'probe_until', now + tonumber(ARGV[1]))
+return {2, 0}
+"""
+
+# ARGV: failure_threshold, open_ms, ttl_ms → 1이면 이번 장애로 open
+_FAILURE = _NOW + """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'open' then
+    return 0
+end
+if state == 'closed' then
+    local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+    if failures < tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[1], 'state', 'open', 'open_until', now + tonumber(ARGV[2]), 'probe_until', 0)
+redis.call('HINCRBY', KEYS[1], 'trips', 1)
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# 다른 워커가 그 사이 open으로 바꿨으면 유지
+_SUCCESS = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if state == 'open' then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'closed', 'failures', 0, 'open_until', 0, 'probe_until', 0)
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+def circuit_key(owner: str) -> str:
+    return f"{KEY_PREFIX}:{owner}"
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def is_circuit_failure(exc: BaseException) -> bool:
+    """서킷을 여는 장애: 타임아웃, 재시도 가능한 API/전송 오류 (429 호출 제한은 제외)"""
+    if isinstance(exc, ConnectorTimeoutError):
+        return True
+    return isinstance(exc, ConnectorAPIError) and exc.retryable
+
+
+@dataclass
+class CircuitPermit:
+    """allow()가 허용한 호출 1건. failures/probe가 없으면 성공 시 Redis 쓰기 생략."""
+    key: Optional[str]
+    probe: bool = False
+    failures: int = 0
+
+    @property
+    def dirty(self) -> bool:
+        """성공 시 Redis에 반영할 상태(시험 요청, 누적 장애)가 있는지"""
+        return self.key is not None and (self.probe or self.failures > 0)
+
+
+@dataclass
+class CircuitStats:
+    rejected: int = 0
+    opened: int = 0
+    probes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"rejected": self.rejected, "opened": self.opened, "probes": self.probes}
+
+
+class CircuitBreaker:
+    def __init__(self, client_factory: Callable[[], redis.Redis] = get_sync_redis):
+        self._client_factory = client_factory
+        self._scripts: Dict[str, Any] = {}
+        self._down_until = 0.0
+        self.stats = CircuitStats()  # 이 프로세스 카운터 (/metrics)
+
+    def _client(self) -> Optional[redis.Redis]:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return self._client_factory()
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None
+
+    def _failed(self, exc: Exception) -> None:
+        self._down_until = time.monotonic() + settings.CONNECTOR_RATE_LIMIT_RETRY_SECONDS
+        logger.warning("connector circuit breaker unavailable, not tripping: %s", exc)
+
+    def _run(self, name: str, source: str, key: str, *args) -> Any:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            script = self._scripts.get(name)
+            if script is None or script.registered_client is not client:
+                script = self._scripts[name] = client.register_script(source)
+            return script(keys=[key], args=list(args))
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None
+
+    def allow(self, owner: str, name: str, options: Dict[str, Any]) -> CircuitPermit:
+        """호출 허용 여부. open이면 ConnectorCircuitOpenError (retry_after: 다시 시도할 수 있는 초)."""
+        key = circuit_key(owner)
+        reply = self._run("allow", _ALLOW, key, int(options["probe_seconds"] * 1000))
+        if reply is None:
+            return CircuitPermit(None)
+        verdict, value = int(reply[0]), int(reply[1])
+        if verdict == 0:
+            self.stats.rejected += 1
+            raise ConnectorCircuitOpenError(f"{name} circuit open", retry_after=value / 1000)
+        if verdict == 2:
+            self.stats.probes += 1
+            logger.info("%s circuit half-open, probing: %s", name, key)
+            return CircuitPermit(key, probe=True)
+        return CircuitPermit(key, failures=value)
+
+    def record(self, permit: CircuitPermit, name: str, options: Dict[str, Any], exc: Optional[BaseException] = None) -> None:
+        """호출 결과 반영. exc가 없거나 장애가 아닌 ConnectorError면 성공 (공급처가 응답함)."""
+        if permit.key is None or isinstance(exc, ConnectorRateLimitError):
+            return  # 호출 제한 대기 초과/429는 장애도 회복도 아님
+        if exc is not None and is_circuit_failure(exc):
+            opened = self._run(
+                "failure", _FAILURE, permit.key,
+                int(options["failure_threshold"]), int(options["open_seconds"] * 1000), _KEY_TTL_MS,
+            )
+            if opened:
+                self.stats.opened += 1
+                logger.warning("%s circuit opened for %ss: %s (%s)", name, options["open_seconds"], permit.key, exc)
+            return
+        if permit.dirty:
+            if self._run("success", _SUCCESS, permit.key, _KEY_TTL_MS) and permit.probe:
+                logger.info("%s circuit closed: %s", name, permit.key)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """공급처별 공유 상태 {owner: {state, failures, trips, retry_in}} (/metrics)"""
+        client = self._client()
+        if client is None:
+            return {}
+        now_ms = int(time.time() * 1000)
+        states: Dict[str, Dict[str, Any]] = {}
+        try:
+            for key in client.scan_iter(match=f"{KEY_PREFIX}:*", count=100):
+                key = _text(key)
+                raw = {_text(k): _text(v) for k, v in client.hgetall(key).items()}
+                open_until = int(raw.get("open_until") or 0)
+                states[key[len(KEY_PREFIX) + 1:]] = {
+                    "state": raw.get("state", "closed"),
+                    "failures": int(raw.get("failures") or 0),
+                    "trips": int(raw.get("trips") or 0),
+                    "retry_in": max(0, open_until - now_ms) / 1000,
+                }
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+        return states
+
+
+def circuit_options(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """settings 기본값에 공급처 config["circuit"]를 덮어쓴 브레이커 설정."""
+    options = {
+        "failure_threshold": settings.CONNECTOR_CIRCUIT_FAILURE_THRESHOLD,
+        "open_seconds": settings.CONNECTOR_CIRCUIT_OPEN_SECONDS,
+        "probe_seconds": settings.CONNECTOR_CIRCUIT_PROBE_SECONDS,
+    }
+    options.update({k: v for k, v in (overrides or {}).items() if k in options})
+    return options
+
+
+circuit_breaker = CircuitBreaker()
+
+
+def circuit_metrics() -> Dict[str, Any]:
+    return {"process": circuit_breaker.stats.as_dict(), "suppliers": circuit_breaker.snapshot()}
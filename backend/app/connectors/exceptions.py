@@ -1,3 +1,4 @@
+import math
 from typing import Optional
 
 
@@ -15,8 +16,17 @@ class ConnectorAuthError(ConnectorError):
 
 
 class ConnectorRateLimitError(ConnectorError):
-    def __init__(self, message: str = "Connector API rate limit exceeded"):
+    def __init__(self, message: str = "Connector API rate limit exceeded", *, retry_after: Optional[float] = None):
         super().__init__(message, retryable=True)
+        self.retry_after = retry_after
+
+
+class ConnectorCircuitOpenError(ConnectorError):
+    """공급처 서킷 open: 요청하지 않고 즉시 실패. retry_after초 뒤 다시 시도."""
+
+    def __init__(self, message: str = "Connector circuit open", *, retry_after: Optional[float] = None):
+        super().__init__(message, retryable=True)
+        self.retry_after = retry_after
 
 
 class ConnectorTimeoutError(ConnectorError):
@@ -39,3 +49,11 @@ class ConnectorAPIError(ConnectorError):
 class ConnectorResponseError(ConnectorError):
     def __init__(self, message: str = "Connector API returned malformed response"):
         super().__init__(message, retryable=False)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[int]:
+    """호출 제한/서킷 open 오류가 알려준 재시도 시점 (올림 초). 없으면 None (Celery 기본 지연)."""
+    retry_after = getattr(exc, "retry_after", None)
+    if not isinstance(exc, ConnectorError) or not retry_after:
+        return None
+    return max(1, math.ceil(retry_after))
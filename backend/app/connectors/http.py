@@ -0,0 +1,94 @@
+"""
+커넥터 공용 HTTP 클라이언트 (워커 프로세스당 재사용)
+- 요청마다 httpx.Client를 만들면 매번 TCP+TLS 핸드셰이크 → 프로세스 단위로 클라이언트를 유지해 keep-alive 재사용
+- 클라이언트 키: (커넥터 이름, timeout, 연결 설정). 설정은 settings 기본값 + 공급처 config["http"]
+  {"http2": true, "max_connections": 20, "max_keepalive_connections": 10, "keepalive_expiry": 30}
+- HTTP/2는 h2 패키지(httpx[http2])가 있을 때만, 없으면 HTTP/1.1 keep-alive
+- Celery prefork: fork 전에 만든 클라이언트(소켓 공유)는 자식에서 버리고 새로 생성 (pid 확인)
+- 워커 종료 시 close_clients() (app.celery_app의 worker_process_shutdown 시그널)
+- httpx.AsyncClient는 이벤트 루프에 묶이므로 풀에 두지 않고 비동기 커넥터 인스턴스가 소유 (build_async_client)
+  fan_out_by_supplier는 워커 전용 루프에서 공급처별 커넥터를 재사용 (app.connectors)
+"""
+import importlib.util
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: Dict[Tuple, httpx.Client] = {}
+_pid = os.getpid()
+_lock = threading.Lock()
+
+
+def client_options(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """settings 기본값에 공급처 config["http"]를 덮어쓴 연결 설정."""
+    options = {
+        "http2": settings.CONNECTOR_HTTP2,
+        "max_connections": settings.CONNECTOR_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.CONNECTOR_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": settings.CONNECTOR_KEEPALIVE_EXPIRY,
+    }
+    options.update({k: v for k, v in (overrides or {}).items() if k in options})
+    return options
+
+
+def get_client(name: str, timeout: float, overrides: Optional[Dict[str, Any]] = None) -> httpx.Client:
+    """name(커넥터)별 재사용 클라이언트. 닫지 말 것 (close_clients에서 일괄 종료)."""
+    global _pid
+    options = client_options(overrides)
+    key = (name, timeout, *sorted(options.items()))
+    with _lock:
+        if os.getpid() != _pid:
+            # fork된 자식: 부모 소켓을 닫지 않고 참조만 버림
+            _clients.clear()
+            _pid = os.getpid()
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = _clients[key] = _build_client(timeout, options)
+        return client
+
+
+def _client_kwargs(timeout: float, options: Dict[str, Any]) -> Dict[str, Any]:
+    http2 = bool(options["http2"])
+    if http2 and not HTTP2_AVAILABLE:
+        logger.warning("h2 package not installed, connector HTTP/2 disabled")
+        http2 = False
+    return {
+        "timeout": timeout,
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=options["max_connections"],
+            max_keepalive_connections=options["max_keepalive_connections"],
+            keepalive_expiry=options["keepalive_expiry"],
+        ),
+    }
+
+
+def _build_client(timeout: float, options: Dict[str, Any]) -> httpx.Client:
+    return httpx.Client(**_client_kwargs(timeout, options))
+
+
+def build_async_client(timeout: float, overrides: Optional[Dict[str, Any]] = None) -> httpx.AsyncClient:
+    """현재 이벤트 루프용 AsyncClient (호출자가 aclose)."""
+    return httpx.AsyncClient(**_client_kwargs(timeout, client_options(overrides)))
+
+
+def close_clients() -> int:
+    """이 프로세스의 클라이언트를 모두 닫음. 닫은 수 반환."""
+    with _lock:
+        clients = list(_clients.values()) if os.getpid() == _pid else []
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning("connector http client close failed: %s", e)
+    return len(clients)
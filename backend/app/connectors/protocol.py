@@ -0,0 +1,180 @@
+"""
+동기/비동기 커넥터 공통 (I/O 없음)
+- ConnectorRequest: 공급처 API 요청 1건. 재시도 루프(BaseConnector._execute / AsyncBaseConnector._execute)가 전송
+- ConnectorProtocol: 응답 판정(_check_response), 전송 오류 변환(_transport_error), 호출 제한 버킷/한도, test_mode 데이터
+- 전송 전후: 서킷 브레이커(app.connectors.circuit) → 호출 제한(app.connectors.ratelimit) → 요청
+  공급처별 서명/파라미터/응답 파싱은 각 커넥터의 *Protocol 클래스에 두고 동기/비동기 커넥터가 함께 상속
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .exceptions import (
+    ConnectorAPIError,
+    ConnectorAuthError,
+    ConnectorError,
+    ConnectorRateLimitError,
+    ConnectorResponseError,
+    ConnectorTimeoutError,
+)
+from .ratelimit import bucket_key, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProductPage:
+    """상품 목록 한 페이지. next_cursor가 없으면 마지막 페이지."""
+    items: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class ConnectorRequest:
+    """공급처 API 요청 1건. label은 로그용 (path 또는 API method), endpoint는 호출 제한 분류 (catalog, orders 등)."""
+    method: str
+    url: str
+    label: str
+    endpoint: str = "default"
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+    auth_key: Optional[str] = None  # 토큰 캐시 키 (401 시 무효화)
+
+    def send_kwargs(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url,
+            "params": self.params,
+            "json": self.json,
+            "data": self.data,
+            "headers": self.headers,
+        }
+
+
+class RetryRequest(Exception):
+    """
+    _check_response가 재시도를 요청 (delay초 후 요청을 다시 구성해 전송).
+    retry_after: 공급처가 Retry-After로 지정한 대기 → 버킷을 막아 다른 워커도 함께 대기
+    """
+
+    def __init__(self, delay: float = 0, retry_after: Optional[float] = None):
+        super().__init__(delay)
+        self.delay = delay
+        self.retry_after = retry_after
+
+
+class ConnectorProtocol:
+    NAME = "Connector"  # 로그/오류 메시지용 공급처 이름
+    TIMEOUT_SECONDS = 15
+    MAX_RETRIES = 3
+    MAX_PAGE_SIZE = 100  # 공급처 API의 페이지당 최대 개수
+    SUPPORTS_SINCE = False  # fetch_product_page의 since(변경 시각) 필터 지원 여부 → delta 동기화 가능
+    # 엔드포인트 분류별 기본 호출 한도 {"catalog": {"rate": 초당 요청, "burst": 최대 연속}}, "default"는 나머지.
+    # 공급처 config["rate_limits"]가 분류 단위로 우선. 한도가 없는 분류는 제한 없음
+    RATE_LIMITS: Dict[str, Dict[str, float]] = {}
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, supplier_id: Optional[int] = None):
+        self.config = config or {}
+        self.supplier_id = supplier_id  # 호출 제한 버킷 키 (없으면 커넥터 이름 단위로 공유)
+
+    def _is_test_mode(self, config: Optional[Dict[str, Any]]) -> bool:
+        cfg = config or self.config or {}
+        return bool(cfg.get("test_mode"))
+
+    def _backoff(self, attempt: int) -> float:
+        return min(2 ** attempt, 8)
+
+    def _rate_limit(self, endpoint: str) -> Optional[Tuple[float, int]]:
+        """endpoint 분류의 (초당 rate, burst). 한도가 없으면 None."""
+        configured = self.config.get("rate_limits") or {}
+        limit = (
+            configured.get(endpoint)
+            or self.RATE_LIMITS.get(endpoint)
+            or configured.get("default")
+            or self.RATE_LIMITS.get("default")
+        )
+        if not limit or not limit.get("rate"):
+            return None
+        rate = float(limit["rate"])
+        return rate, max(1, int(limit.get("burst") or 1))
+
+    def _owner(self) -> str:
+        """공유 상태(호출 제한, 서킷) 키: 공급처 id, 없으면 커넥터 이름"""
+        return str(self.supplier_id) if self.supplier_id is not None else self.NAME.lower()
+
+    def _bucket(self, endpoint: str) -> str:
+        return bucket_key(self._owner(), endpoint)
+
+    def _retry(self, response: httpx.Response, attempt: int) -> RetryRequest:
+        """Retry-After가 있으면 그만큼, 없으면 지수 백오프 후 재시도"""
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return RetryRequest(self._backoff(attempt))
+        return RetryRequest(retry_after, retry_after=retry_after)
+
+    def _check_response(self, response: httpx.Response, request: ConnectorRequest, attempt: int) -> Dict[str, Any]:
+        """성공 응답의 JSON 반환. 재시도할 응답은 RetryRequest, 그 외 실패는 ConnectorError."""
+        if response.status_code == 401:
+            raise ConnectorAuthError(f"{self.NAME} authentication failed")
+        if response.status_code == 429:
+            logger.warning("%s rate limited: %s attempt=%s", self.NAME, request.label, attempt)
+            retry = self._retry(response, attempt)
+            if attempt == self.MAX_RETRIES:
+                raise ConnectorRateLimitError(f"{self.NAME} API rate limited", retry_after=retry.retry_after)
+            raise retry
+        if response.status_code >= 500 and attempt < self.MAX_RETRIES:
+            logger.warning(
+                "%s upstream error: status=%s %s attempt=%s", self.NAME, response.status_code, request.label, attempt
+            )
+            raise self._retry(response, attempt)
+        if response.status_code >= 400:
+            code = response.status_code
+            raise ConnectorAPIError(f"{self.NAME} API error ({code})", status_code=code, retryable=code >= 500)
+        data = response.json()
+        if not isinstance(data, dict):
+            raise ConnectorResponseError(f"{self.NAME} API returned non-object JSON")
+        return data
+
+    def _transport_error(self, exc: httpx.HTTPError, request: ConnectorRequest, attempt: int) -> Optional[ConnectorError]:
+        """전송 오류 → 마지막 시도면 ConnectorError, 아니면 None (즉시 재시도)."""
+        if isinstance(exc, httpx.TimeoutException):
+            logger.warning("%s timeout: %s attempt=%s", self.NAME, request.label, attempt)
+            if attempt == self.MAX_RETRIES:
+                return ConnectorTimeoutError(f"{self.NAME} API timed out")
+            return None
+        if attempt == self.MAX_RETRIES:
+            return ConnectorAPIError(f"{self.NAME} transport error", retryable=True)
+        return None
+
+    def _retries_exhausted(self) -> ConnectorError:
+        return ConnectorAPIError(f"{self.NAME} request retries exhausted", retryable=True)
+
+    def _test_product_page(
+        self, prefix: str, base_price: float, stock: int, config: Optional[Dict], cursor: Optional[str], page_size: int
+    ) -> ProductPage:
+        """test_mode용 가짜 카탈로그 (config.test_catalog_size개, 기본 5개)를 offset cursor로 페이지 분할"""
+        total = int((config or self.config or {}).get("test_catalog_size", 5))
+        start = int(cursor or 0)
+        end = min(start + page_size, total)
+        items = [
+            {"external_id": f"{prefix}-{i}", "price": base_price + i, "stock": stock, "variants": []}
+            for i in range(start, end)
+        ]
+        return ProductPage(items, str(end) if end < total else None)
+
+    def _sample_tracking_info(self) -> Dict:
+        """실제 배송 추적 API 연동 전 기본값"""
+        return {
+            "current_status": "in_transit",
+            "events": []
+        }
+
+    def normalize_product(self, raw_data: Dict) -> Dict:
+        """
+        외부 데이터를 내부 형식으로 변환 (오버라이드 가능)
+        """
+        return raw_data
@@ -0,0 +1,121 @@
+"""
+공급처 API 호출 제한 (워커 공유 토큰 버킷, Redis)
+- 버킷: connector-rate:{공급처 id}:{엔드포인트 분류} 해시 {tokens, ts}. Lua 스크립트 하나로 보충 + 차감 (원자적, Redis TIME 기준)
+- 한도(초당 rate, 최대 burst)는 공급처 config["rate_limits"] > 커넥터 RATE_LIMITS 기본값
+  {"default": {"rate": 5, "burst": 10}, "catalog": {"rate": 2, "burst": 2}, "orders": {"rate": 0.5, "burst": 10}}
+- 429/503 Retry-After: 버킷 차단 키(PX)를 설정해 모든 워커가 그 시간 동안 대기
+- Redis 장애 시 제한 없이 진행 (fail-open, CONNECTOR_RATE_LIMIT_RETRY_SECONDS 동안 재시도 안 함) — 429 백오프가 최후 방어선
+"""
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "connector-rate"
+
+# KEYS: 버킷, 차단 키 / ARGV: 초당 rate, burst → 대기할 ms (0이면 토큰 획득)
+_ACQUIRE = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return blocked
+end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = tonumber(ARGV[1]) / 1000
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate) + 1000)
+return wait
+"""
+
+
+def bucket_key(supplier: str, endpoint: str) -> str:
+    return f"{KEY_PREFIX}:{supplier}:{endpoint}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After (초 또는 HTTP-date) → 대기 초 (CONNECTOR_RETRY_AFTER_MAX로 제한). 없거나 잘못된 값은 None."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        seconds = (at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), settings.CONNECTOR_RETRY_AFTER_MAX)
+
+
+class RateLimiter:
+    def __init__(self, client_factory: Callable[[], redis.Redis] = get_sync_redis):
+        self._client_factory = client_factory
+        self._script = None
+        self._down_until = 0.0
+        self.waits = 0  # 한도 때문에 대기한 횟수 (이 프로세스)
+
+    def _client(self) -> Optional[redis.Redis]:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return self._client_factory()
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None
+
+    def _failed(self, exc: Exception) -> None:
+        self._down_until = time.monotonic() + settings.CONNECTOR_RATE_LIMIT_RETRY_SECONDS
+        logger.warning("connector rate limiter unavailable, not limiting: %s", exc)
+
+    def acquire(self, bucket: str, rate: float, burst: int) -> float:
+        """토큰 1개 획득 시도. 0이면 획득, 양수면 그만큼(초) 기다린 뒤 다시 시도."""
+        client = self._client()
+        if client is None:
+            return 0.0
+        try:
+            if self._script is None or self._script.registered_client is not client:
+                self._script = client.register_script(_ACQUIRE)
+            wait_ms = int(self._script(keys=[bucket, f"{bucket}:blocked"], args=[rate, burst]))
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return 0.0
+        if wait_ms > 0:
+            self.waits += 1
+        return wait_ms / 1000
+
+    def block(self, bucket: str, seconds: float) -> bool:
+        """Retry-After: seconds 동안 이 버킷의 모든 acquire가 대기. 기록하지 못하면 False (호출자가 직접 대기)."""
+        client = self._client()
+        if client is None or seconds <= 0:
+            return False
+        try:
+            client.set(f"{bucket}:blocked", 1, px=max(1, math.ceil(seconds * 1000)))
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return False
+        return True
+
+
+rate_limiter = RateLimiter()
@@ -2,39 +2,35 @@ import hashlib
 import hmac
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 
 import httpx
 
-from .base import BaseConnector
-from .exceptions import (
-    ConnectorAPIError,
-    ConnectorAuthError,
-    ConnectorRateLimitError,
-    ConnectorResponseError,
-    ConnectorTimeoutError,
-)
+from .async_base import AsyncBaseConnector
+from .base import BaseConnector, ConnectorRequest, ProductPage
+from .exceptions import ConnectorAuthError, ConnectorResponseError
+from .protocol import ConnectorProtocol
 
 logger = logging.getLogger(__name__)
 
 
-class TemuConnector(BaseConnector):
-    """Temu connector based on supplier API requests."""
+class TemuProtocol(ConnectorProtocol):
+    """Temu API 요청 서명/파라미터/응답 파싱 (TemuConnector, AsyncTemuConnector 공통)."""
 
+    NAME = "Temu"
     BASE_URL = "https://openapi.temu.com"
     TIMEOUT_SECONDS = 15
     MAX_RETRIES = 3
-
-    def _is_test_mode(self, config: Optional[Dict[str, Any]]) -> bool:
-        cfg = config or self.config or {}
-        return bool(cfg.get("test_mode"))
+    MAX_PAGE_SIZE = 100
+    SUPPORTS_SINCE = True
 
     def _build_auth_headers(self, api_key: str, api_secret: str, path: str, payload: Dict[str, Any]) -> Dict[str, str]:
         if not api_key or not api_secret:
             raise ConnectorAuthError("Temu API key/secret is required")
 
         timestamp = str(int(time.time()))
-        body = httpx.QueryParams(payload).encode()
+        body = str(httpx.QueryParams(payload))
         signing_payload = f"{path}\n{timestamp}\n{body}".encode("utf-8")
         signature = hmac.new(api_secret.encode("utf-8"), signing_payload, hashlib.sha256).hexdigest()
         return {
@@ -44,47 +40,17 @@ class TemuConnector(BaseConnector):
             "Content-Type": "application/json",
         }
 
-    def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _build_request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> ConnectorRequest:
         params = params or {}
-        headers = self._build_auth_headers(api_key, api_secret, path, json_body or params)
-        url = f"{self.BASE_URL}{path}"
-
-        for attempt in range(1, self.MAX_RETRIES + 1):
-            try:
-                with httpx.Client(timeout=self.TIMEOUT_SECONDS) as client:
-                    response = client.request(method=method, url=url, params=params, json=json_body, headers=headers)
-                if response.status_code == 401:
-                    raise ConnectorAuthError("Temu authentication rejected")
-                if response.status_code == 429:
-                    logger.warning("Temu rate limited: path=%s attempt=%s", path, attempt)
-                    if attempt == self.MAX_RETRIES:
-                        raise ConnectorRateLimitError("Temu API rate limited")
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-                if response.status_code >= 500 and attempt < self.MAX_RETRIES:
-                    logger.warning("Temu upstream error: status=%s path=%s attempt=%s", response.status_code, path, attempt)
-                    time.sleep(min(2 ** attempt, 8))
-                    continue
-                response.raise_for_status()
-                data = response.json()
-                if not isinstance(data, dict):
-                    raise ConnectorResponseError("Temu API returned non-object JSON")
-                return data
-            except httpx.TimeoutException as exc:
-                logger.warning("Temu timeout: path=%s attempt=%s", path, attempt)
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorTimeoutError("Temu API timed out") from exc
-            except httpx.HTTPStatusError as exc:
-                retryable = exc.response.status_code >= 500
-                raise ConnectorAPIError(
-                    f"Temu API request failed: {exc.response.status_code}",
-                    status_code=exc.response.status_code,
-                    retryable=retryable,
-                ) from exc
-            except httpx.HTTPError as exc:
-                if attempt == self.MAX_RETRIES:
-                    raise ConnectorAPIError("Temu HTTP transport error", retryable=True) from exc
-        raise ConnectorAPIError("Temu request retries exhausted", retryable=True)
+        return ConnectorRequest(
+            method=method,
+            url=f"{self.BASE_URL}{path}",
+            label=f"path={path}",
+            endpoint="orders" if path.startswith("/v1/orders") else "catalog",
+            params=params,
+            json=json_body,
+            headers=self._build_auth_headers(api_key, api_secret, path, json_body or params),
+        )
 
     def _normalize_product(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         variants = [
@@ -106,21 +72,24 @@ class TemuConnector(BaseConnector):
             "images": raw.get("images", []),
         }
 
-    def fetch_products(self, api_key: str = None, api_secret: str = None, config: Dict = None, limit: int = 100, category: str = None) -> List[Dict]:
-        if self._is_test_mode(config):
-            return self._fetch_products_test_data(limit)
-
-        payload = {"limit": limit, "category": category} if category else {"limit": limit}
-        data = self._request("GET", "/v1/products", api_key=api_key, api_secret=api_secret, params=payload)
+    def _product_page_params(self, cursor: Optional[str], page_size: int, since: Optional[datetime], category: Optional[str]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"limit": page_size}
+        if category:
+            payload["category"] = category
+        if cursor:
+            payload["cursor"] = cursor
+        if since:
+            payload["updated_after"] = int(since.timestamp())
+        return payload
+
+    def _parse_product_page(self, data: Dict[str, Any]) -> ProductPage:
         products = data.get("products", [])
         if not isinstance(products, list):
             raise ConnectorResponseError("Temu products payload is invalid")
-        return [self._normalize_product(p) for p in products]
+        next_cursor = data.get("next_cursor") if data.get("has_more", True) else None
+        return ProductPage([self._normalize_product(p) for p in products], next_cursor or None)
 
-    def _fetch_products_test_data(self, limit: int) -> List[Dict]:
-        return [{"external_id": f"temu-test-{i}", "price": 10.0 + i, "stock": 100, "variants": []} for i in range(min(limit, 5))]
-
-    def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+    def _sample_product(self, external_id: str) -> Dict:
         return {
             "external_id": external_id,
             "title": f"Temu Product {external_id}",
@@ -131,29 +100,18 @@ class TemuConnector(BaseConnector):
             "description": "Product description",
         }
 
-    def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+    def _test_order(self, order_data: Dict) -> Optional[Dict]:
         if self._is_test_mode(order_data.get("config") if isinstance(order_data, dict) else None):
             return {"order_id": "TEMU-TEST-ORDER", "status": "placed"}
+        return None
 
-        data = self._request(
-            "POST",
-            "/v1/orders",
-            api_key=api_key,
-            api_secret=api_secret,
-            json_body=order_data,
-        )
+    def _parse_placed_order(self, data: Dict[str, Any]) -> Dict:
         order_id = data.get("order_id")
         if not order_id:
             raise ConnectorResponseError("Temu order response missing order_id")
         return {"order_id": str(order_id), "status": data.get("status", "placed"), "raw": data}
 
-    def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
-        data = self._request(
-            "GET",
-            f"/v1/orders/{order_id}",
-            api_key=api_key,
-            api_secret=api_secret,
-        )
+    def _parse_order_status(self, order_id: str, data: Dict[str, Any]) -> Dict:
         status = data.get("status")
         if not status:
             raise ConnectorResponseError("Temu order status response missing status")
@@ -165,9 +123,7 @@ class TemuConnector(BaseConnector):
             "raw": data,
         }
 
-    def get_tracking_info(self, tracking_number: str, courier: str = None) -> Dict:
-        from datetime import datetime, timedelta
-
+    def _sample_tracking_info(self) -> Dict:
         now = datetime.utcnow()
 
         return {
@@ -187,3 +143,97 @@ class TemuConnector(BaseConnector):
                 },
             ],
         }
+
+
+class TemuConnector(TemuProtocol, BaseConnector):
+    """Temu connector based on supplier API requests."""
+
+    def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        request = self._build_request(method, path, api_key=api_key, api_secret=api_secret, params=params, json_body=json_body)
+        return self._execute(lambda: request)
+
+    def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        category: str = None,
+    ) -> ProductPage:
+        if self._is_test_mode(config):
+            return self._test_product_page("temu-test", 10.0, 100, config, cursor, page_size)
+
+        params = self._product_page_params(cursor, page_size, since, category)
+        return self._parse_product_page(
+            self._request("GET", "/v1/products", api_key=api_key, api_secret=api_secret, params=params)
+        )
+
+    def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+        return self._sample_product(external_id)
+
+    def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
+
+        data = self._request(
+            "POST",
+            "/v1/orders",
+            api_key=api_key,
+            api_secret=api_secret,
+            json_body=order_data,
+        )
+        return self._parse_placed_order(data)
+
+    def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
+        data = self._request(
+            "GET",
+            f"/v1/orders/{order_id}",
+            api_key=api_key,
+            api_secret=api_secret,
+        )
+        return self._parse_order_status(order_id, data)
+
+
+class AsyncTemuConnector(TemuProtocol, AsyncBaseConnector):
+    """TemuConnector의 비동기 버전."""
+
+    async def _request(self, method: str, path: str, *, api_key: str, api_secret: str, params: Optional[Dict[str, Any]] = None, json_body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        request = self._build_request(method, path, api_key=api_key, api_secret=api_secret, params=params, json_body=json_body)
+        return await self._execute(lambda: request)
+
+    async def fetch_product_page(
+        self,
+        api_key: str = None,
+        api_secret: str = None,
+        config: Dict = None,
+        *,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        category: str = None,
+    ) -> ProductPage:
+        if self._is_test_mode(config):
+            return self._test_product_page("temu-test", 10.0, 100, config, cursor, page_size)
+
+        params = self._product_page_params(cursor, page_size, since, category)
+        return self._parse_product_page(
+            await self._request("GET", "/v1/products", api_key=api_key, api_secret=api_secret, params=params)
+        )
+
+    async def get_product(self, api_key: str, api_secret: str, external_id: str) -> Optional[Dict]:
+        return self._sample_product(external_id)
+
+    async def place_order(self, api_key: str, api_secret: str, order_data: Dict) -> Dict:
+        test_order = self._test_order(order_data)
+        if test_order:
+            return test_order
+        data = await self._request("POST", "/v1/orders", api_key=api_key, api_secret=api_secret, json_body=order_data)
+        return self._parse_placed_order(data)
+
+    async def get_order_status(self, api_key: str, api_secret: str, order_id: str) -> Dict:
+        data = await self._request("GET", f"/v1/orders/{order_id}", api_key=api_key, api_secret=api_secret)
+        return self._parse_order_status(order_id, data)
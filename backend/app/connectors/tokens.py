@@ -0,0 +1,136 @@
+"""
+커넥터 OAuth 액세스 토큰 공유 캐시 (Redis)
+- 키: connector-token:{커넥터}:{sha1(client_id|refresh_token) 앞 16자} → JSON {token, expires_at}, TTL = 만료까지
+- 만료 CONNECTOR_TOKEN_REFRESH_MARGIN초 전부터 만료로 보고 갱신
+- single-flight: 토큰 엔드포인트는 락(SET NX PX) 보유자 하나만 호출, 나머지는 캐시에 토큰이 생길 때까지 대기
+  (CONNECTOR_TOKEN_LOCK_SECONDS 내에 안 생기면 직접 갱신)
+- 프로세스 로컬 캐시를 앞에 두어 요청마다 Redis 왕복하지 않음
+- Redis 장애 시 로컬 캐시 + 직접 갱신 (공급처 호출은 계속)
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+import redis
+
+from app.core.config import settings
+from app.core.redis_client import get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "connector-token"
+LOCK_POLL_SECONDS = 0.05
+
+# 락 값이 내 것일 때만 삭제 (만료 후 다른 워커가 잡은 락을 지우지 않도록)
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# refresh(): (access_token, expires_in 초)
+Refresher = Callable[[], Tuple[str, int]]
+
+
+def token_key(connector: str, *credentials: Optional[str]) -> str:
+    digest = hashlib.sha1("|".join(c or "" for c in credentials).encode("utf-8")).hexdigest()[:16]
+    return f"{KEY_PREFIX}:{connector}:{digest}"
+
+
+class TokenCache:
+    def __init__(self, client_factory: Callable[[], redis.Redis] = get_sync_redis):
+        self._client_factory = client_factory
+        self._local: Dict[str, Tuple[str, float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.refreshes = 0  # 이 프로세스에서 토큰 엔드포인트를 호출한 횟수
+
+    def get(self, key: str, refresh: Refresher) -> str:
+        token = self._fresh_local(key)
+        if token:
+            return token
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:  # 같은 프로세스 내 스레드도 single-flight
+            token = self._fresh_local(key)
+            if token:
+                return token
+            try:
+                token, expires_at = self._get_shared(key, refresh)
+            except (redis.RedisError, OSError) as e:
+                logger.warning("token cache unavailable, refreshing locally: %s", e)
+                token, expires_at = self._refresh(refresh)
+            self._local[key] = (token, expires_at)
+            return token
+
+    def invalidate(self, key: str) -> None:
+        """거부된 토큰 제거 (401). 다음 get()에서 갱신."""
+        self._local.pop(key, None)
+        try:
+            self._client_factory().delete(key)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("token cache invalidate failed: %s", e)
+
+    def _fresh_local(self, key: str) -> Optional[str]:
+        cached = self._local.get(key)
+        if cached and time.time() < cached[1] - settings.CONNECTOR_TOKEN_REFRESH_MARGIN:
+            return cached[0]
+        return None
+
+    def _read(self, client: redis.Redis, key: str) -> Optional[Tuple[str, float]]:
+        raw = client.get(key)
+        if not raw:
+            return None
+        entry = json.loads(raw)
+        if time.time() >= entry["expires_at"] - settings.CONNECTOR_TOKEN_REFRESH_MARGIN:
+            return None
+        return entry["token"], entry["expires_at"]
+
+    def _refresh(self, refresh: Refresher) -> Tuple[str, float]:
+        self.refreshes += 1
+        token, expires_in = refresh()
+        return token, time.time() + expires_in
+
+    def _get_shared(self, key: str, refresh: Refresher) -> Tuple[str, float]:
+        client = self._client_factory()
+        entry = self._read(client, key)
+        if entry:
+            return entry
+        lock_key, lock_id = f"{key}:lock", uuid.uuid4().hex
+        lock_ms = int(settings.CONNECTOR_TOKEN_LOCK_SECONDS * 1000)
+        deadline = time.monotonic() + settings.CONNECTOR_TOKEN_LOCK_SECONDS
+        while time.monotonic() < deadline:
+            if client.set(lock_key, lock_id, nx=True, px=lock_ms):
+                try:
+                    entry = self._read(client, key)  # 락 대기 중 다른 워커가 갱신했을 수 있음
+                    if entry:
+                        return entry
+                    token, expires_at = self._refresh(refresh)
+                    ttl = int(expires_at - time.time())
+                    if ttl > 0:
+                        _quietly(client.set, key, json.dumps({"token": token, "expires_at": expires_at}), ex=ttl)
+                    return token, expires_at
+                finally:
+                    _quietly(client.eval, _RELEASE_LOCK, 1, lock_key, lock_id)
+            time.sleep(LOCK_POLL_SECONDS)
+            entry = self._read(client, key)
+            if entry:
+                return entry
+        logger.warning("token refresh lock wait timed out: %s", key)
+        return self._refresh(refresh)
+
+
+def _quietly(command, *args, **kwargs) -> None:
+    """갱신한 토큰을 버리지 않도록 저장/락 해제 실패는 로그만 (TTL로 정리)."""
+    try:
+        command(*args, **kwargs)
+    except (redis.RedisError, OSError) as e:
+        logger.warning("token cache write failed: %s", e)
+
+
+token_cache = TokenCache()
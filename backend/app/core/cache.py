@@ -0,0 +1,282 @@
+"""
+상품 API 응답 캐시 (Redis)
+- 키: resp:{namespace}:{정규화된 파라미터 JSON의 sha1} → 직렬화된 JSON 본문
+- 태그: tag:{태그} SET에 응답 키를 등록 → 태그 단위 무효화 (SMEMBERS 후 응답 DEL + 읽은 멤버만 SREM)
+  SET 자체를 지우지 않으므로 무효화 도중 등록된 키도 다음 무효화 대상으로 남음
+- 세대: gen:{태그} 카운터. 무효화 시 INCR, 저장은 build() 전에 읽은 세대가 그대로일 때만 (Lua, 원자적)
+  → build()가 DB를 읽은 뒤 sync가 커밋/무효화하면 그 이전 본문은 저장하지 않음
+  - product:{id} 상세, category:{이름} 카테고리 지정 목록, product-list 그 외 목록, categories, facets
+  - sync_supplier_products가 변경한 상품/카테고리 태그를 무효화 (invalidate_tags_sync)
+- Redis 장애 시 캐시 없이 동작하고 RESPONSE_CACHE_RETRY_SECONDS 동안 재접속하지 않음
+- hit/miss/bytes 카운터는 프로세스 단위 (/metrics)
+"""
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "resp"
+TAG_PREFIX = "tag"
+GEN_PREFIX = "gen"
+_GEN_TTL = 86400  # build() 시간보다 충분히 길게 (만료로 예전 세대 값이 되돌아오지 않도록)
+
+# KEYS: 응답 키, 세대 키 n개, 태그 키 n개 / ARGV: ttl, n, 본문, build 전 세대 n개 → 1이면 저장
+_STORE_IF_CURRENT = """
+local n = tonumber(ARGV[2])
+for i = 1, n do
+    if (redis.call('GET', KEYS[1 + i]) or '0') ~= ARGV[3 + i] then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[1])
+for i = 1, n do
+    redis.call('SADD', KEYS[1 + n + i], KEYS[1])
+    redis.call('EXPIRE', KEYS[1 + n + i], tonumber(ARGV[1]) * 2)
+end
+return 1
+"""
+
+PRODUCT_LIST_TAG = "product-list"
+CATEGORIES_TAG = "categories"
+FACETS_TAG = "facets"
+
+
+def product_tag(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def category_tag(category: str) -> str:
+    return f"category:{category}"
+
+
+def catalog_change_tags(product_ids: Iterable[int], categories: Iterable[Optional[str]]) -> List[str]:
+    """상품 변경 시 무효화할 태그: 상품 상세, 해당 카테고리 목록, 전체 목록/카테고리/facet."""
+    tags = [product_tag(pid) for pid in product_ids]
+    tags += [category_tag(c) for c in categories if c]
+    return tags + [PRODUCT_LIST_TAG, CATEGORIES_TAG, FACETS_TAG]
+
+
+def cache_key(namespace: str, params: Dict[str, Any]) -> str:
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    return f"{KEY_PREFIX}:{namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def _gen_key(tag: str) -> str:
+    return f"{GEN_PREFIX}:{tag}"
+
+
+def _generation(value: Any) -> str:
+    if value is None:
+        return "0"
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _queue_invalidation(pipe, tags: List[str]) -> None:
+    """세대 INCR + 태그 SMEMBERS (결과: [세대, 만료, ...] 뒤에 태그별 멤버)"""
+    for tag in tags:
+        pipe.incr(_gen_key(tag))
+        pipe.expire(_gen_key(tag), _GEN_TTL)
+    for tag in tags:
+        pipe.smembers(_tag_key(tag))
+
+
+def _queue_removal(pipe, tags: List[str], members: List[set]) -> int:
+    """응답 키 DEL + 태그 SET에서 읽은 멤버만 SREM. 삭제한 응답 수 반환."""
+    keys = set().union(*members)
+    if keys:
+        pipe.delete(*keys)
+    for tag, tag_members in zip(tags, members):
+        if tag_members:
+            pipe.srem(_tag_key(tag), *tag_members)
+    return len(keys)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bytes_served = 0
+        self.bytes_stored = 0
+        self.stale_skipped = 0  # build() 중 무효화돼 저장하지 않은 응답
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "bytes_served": self.bytes_served,
+            "bytes_stored": self.bytes_stored,
+            "stale_skipped": self.stale_skipped,
+        }
+
+
+class ResponseCache:
+    """API 프로세스용 (redis.asyncio). 클라이언트는 첫 사용 시 생성."""
+
+    def __init__(self):
+        self.client: Optional[aioredis.Redis] = None
+        self.stats = CacheStats()
+        self._store_script = None
+        self._down_until = 0.0
+
+    def _client(self) -> Optional[aioredis.Redis]:
+        if not settings.RESPONSE_CACHE_ENABLED or time.monotonic() < self._down_until:
+            return None
+        if self.client is None:
+            self.client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.RESPONSE_CACHE_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.RESPONSE_CACHE_SOCKET_TIMEOUT,
+            )
+        return self.client
+
+    def _failed(self, exc: Exception) -> None:
+        self.stats.errors += 1
+        self._down_until = time.monotonic() + settings.RESPONSE_CACHE_RETRY_SECONDS
+        logger.warning("response cache unavailable for %ss: %s", settings.RESPONSE_CACHE_RETRY_SECONDS, exc)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            body = await client.get(key)
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None
+        if body is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self.stats.bytes_served += len(body)
+        return body
+
+    async def _lookup(self, key: str, tags: List[str]) -> Tuple[Optional[bytes], Optional[List[str]]]:
+        """응답 본문과 태그 세대를 한 번에 조회. Redis를 쓸 수 없으면 (None, None) → 저장도 생략."""
+        client = self._client()
+        if client is None:
+            return None, None
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(key)
+            for tag in tags:
+                pipe.get(_gen_key(tag))
+            body, *generations = await pipe.execute()
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None, None
+        if body is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self.stats.bytes_served += len(body)
+        return body, [_generation(g) for g in generations]
+
+    async def _store(self, key: str, body: bytes, tags: List[str], generations: List[str], ttl: int) -> bool:
+        """build() 전에 읽은 세대가 그대로일 때만 저장 (그 사이 무효화됐으면 False)"""
+        client = self._client()
+        if client is None:
+            return False
+        try:
+            if self._store_script is None or self._store_script.registered_client is not client:
+                self._store_script = client.register_script(_STORE_IF_CURRENT)
+            stored = await self._store_script(
+                keys=[key, *[_gen_key(t) for t in tags], *[_tag_key(t) for t in tags]],
+                args=[ttl, len(tags), body, *generations],
+            )
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return False
+        if stored:
+            self.stats.bytes_stored += len(body)
+        else:
+            self.stats.stale_skipped += 1
+        return bool(stored)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        client = self._client()
+        tags = list(tags)
+        if client is None or not tags:
+            return
+        try:
+            pipe = client.pipeline(transaction=True)
+            _queue_invalidation(pipe, tags)
+            members = (await pipe.execute())[2 * len(tags):]
+            pipe = client.pipeline(transaction=False)
+            if _queue_removal(pipe, tags, members):
+                await pipe.execute()
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+
+    async def respond(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        tags: Iterable[str],
+        build: Callable[[], Awaitable[Any]],
+        response_type: Any,
+        ttl: Optional[int] = None,
+    ) -> Response:
+        """캐시된 JSON 본문을 그대로 반환, 없으면 build() 결과를 response_type으로 직렬화해 저장 후 반환."""
+        key = cache_key(namespace, params)
+        tags = list(tags)
+        body, generations = await self._lookup(key, tags)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+        adapter = _adapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(await build()))
+        if generations is not None:
+            await self._store(key, body, tags, generations, ttl or settings.RESPONSE_CACHE_TTL)
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_tags_sync(tags: Iterable[str]) -> int:
+    """Celery 태스크(동기)용 태그 무효화. Redis 장애는 로그만 남기고 무시 (TTL로 만료). 삭제한 응답 수 반환."""
+    tags = list(tags)
+    if not settings.RESPONSE_CACHE_ENABLED or not tags:
+        return 0
+    client = redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.RESPONSE_CACHE_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.RESPONSE_CACHE_SOCKET_TIMEOUT,
+    )
+    deleted = 0
+    try:
+        pipe = client.pipeline(transaction=True)
+        _queue_invalidation(pipe, tags)
+        members = pipe.execute()[2 * len(tags):]
+        pipe = client.pipeline(transaction=False)
+        deleted = _queue_removal(pipe, tags, members)
+        if deleted:
+            pipe.execute()
+    except (redis.RedisError, OSError) as e:
+        logger.warning("response cache invalidation failed: %s", e)
+    finally:
+        client.close()
+    return deleted
@@ -4,18 +4,16 @@ Authentication & Authorization Dependencies
 """
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import Optional, List, Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional, List, Callable
 from functools import wraps
-import time
 import hashlib
-from collections import defaultdict
-import asyncio
 
 from app.db.session import get_db
 from app.db.models import User, UserRole
 from app.core.security import verify_token
 from app.core.config import settings
+from app.core.rate_limit import rate_limit_key, rate_limiter
 
 # HTTP Bearer 스키마
 security = HTTPBearer(auto_error=False)
@@ -42,57 +40,18 @@ class PermissionDeniedError(HTTPException):
 
 class RateLimitExceededError(HTTPException):
     """Rate Limit 초과"""
-    def __init__(self, detail: str = "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요."):
+    def __init__(
+        self,
+        detail: str = "요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+        headers: Optional[Dict[str, str]] = None,
+    ):
         super().__init__(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=detail
+            detail=detail,
+            headers=headers
         )
 
 
-# Rate Limiting 저장소 (실제 운영에서는 Redis 사용 권장)
-class RateLimiter:
-    """
-    IP 및 사용자 기반 Rate Limiting
-    """
-    def __init__(self):
-        self.requests: dict = defaultdict(list)
-        self._lock = asyncio.Lock()
-    
-    async def is_allowed(
-        self,
-        key: str,
-        max_requests: int = 100,
-        window_seconds: int = 60
-    ) -> bool:
-        """요청 허용 여부 확인"""
-        async with self._lock:
-            now = time.time()
-            # 오래된 요청 제거
-            self.requests[key] = [
-                req_time for req_time in self.requests[key]
-                if now - req_time < window_seconds
-            ]
-            
-            if len(self.requests[key]) >= max_requests:
-                return False
-            
-            self.requests[key].append(now)
-            return True
-    
-    async def get_remaining(self, key: str, max_requests: int = 100, window_seconds: int = 60) -> int:
-        """남은 요청 수"""
-        now = time.time()
-        valid_requests = [
-            req_time for req_time in self.requests.get(key, [])
-            if now - req_time < window_seconds
-        ]
-        return max(0, max_requests - len(valid_requests))
-
-
-# 전역 Rate Limiter 인스턴스
-rate_limiter = RateLimiter()
-
-
 def get_client_ip(request: Request) -> str:
     """클라이언트 IP 추출"""
     forwarded = request.headers.get("X-Forwarded-For")
@@ -101,9 +60,22 @@ def get_client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
+def _token_user_id(request: Request) -> Optional[str]:
+    """Bearer 토큰의 사용자 id (서명/만료만 확인, DB 조회 없음)"""
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    return str(payload["sub"]) if payload and payload.get("sub") else None
+
+
 class RateLimitDep:
     """
-    Rate Limiting 의존성
+    Rate Limiting 의존성 (Redis 공유, app.core.rate_limit)
+    - 라우트별: scope 기본값은 "메서드 라우트 경로" (같은 RateLimitDep을 여러 라우트에 써도 라우트마다 따로 셈)
+    - 사용자별: 인증된 요청은 사용자 id, 그 외는 IP 기준. user_max_requests로 인증 사용자 한도 별도 지정
+    - 결과는 request.state.rate_limit → RateLimitHeadersMiddleware가 RateLimit-* 헤더 추가
     
     사용법:
         @router.get("/api/resource")
@@ -112,23 +84,43 @@ class RateLimitDep:
         ):
             ...
     """
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        user_max_requests: Optional[int] = None,
+        scope: Optional[str] = None,
+    ):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.user_max_requests = user_max_requests or max_requests
+        self.scope = scope
     
     async def __call__(self, request: Request):
-        client_ip = get_client_ip(request)
-        key = f"rate_limit:{client_ip}"
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        
+        scope = self.scope
+        if scope is None:
+            route = request.scope.get("route")
+            scope = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        user_id = _token_user_id(request)
+        if user_id is not None:
+            identity, limit = f"user:{user_id}", self.user_max_requests
+        else:
+            identity, limit = f"ip:{get_client_ip(request)}", self.max_requests
         
-        if not await rate_limiter.is_allowed(key, self.max_requests, self.window_seconds):
-            raise RateLimitExceededError()
+        result = await rate_limiter.hit(rate_limit_key(scope, identity), limit, self.window_seconds)
+        request.state.rate_limit = result
+        if not result.allowed:
+            raise RateLimitExceededError(headers=result.headers())
         
         return None
 
 
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     현재 인증된 사용자를 가져옴
@@ -154,7 +146,7 @@ async def get_current_user(
     except ValueError:
         raise AuthenticationError("잘못된 토큰 형식입니다")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     
     if not user:
         raise AuthenticationError("사용자를 찾을 수 없습니다")
@@ -167,7 +159,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     인증된 사용자를 가져오되, 없으면 None 반환 (선택적 인증)
@@ -270,9 +262,9 @@ class ResourceOwnerChecker:
         async def get_order(
             order_id: int,
             user: User = Depends(get_current_user),
-            db: Session = Depends(get_db)
+            db: AsyncSession = Depends(get_db)
         ):
-            order = db.query(Order).filter(Order.id == order_id).first()
+            order = await db.get(Order, order_id)
             ResourceOwnerChecker.check(order, user)
             return order
     """
@@ -314,7 +306,7 @@ def is_token_blacklisted(token: str) -> bool:
 
 async def get_current_user_with_blacklist_check(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     블랙리스트 체크가 포함된 사용자 인증
@@ -0,0 +1,72 @@
+"""
+HTTP 조건부 요청 (ETag / Last-Modified)
+- ETag: 응답을 결정하는 값(id, updated_at 등)의 sha1 — 본문 직렬화 없이 가벼운 조회로 계산
+- If-None-Match 일치(또는 If-None-Match가 없고 If-Modified-Since 이후 변경 없음) → 304, 본문 없음
+- 목록(컬렉션) 응답은 last_modified=None → ETag만 사용. 항목이 빠지는 변경은 남은 항목의 최신 시각을 바꾸지 않아
+  If-Modified-Since로는 감지할 수 없음
+- nginx gzip은 강한 ETag를 W/로 바꾸므로 If-None-Match는 약한 비교 (RFC 9110 13.1.2)
+- Cache-Control: public, max-age + stale-while-revalidate (nginx proxy_cache / 브라우저 / Next.js SSR fetch)
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    raw = "|".join("" if p is None else (p.isoformat() if isinstance(p, datetime) else str(p)) for p in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def latest(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    """Last-Modified 후보 중 최신값 (timezone 없는 값은 UTC로 간주)."""
+    aware = [v if v.tzinfo else v.replace(tzinfo=timezone.utc) for v in values if v is not None]
+    return max(aware) if aware else None
+
+
+def cache_control() -> str:
+    return (
+        f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+    )
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [t.strip() for t in if_none_match.split(",")]
+        return "*" in candidates or _strip_weak(etag) in {_strip_weak(t) for t in candidates}
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control()}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
+
+
+def with_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    response.headers.update(validator_headers(etag, last_modified))
+    return response
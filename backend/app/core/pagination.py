@@ -0,0 +1,85 @@
+"""
+Keyset(cursor) 페이지네이션
+- OFFSET 대신 마지막 행의 정렬 키 (예: created_at, id) 다음부터 조회 → 깊은 페이지도 비용 일정
+- cursor는 정렬 이름 + 키 값을 base64url(JSON)로 감싼 불투명 문자열
+- 정렬 키는 모두 같은 방향이어야 함 (행 값 비교 (a, b) < (x, y) 사용 → 복합 인덱스 활용)
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+
+class KeysetOrder:
+    """정렬 정의: 이름, 키 컬럼(마지막은 유일 키), 방향."""
+
+    def __init__(self, name: str, columns: Sequence, descending: bool):
+        self.name = name
+        self.columns = tuple(columns)
+        self.descending = descending
+
+    def order_by(self) -> List:
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def values_of(self, row: Any) -> List[Any]:
+        return [getattr(row, c.key) for c in self.columns]
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
+
+
+def encode_cursor(order: KeysetOrder, row: Any) -> str:
+    payload = {"o": order.name, "k": [_dump(v) for v in order.values_of(row)]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(order: KeysetOrder, cursor: str) -> List[Any]:
+    """cursor → 정렬 키 값. 형식이 틀리거나 다른 정렬의 cursor면 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload.get("o") != order.name or len(payload.get("k", [])) != len(order.columns):
+            raise ValueError("cursor order mismatch")
+        return [_load(c, v) for c, v in zip(order.columns, payload["k"])]
+    except (ValueError, TypeError, AttributeError, binascii.Error, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 cursor입니다.")
+
+
+def apply_keyset(query: Select, order: KeysetOrder, cursor: Optional[str], limit: int) -> Select:
+    """정렬 + (cursor가 있으면) 키 이후 조건 + limit+1 (다음 페이지 존재 확인용)."""
+    if cursor:
+        values = decode_cursor(order, cursor)
+        keys = tuple_(*order.columns)
+        query = query.where(keys < tuple_(*values) if order.descending else keys > tuple_(*values))
+    return query.order_by(*order.order_by()).limit(limit + 1)
+
+
+def split_page(order: KeysetOrder, rows: Sequence, limit: int) -> Tuple[List, Optional[str]]:
+    """limit+1 조회 결과 → (페이지 행, next_cursor). 마지막 페이지면 next_cursor=None."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(order, page[-1])
@@ -0,0 +1,180 @@
+"""
+API 요청 제한 (Redis GCRA, 워커/노드 공유)
+- 키: rate-limit:{범위(기본: 메서드 + 라우트 경로)}:{user:id | ip:주소} → TAT(이론적 도착 시각, ms) 하나
+  Lua 스크립트 하나로 판정 + 갱신 (원자적, Redis TIME 기준, 키는 TAT까지만 유지) → 요청당 O(1), 메모리는 활성 키 수만큼
+- window_seconds 동안 max_requests (연속 요청은 max_requests까지 허용, 이후 window/max_requests 간격으로 회복)
+- 응답 헤더: RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset(초), RateLimit-Policy, 429는 Retry-After
+- Redis 장애 시 프로세스 로컬 GCRA로 제한 (워커별로 적용되므로 전체 한도는 워커 수만큼 느슨해짐)
+  RATE_LIMIT_RETRY_SECONDS 동안 재접속하지 않음
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate-limit"
+
+# KEYS: 키 / ARGV: 요청 간격 ms, max_requests → {허용 1|0, 남은 요청 수, reset ms, retry_after ms}
+_GCRA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local window = emission * tonumber(ARGV[2])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1])) or now, now)
+local new_tat = tat + emission
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / emission), math.ceil(new_tat - now), 0}
+"""
+
+
+def rate_limit_key(scope: str, identity: str) -> str:
+    return f"{KEY_PREFIX}:{scope}:{identity}"
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    window: int
+    remaining: int
+    reset: float  # 한도가 모두 회복될 때까지 초
+    retry_after: float = 0.0  # 거부 시 다시 시도할 수 있는 초
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset)),
+            "RateLimit-Policy": f"{self.limit};w={self.window}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimitStats:
+    def __init__(self):
+        self.allowed = 0
+        self.limited = 0
+        self.local = 0  # Redis 장애로 로컬 판정한 요청
+
+    def as_dict(self) -> dict:
+        return {"allowed": self.allowed, "limited": self.limited, "local": self.local}
+
+
+class LocalRateLimiter:
+    """Redis 장애 시 대체 (프로세스 로컬 GCRA). 최근 사용 키 max_keys개만 유지."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    def hit(self, key: str, limit: int, window: int) -> Tuple[bool, int, float, float]:
+        now = time.monotonic() * 1000
+        emission = window * 1000 / limit
+        tat = max(self._tat.get(key, now), now)
+        new_tat = tat + emission
+        allow_at = new_tat - emission * limit
+        if now < allow_at:
+            self._tat.move_to_end(key)  # 거부된 키도 최근 사용으로 유지 (반복 요청 중 제거되면 한도 초기화)
+            return False, 0, tat - now, allow_at - now
+        self._tat[key] = new_tat
+        self._tat.move_to_end(key)
+        while len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+        return True, int((emission * limit - (new_tat - now)) // emission), new_tat - now, 0.0
+
+
+class RateLimiter:
+    """API 프로세스용 (redis.asyncio). 클라이언트는 첫 사용 시 생성."""
+
+    def __init__(self):
+        self.client: Optional[aioredis.Redis] = None
+        self.stats = RateLimitStats()
+        self.local = LocalRateLimiter(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+        self._script = None
+        self._down_until = 0.0
+
+    def _client(self) -> Optional[aioredis.Redis]:
+        if time.monotonic() < self._down_until:
+            return None
+        if self.client is None:
+            self.client = aioredis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.RATE_LIMIT_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.RATE_LIMIT_SOCKET_TIMEOUT,
+            )
+        return self.client
+
+    def _failed(self, exc: Exception) -> None:
+        self._down_until = time.monotonic() + settings.RATE_LIMIT_RETRY_SECONDS
+        logger.warning("rate limiter redis unavailable for %ss, limiting locally: %s", settings.RATE_LIMIT_RETRY_SECONDS, exc)
+
+    async def _redis_hit(self, key: str, limit: int, window: int) -> Optional[List[int]]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            if self._script is None or self._script.registered_client is not client:
+                self._script = client.register_script(_GCRA)
+            return [int(v) for v in await self._script(keys=[key], args=[window * 1000 / limit, limit])]
+        except (redis.RedisError, OSError) as e:
+            self._failed(e)
+            return None
+
+    async def hit(self, key: str, limit: int, window: int) -> RateLimitResult:
+        """요청 1건 기록 후 허용 여부와 남은 한도 (window 초 동안 limit건)"""
+        reply = await self._redis_hit(key, limit, window)
+        if reply is None:
+            self.stats.local += 1
+            allowed, remaining, reset_ms, retry_ms = self.local.hit(key, limit, window)
+        else:
+            allowed, remaining, reset_ms, retry_ms = bool(reply[0]), reply[1], reply[2], reply[3]
+        if allowed:
+            self.stats.allowed += 1
+        else:
+            self.stats.limited += 1
+        return RateLimitResult(allowed, limit, window, max(0, remaining), reset_ms / 1000, retry_ms / 1000)
+
+
+rate_limiter = RateLimiter()
+
+
+class RateLimitHeadersMiddleware:
+    """의존성(RateLimitDep)이 request.state에 남긴 결과를 RateLimit-* 응답 헤더로 추가 (엔드포인트가 Response를 직접 반환해도 적용)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                result = scope.get("state", {}).get("rate_limit")
+                if result is not None:
+                    names = {name.lower() for name, _ in message.get("headers", [])}
+                    extra = [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in result.headers().items()
+                        if name.lower().encode("latin-1") not in names
+                    ]
+                    message["headers"] = list(message.get("headers", [])) + extra
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
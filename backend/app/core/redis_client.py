@@ -0,0 +1,29 @@
+"""
+워커(동기) 코드용 공유 Redis 클라이언트
+- 커넥터 토큰 캐시 등 Celery 태스크에서 쓰는 공유 상태 (프로세스당 1개, fork 후 재생성)
+- 짧은 소켓 타임아웃: 호출자가 redis.RedisError/OSError를 잡아 로컬 동작으로 대체해야 함
+"""
+import os
+import threading
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_sync_redis() -> redis.Redis:
+    global _client, _pid
+    with _lock:
+        if _client is None or _pid != os.getpid():
+            _client = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.CONNECTOR_REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.CONNECTOR_REDIS_SOCKET_TIMEOUT,
+            )
+            _pid = os.getpid()
+        return _client
@@ -0,0 +1,15 @@
+"""
+방언별 INSERT (ON CONFLICT 지원)
+- 운영은 PostgreSQL, 테스트는 SQLite: 둘 다 insert(...).on_conflict_do_nothing / on_conflict_do_update 제공
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session):
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"upsert not supported for dialect {name}")
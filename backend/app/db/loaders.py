@@ -0,0 +1,23 @@
+"""
+관계 로딩 전략
+- ProductOut은 images/variants를 직렬화하므로 목록·상세 조회에서 selectinload로 일괄 로드
+  (페이지 1 + images 1 + variants 1 = 상품 수와 무관하게 고정 라운드트립)
+- AsyncSession은 lazy load가 불가하므로 응답에 필요한 관계는 여기 옵션을 붙여 조회
+"""
+from sqlalchemy.orm import selectinload
+
+from app.db.models import Cart, CartItem, Order, Product
+
+# ProductOut 직렬화용
+PRODUCT_OUT_OPTIONS = (
+    selectinload(Product.images),
+    selectinload(Product.variants),
+)
+
+# 장바구니 응답(calculate_cart_totals)용: 아이템 → 상품 → 이미지
+CART_OUT_OPTIONS = (
+    selectinload(Cart.items).selectinload(CartItem.product).selectinload(Product.images),
+)
+
+# OrderOut(items_count)/OrderDetailOut(items)용
+ORDER_OUT_OPTIONS = (selectinload(Order.items),)
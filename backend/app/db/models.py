@@ -9,7 +9,7 @@ from typing import Optional, List, Any
 
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Numeric, DateTime, ForeignKey,
-    UniqueConstraint, Index, JSON, Enum as SQLEnum,
+    UniqueConstraint, Index, JSON, Enum as SQLEnum, Computed, text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -104,6 +104,9 @@ class User(Base):
     carts = relationship("Cart", back_populates="user", cascade="all, delete-orphan")
     orders = relationship("Order", back_populates="user")
 
+    # 관리자 회원 목록 keyset 정렬용 (003)
+    __table_args__ = (Index("ix_users_created_id", "created_at", "id"),)
+
 
 # --- Addresses ---
 class Address(Base):
@@ -149,15 +152,38 @@ class Product(Base):
     external_url = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True, index=True)
     synced_at = Column(DateTime(timezone=True), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # 동기화 컬럼 해시 (006, app.services.product_upsert)
+    removed_at = Column(DateTime(timezone=True), nullable=True)  # 전체 동기화에서 공급처 카탈로그에 없어 비활성화된 시각 (007)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # 검색용 (004): 이름/한글명/브랜드/카테고리를 소문자로 합친 생성 컬럼. INSERT/UPDATE 시 DB가 갱신
+    search_text = Column(
+        Text,
+        Computed(
+            "lower(coalesce(name, '') || ' ' || coalesce(name_ko, '') || ' ' "
+            "|| coalesce(brand, '') || ' ' || coalesce(category, ''))",
+            persisted=True,
+        ),
+    )
 
     supplier = relationship("Supplier", back_populates="products")
     images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan", order_by="ProductImage.sort_order")
     cart_items = relationship("CartItem", back_populates="product")
     order_items = relationship("OrderItem", back_populates="product")
 
-    __table_args__ = (UniqueConstraint("supplier_id", "external_id", name="uq_supplier_external_id"),)
+    __table_args__ = (
+        UniqueConstraint("supplier_id", "external_id", name="uq_supplier_external_id"),
+        # 목록 keyset 정렬용, 활성 상품만 (003)
+        Index("ix_products_active_created_id", "created_at", "id", postgresql_where=text("is_active")),
+        Index("ix_products_active_price_id", "selling_price", "id", postgresql_where=text("is_active")),
+        # 부분 문자열/유사도 검색 (pg_trgm, 004)
+        Index(
+            "ix_products_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
     Index("ix_products_external_id", "external_id")
 
     @property
@@ -219,7 +245,32 @@ class ProductVariant(Base):
     product = relationship("Product", back_populates="variants")
 
 
-Product.variants = relationship("ProductVariant", back_populates="product", cascade="all, delete-orphan", lazy="dynamic")
+# AsyncSession은 lazy="dynamic"을 지원하지 않으므로 일반 관계로 두고 조회 시 selectinload 사용
+Product.variants = relationship("ProductVariant", back_populates="product", cascade="all, delete-orphan")
+
+
+# --- Product facet counts (005) ---
+class ProductFacetCount(Base):
+    """활성 상품 수 집계 (카테고리 × 브랜드 × 가격 구간). app.services.facets가 카테고리 단위로 갱신."""
+    __tablename__ = "product_facet_counts"
+
+    category = Column(String(100), primary_key=True)  # 미지정은 ''
+    brand = Column(String(100), primary_key=True)  # 미지정은 ''
+    price_bucket = Column(Integer, primary_key=True)  # app.services.facets.PRICE_BUCKETS 인덱스
+    product_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# --- Supplier sync state (007) ---
+class SupplierSyncState(Base):
+    """공급처별 동기화 워터마크. delta 동기화는 watermark 이후 변경분만 요청."""
+    __tablename__ = "supplier_sync_states"
+
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="CASCADE"), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)  # 마지막 완료 동기화(delta/full)의 시작 시각
+    last_full_sync_at = Column(DateTime(timezone=True), nullable=True)
+    last_result = Column(JSON, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 # --- Carts ---
@@ -284,6 +335,12 @@ class Order(Base):
     external_orders = relationship("ExternalOrder", back_populates="order")
     shipments = relationship("Shipment", back_populates="order")
 
+    # 내 주문 / 관리자 주문 목록 keyset 정렬용 (003)
+    __table_args__ = (
+        Index("ix_orders_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_orders_created_id", "created_at", "id"),
+    )
+
     # 코드 호환용 별칭 (001 스키마: recipient_* 단일 주소)
     @property
     def shipping_name(self) -> Optional[str]:
@@ -364,6 +421,10 @@ class Shipment(Base):
     status = Column(String(50), default="pending")
     shipped_at = Column(DateTime(timezone=True), nullable=True)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
+    # 008: 마지막 배송 추적 조회 시각
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)
+    # 009: 다음 배송 추적 조회 시각 (상태/이벤트 경과 시간에 따라 조회 후 다시 계산, 새 배송은 즉시 조회)
+    next_poll_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -371,8 +432,10 @@ class Shipment(Base):
     external_order = relationship("ExternalOrder", back_populates="shipments")
     events = relationship("ShipmentEvent", back_populates="shipment", cascade="all, delete-orphan")
 
+    __table_args__ = (Index("ix_shipments_status_next_poll", "status", "next_poll_at"),)
+
 
-# --- Shipment events (001: event_time) ---
+# --- Shipment events (001: event_time, 008: (shipment_id, event_time) 유니크) ---
 class ShipmentEvent(Base):
     __tablename__ = "shipment_events"
 
@@ -386,6 +449,8 @@ class ShipmentEvent(Base):
 
     shipment = relationship("Shipment", back_populates="events")
 
+    __table_args__ = (UniqueConstraint("shipment_id", "event_time", name="uq_shipment_events_shipment_time"),)
+
     @property
     def occurred_at(self) -> Optional[datetime]:
         return self.event_time
@@ -0,0 +1,98 @@
+"""
+커넥션 풀 계측
+- QueuePool/AsyncAdaptedQueuePool을 감싸 체크아웃 대기 시간·타임아웃을 프로세스 단위로 집계
+- 통계는 풀 logging_name(=엔진 이름) 기준으로 보관 (dispose/recreate 후에도 유지)
+- /metrics 에서 pool_metrics()로 노출 → PgBouncer/풀 크기 산정 근거
+"""
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """풀 하나의 누적 체크아웃 통계 (프로세스 로컬)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            avg = self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts_total": self.checkouts,
+                "checkout_timeouts_total": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(avg, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+_pools: Dict[str, Any] = {}
+_stats: Dict[str, PoolStats] = {}
+
+
+def _stats_for(name: str) -> PoolStats:
+    if name not in _stats:
+        _stats[name] = PoolStats()
+    return _stats[name]
+
+
+class _TimedCheckoutMixin:
+    """_do_get(풀에서 커넥션을 꺼내는 지점)의 대기 시간을 기록. 새 커넥션 생성 시간도 포함."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # recreate()로 새 풀이 만들어져도 같은 이름으로 교체 등록
+        _pools[self._orig_logging_name or "default"] = self
+
+    def _do_get(self):
+        name = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            _stats_for(name).record(time.perf_counter() - start, timed_out=True)
+            raise
+        _stats_for(name).record(time.perf_counter() - start)
+        return conn
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """동기 엔진(Celery/스크립트)용 계측 풀."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """비동기 엔진(API)용 계측 풀."""
+
+
+def pool_metrics() -> Dict[str, Any]:
+    """현재 프로세스의 풀별 사용 현황 + 누적 대기 통계."""
+    pools = {}
+    for name, pool in _pools.items():
+        pools[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # overflow()는 size 초과분(음수면 아직 size만큼 생성 전)
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            **_stats_for(name).as_dict(),
+        }
+    return {"pid": os.getpid(), "pools": pools}
@@ -1,16 +1,157 @@
+"""
+DB 엔진/세션
+- API(FastAPI): AsyncSession (asyncpg) — 이벤트 루프를 막지 않음
+- Celery 태스크/스크립트: 동기 SessionLocal (psycopg2)
+- 읽기 전용 API: get_read_db → DATABASE_REPLICA_URLS 복제본 라운드로빈, 모두 장애면 primary
+- 풀 크기/재활용/pre-ping/statement_timeout은 Settings(DB_*)로 설정, 사용량은 app.db.pool로 계측
+"""
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncIterator, Dict, Iterator, List
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_kwargs(pool_size: int, max_overflow: int) -> dict:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args(statement_timeout_ms: int) -> dict:
+    """psycopg2: 접속 시 options로 statement_timeout 지정."""
+    if not statement_timeout_ms:
+        return {}
+    return {"options": f"-c statement_timeout={statement_timeout_ms}"}
 
-engine = create_engine(settings.DATABASE_URL)
+
+def _async_connect_args(statement_timeout_ms: int, connect_timeout: int = 0) -> dict:
+    """asyncpg: server_settings로 statement_timeout, timeout으로 접속 타임아웃 지정."""
+    args: dict = {}
+    if statement_timeout_ms:
+        args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+    if connect_timeout:
+        args["timeout"] = connect_timeout
+    return args
+
+
+# 동기 엔진: Celery 태스크(app/tasks), alembic, scripts 전용
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_logging_name="sync",
+    connect_args=_sync_connect_args(settings.DB_TASK_STATEMENT_TIMEOUT_MS),
+    **_pool_kwargs(settings.DB_TASK_POOL_SIZE, settings.DB_TASK_MAX_OVERFLOW),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 비동기 엔진: API 라우터 전용
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_logging_name="primary",
+    connect_args=_async_connect_args(settings.DB_STATEMENT_TIMEOUT_MS),
+    **_pool_kwargs(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+class ReplicaRouter:
+    """
+    읽기 복제본 선택기
+    - 요청마다 라운드로빈으로 시작 위치를 돌림
+    - 접속 실패한 복제본은 DB_REPLICA_RETRY_SECONDS 동안 후보에서 제외
+    """
+
+    def __init__(self, engines: List, retry_seconds: int):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+        self._down_until: Dict[int, float] = {}
+
+    def candidates(self) -> Iterator:
+        """이번 요청에서 시도할 정상 복제본 (라운드로빈 순서)."""
+        if not self.engines:
+            return
+        start = next(self._counter) % len(self.engines)
+        now = time.monotonic()
+        for i in range(len(self.engines)):
+            idx = (start + i) % len(self.engines)
+            if self._down_until.get(idx, 0) <= now:
+                yield self.engines[idx]
+
+    def mark_down(self, engine) -> None:
+        idx = self.engines.index(engine)
+        self._down_until[idx] = time.monotonic() + self.retry_seconds
+        logger.warning("DB replica %s unavailable, excluded for %ss", idx, self.retry_seconds)
+
+    def status(self) -> Dict[str, str]:
+        now = time.monotonic()
+        return {
+            f"replica{i}": "down" if self._down_until.get(i, 0) > now else "up"
+            for i in range(len(self.engines))
+        }
+
+
+replica_engines = [
+    create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=f"replica{i}",
+        connect_args=_async_connect_args(settings.DB_STATEMENT_TIMEOUT_MS, settings.DB_REPLICA_CONNECT_TIMEOUT),
+        **_pool_kwargs(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+    )
+    for i, url in enumerate(settings.async_replica_urls)
+]
+replica_router = ReplicaRouter(replica_engines, settings.DB_REPLICA_RETRY_SECONDS)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """요청 단위 AsyncSession 의존성. 관계는 lazy load되지 않으므로 selectinload 등으로 명시 로드."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    읽기 전용 AsyncSession 의존성 (카탈로그/관리자 조회용).
+    복제본 지연(replication lag)이 있으므로 쓰기 직후 재조회가 필요한 경로에는 get_db 사용.
+    """
+    for replica in replica_router.candidates():
+        db = AsyncSessionLocal(bind=replica)
+        try:
+            # 커넥션을 미리 확보해 장애 복제본을 요청 처리 전에 걸러냄
+            await db.connection()
+        except (DBAPIError, OSError, asyncio.TimeoutError):
+            await db.close()
+            replica_router.mark_down(replica)
+            continue
+        try:
+            yield db
+        finally:
+            await db.close()
+        return
+
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
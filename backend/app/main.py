@@ -1,10 +1,16 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.api import products, orders, users, suppliers, cart, payments, admin
+from app.connectors.circuit import circuit_metrics
+from app.core.cache import response_cache
 from app.core.config import settings
-from app.db.session import engine
+from app.core.rate_limit import RateLimitHeadersMiddleware, rate_limiter
+from app.db.session import async_engine, replica_engines, replica_router
+from app.db.pool import pool_metrics
 from app.db import models
 
 @asynccontextmanager
@@ -14,6 +20,13 @@ async def lifespan(app: FastAPI):
     print("🚀 KonaMall API Starting...")
     yield
     # Shutdown
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    if response_cache.client is not None:
+        await response_cache.client.aclose()
+    if rate_limiter.client is not None:
+        await rate_limiter.client.aclose()
     print("👋 KonaMall API Shutting down...")
 
 app = FastAPI(
@@ -32,7 +45,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Next-Cursor", "X-Cache", "ETag", "Last-Modified",
+        "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After",
+    ],
 )
+# RateLimitDep 결과 → RateLimit-* 응답 헤더
+app.add_middleware(RateLimitHeadersMiddleware)
 
 # Routers
 app.include_router(products.router, prefix="/api/products", tags=["Products"])
@@ -52,3 +71,18 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    프로세스(워커)별 운영 지표. DB 풀: 사용 중/유휴/오버플로 커넥션 수, 체크아웃 대기 시간. 응답 캐시 hit/miss/bytes. 요청 제한 허용/거부/로컬 판정 수.
+    공급처 서킷: Redis의 공급처별 공유 상태(closed/open/half_open, 연속 장애, open 횟수)
+    """
+    return {
+        "db_pool": pool_metrics(),
+        "db_replicas": replica_router.status(),
+        "response_cache": response_cache.stats.as_dict(),
+        "rate_limit": rate_limiter.stats.as_dict(),
+        "connector_circuits": await asyncio.to_thread(circuit_metrics),
+    }
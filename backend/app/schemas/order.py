@@ -118,6 +118,7 @@ class OrderListOut(BaseModel):
     total: int
     page: int = 1
     limit: int = 20
+    next_cursor: Optional[str] = None  # keyset 다음 페이지 (마지막 페이지면 null)
 
 
 # ========== Shipment ==========
@@ -63,6 +63,27 @@ class ProductOut(ProductBase):
 
 class ProductListOut(BaseModel):
     items: List[ProductOut]
-    total: int
+    total: Optional[int] = None  # with_total=false면 null
+    total_exact: bool = True  # false면 추정치 또는 캐시값
     skip: int
     limit: int
+    next_cursor: Optional[str] = None  # keyset 다음 페이지 (마지막 페이지면 null)
+
+
+class FacetValueOut(BaseModel):
+    value: str
+    count: int
+
+
+class PriceBucketOut(BaseModel):
+    bucket: int  # /api/products/?price_bucket= 값
+    min: int
+    max: Optional[int] = None  # 마지막 구간은 상한 없음
+    count: int
+
+
+class ProductFacetsOut(BaseModel):
+    categories: List[FacetValueOut]
+    brands: List[FacetValueOut]
+    price_buckets: List[PriceBucketOut]
+    source: str  # summary(집계 테이블) | live(검색/가격 범위 직접 집계)
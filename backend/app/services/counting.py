@@ -0,0 +1,95 @@
+"""
+목록 total 계산 전략
+- 임계값 이하: LIMIT을 건 count로 정확한 값 (임계값 이상은 세지 않으므로 비용 상한)
+- 임계값 초과: 필터 조합별 캐시(TTL) → 없으면 PostgreSQL 플래너 추정치(EXPLAIN), 그 외 DB는 전체 count
+- 캐시는 프로세스 로컬 (상한 개수 초과 시 오래된 키부터 제거)
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+MAX_CACHED_KEYS = 1024
+
+
+class CountResult(NamedTuple):
+    total: Optional[int]
+    exact: bool
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <select> — 바인딩 파라미터를 그대로 유지."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+_cache: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+
+
+def _cache_get(key: Hashable, ttl: int) -> Optional[int]:
+    hit = _cache.get(key)
+    if not hit:
+        return None
+    stored_at, value = hit
+    if time.monotonic() - stored_at > ttl:
+        _cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_set(key: Hashable, value: int) -> None:
+    _cache[key] = (time.monotonic(), value)
+    _cache.move_to_end(key)
+    while len(_cache) > MAX_CACHED_KEYS:
+        _cache.popitem(last=False)
+
+
+def clear_count_cache() -> None:
+    _cache.clear()
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> int:
+    raw = await db.scalar(_Explain(query))
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    *,
+    cache_key: Hashable,
+    exact_threshold: int,
+    cache_ttl: int,
+) -> CountResult:
+    """query(정렬/페이지 제외)의 행 수. exact=False면 추정치 또는 TTL 내 캐시값."""
+    cached = _cache_get(cache_key, cache_ttl)
+    if cached is not None:
+        return CountResult(cached, exact=False)
+
+    bounded = await db.scalar(
+        select(func.count()).select_from(query.limit(exact_threshold + 1).subquery())
+    )
+    if bounded <= exact_threshold:
+        return CountResult(bounded, exact=True)
+
+    if db.get_bind().dialect.name == "postgresql":
+        total = max(await _planner_estimate(db, query), bounded)
+    else:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    _cache_set(cache_key, total)
+    return CountResult(total, exact=False)
@@ -0,0 +1,151 @@
+"""
+상품 facet (카테고리/브랜드/가격 구간별 상품 수)
+- product_facet_counts: 활성 상품을 (category, brand, price_bucket)으로 미리 집계한 요약 테이블
+  - sync_supplier_products가 변경된 카테고리만 다시 집계 (refresh_facet_counts)
+  - 매일 전체 재집계 (rebuild_product_facets)로 누락 보정
+- 검색어/가격 범위가 없으면 요약 테이블에서, 있으면 필터된 상품을 직접 집계
+- 각 facet은 자기 차원을 제외한 나머지 필터를 적용 (선택한 카테고리 외 다른 카테고리 수도 표시)
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import Product, ProductFacetCount
+
+# 가격 구간 (KRW, [하한, 상한)). 인덱스가 product_facet_counts.price_bucket — 변경 시 전체 재집계 필요
+PRICE_BUCKETS: Tuple[Tuple[int, Optional[int]], ...] = (
+    (0, 10000),
+    (10000, 30000),
+    (30000, 50000),
+    (50000, 100000),
+    (100000, 200000),
+    (200000, None),
+)
+
+# 동시 sync의 같은 카테고리 재집계 직렬화 (pg_advisory_xact_lock 키)
+FACET_LOCK_KEY = 7_300_801
+
+
+def price_bucket_expr() -> ColumnElement:
+    """Product.selling_price → 가격 구간 인덱스."""
+    return case(
+        *[(Product.selling_price < upper, i) for i, (_, upper) in enumerate(PRICE_BUCKETS) if upper is not None],
+        else_=len(PRICE_BUCKETS) - 1,
+    )
+
+
+def price_bucket_filter(bucket: int) -> ColumnElement:
+    lower, upper = PRICE_BUCKETS[bucket]
+    if upper is None:
+        return Product.selling_price >= lower
+    return and_(Product.selling_price >= lower, Product.selling_price < upper)
+
+
+def refresh_facet_counts(db: Session, categories: Optional[Iterable[Optional[str]]] = None) -> int:
+    """
+    categories(None이면 전체)의 집계를 상품 테이블에서 다시 계산. 커밋은 호출자.
+
+    Returns:
+        저장된 집계 행 수
+    """
+    category_key = func.coalesce(Product.category, "")
+    brand_key = func.coalesce(Product.brand, "")
+    bucket = price_bucket_expr()
+    aggregate = (
+        select(category_key, brand_key, bucket, func.count())
+        .where(Product.is_active == True)
+        .group_by(category_key, brand_key, bucket)
+    )
+    stale = delete(ProductFacetCount)
+    if categories is not None:
+        keys = sorted({c or "" for c in categories})
+        if not keys:
+            return 0
+        matches = [Product.category.in_([k for k in keys if k])]
+        if "" in keys:
+            matches.append(Product.category.is_(None))
+        aggregate = aggregate.where(or_(*matches))
+        stale = stale.where(ProductFacetCount.category.in_(keys))
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(FACET_LOCK_KEY)))
+    db.execute(stale)
+    result = db.execute(
+        insert(ProductFacetCount).from_select(
+            ["category", "brand", "price_bucket", "product_count"], aggregate
+        )
+    )
+    return result.rowcount
+
+
+async def get_facets(
+    db: AsyncSession,
+    *,
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    price_bucket: Optional[int] = None,
+    search_condition: Optional[ColumnElement] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+) -> dict:
+    """카테고리/브랜드/가격 구간별 상품 수. source: summary(요약 테이블) 또는 live(직접 집계)."""
+    live = search_condition is not None or min_price is not None or max_price is not None
+    if live:
+        base = [Product.is_active == True]
+        if search_condition is not None:
+            base.append(search_condition)
+        if min_price is not None:
+            base.append(Product.selling_price >= min_price)
+        if max_price is not None:
+            base.append(Product.selling_price <= max_price)
+        dimensions = {
+            "category": func.coalesce(Product.category, ""),
+            "brand": func.coalesce(Product.brand, ""),
+            "price_bucket": price_bucket_expr(),
+        }
+        filters = {
+            "category": Product.category == category if category else None,
+            "brand": Product.brand == brand if brand else None,
+            "price_bucket": price_bucket_filter(price_bucket) if price_bucket is not None else None,
+        }
+        count = func.count()
+    else:
+        base = []
+        dimensions = {
+            "category": ProductFacetCount.category,
+            "brand": ProductFacetCount.brand,
+            "price_bucket": ProductFacetCount.price_bucket,
+        }
+        filters = {
+            "category": ProductFacetCount.category == category if category else None,
+            "brand": ProductFacetCount.brand == brand if brand else None,
+            "price_bucket": ProductFacetCount.price_bucket == price_bucket if price_bucket is not None else None,
+        }
+        count = func.sum(ProductFacetCount.product_count)
+
+    counts: Dict[str, List[Tuple]] = {}
+    for name, column in dimensions.items():
+        conditions = base + [c for other, c in filters.items() if other != name and c is not None]
+        result = await db.execute(select(column, count).where(*conditions).group_by(column))
+        counts[name] = [(value, int(n)) for value, n in result.all() if n]
+
+    def _values(rows):
+        return [
+            {"value": value, "count": n}
+            for value, n in sorted(rows, key=lambda r: (-r[1], r[0]))
+            if value
+        ]
+
+    by_bucket = dict(counts["price_bucket"])
+    return {
+        "categories": _values(counts["category"]),
+        "brands": _values(counts["brand"]),
+        "price_buckets": [
+            {"bucket": i, "min": lower, "max": upper, "count": by_bucket.get(i, 0)}
+            for i, (lower, upper) in enumerate(PRICE_BUCKETS)
+        ],
+        "source": "live" if live else "summary",
+    }
@@ -0,0 +1,54 @@
+"""
+주문 상태 집계 (외부 주문 상태 → 주문 상태)
+- PROCESSING → SHIPPED: 외부 주문 중 하나라도 발송됨 (SHIPPED 또는 DELIVERED)
+- SHIPPED → DELIVERED: 외부 주문이 모두 배송 완료
+- 전환마다 UPDATE ... WHERE [NOT] EXISTS ... RETURNING id 1회 → 주문 수와 무관하게 DB 왕복 2회
+  (Python에서 주문/외부 주문을 읽어 판단하지 않음. 반환된 id로 알림 발송)
+- 앞 전환의 결과가 같은 호출의 다음 전환 대상이 됨 (외부 주문이 한 번에 모두 배송 완료되면 PROCESSING → DELIVERED)
+"""
+from typing import Dict, List, Tuple
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import ExternalOrder, ExternalOrderStatus, Order, OrderStatus
+
+_SHIPPED_OR_LATER = (ExternalOrderStatus.SHIPPED, ExternalOrderStatus.DELIVERED)
+
+
+def _external_orders(*criteria: ColumnElement) -> ColumnElement:
+    return exists(select(ExternalOrder.id).where(ExternalOrder.order_id == Order.id, *criteria))
+
+
+# (현재 상태, 다음 상태, 전환 조건) — 순서대로 실행
+TRANSITIONS: Tuple[Tuple[OrderStatus, OrderStatus, ColumnElement], ...] = (
+    (
+        OrderStatus.PROCESSING,
+        OrderStatus.SHIPPED,
+        _external_orders(ExternalOrder.status.in_(_SHIPPED_OR_LATER)),
+    ),
+    (
+        OrderStatus.SHIPPED,
+        OrderStatus.DELIVERED,
+        _external_orders() & ~_external_orders(ExternalOrder.status != ExternalOrderStatus.DELIVERED),
+    ),
+)
+
+
+def rollup_order_statuses(db: Session) -> Dict[OrderStatus, List[int]]:
+    """
+    외부 주문 상태에 따라 주문 상태 전환 (커밋은 호출자)
+    Returns: {다음 상태: 전환된 주문 id 목록}
+    """
+    changed: Dict[OrderStatus, List[int]] = {}
+    for current, target, condition in TRANSITIONS:
+        result = db.execute(
+            update(Order)
+            .where(Order.status == current, condition)
+            .values(status=target)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        changed[target] = sorted(result.scalars().all())
+    return changed
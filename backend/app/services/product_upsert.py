@@ -0,0 +1,236 @@
+"""
+상품 일괄 upsert (sync_supplier_products)
+- 커넥터 결과를 SYNC_CHUNK_SIZE 단위 청크로 나눠 청크당 고정 라운드트립:
+  1) 기존 상품 (external_id → id, content_hash, 동기화 컬럼) 조회 1회
+  2) 신규: INSERT ... ON CONFLICT DO NOTHING RETURNING id 1회 + 이미지/옵션 executemany 각 1회
+  3) 변경: 바뀐 컬럼 조합별 UPDATE executemany 1회씩
+  4) content_hash가 같으면 쓰기 없음 (synced_at/updated_at도 그대로 → WAL/ETag 변화 없음)
+- content_hash: 정규화된 상품 컬럼 값(SYNC_COLUMNS)의 sha256. 이미지/옵션은 신규 상품에만 기록하므로 제외
+- 커밋/롤백은 호출자가 청크 단위로 (실패한 청크만 버리고 다음 청크 계속)
+- 응답 값 중 없는 항목(None)은 기존 값 유지
+- 전체 동기화 후 카탈로그에 없던 활성 상품은 deactivate_missing으로 일괄 비활성화 (removed_at 기록)
+  - removed_at이 있는 상품이 다시 응답에 나타나면 재활성화 (관리자가 끈 상품은 removed_at이 없어 유지)
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.db.models import Product, ProductImage, ProductVariant
+
+# 응답 값이 None이면 기존 값 유지하는 컬럼
+KEEP_EXISTING_IF_NULL = (
+    "name_ko", "description", "description_ko", "category", "brand", "external_url",
+)
+# 동기화가 쓰는 상품 컬럼 (content_hash 대상, 변경 비교 대상)
+SYNC_COLUMNS = ("name", "original_price", "selling_price", "stock") + KEEP_EXISTING_IF_NULL
+
+
+@dataclass
+class ChunkResult:
+    created: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    restored: int = 0  # 재활성화 (removed_at → NULL)
+    removed: int = 0  # 비활성화 (deactivate_missing)
+    product_ids: Set[int] = field(default_factory=set)  # 변경된 상품 (응답 캐시 무효화)
+    categories: Set[Optional[str]] = field(default_factory=set)  # 변경 전/후 카테고리 (facet 재집계)
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def price_krw(price: Any, exchange_rate: float, margin_percent: float) -> int:
+    return int(float(price or 0) * exchange_rate * (1 + margin_percent / 100))
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """SYNC_COLUMNS 값의 sha256 (가격은 소수 2자리 문자열로 고정해 float 표현 차이 제거)."""
+    values = {c: _comparable(c, row.get(c)) for c in SYNC_COLUMNS}
+    raw = json.dumps(values, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _comparable(column: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if column in ("original_price", "selling_price"):
+        return str(Decimal(str(value)).quantize(Decimal("0.01")))
+    return value
+
+
+def normalize_product(
+    product_data: Dict[str, Any],
+    supplier_id: int,
+    exchange_rate: float,
+    margin_percent: float,
+    synced_at: datetime,
+) -> Optional[Dict[str, Any]]:
+    """커넥터 응답 1건 → {"row", "images", "variants"}. external_id가 없으면 None."""
+    external_id = product_data.get("external_id") or product_data.get("id")
+    if not external_id:
+        return None
+    price_usd = float(product_data.get("price", 0))
+    row = {
+        "supplier_id": supplier_id,
+        "external_id": str(external_id),
+        "name": product_data.get("title", product_data.get("name")),  # None이면 upsert_chunk에서 채움
+        "name_ko": product_data.get("title_ko", product_data.get("name_ko")),
+        "description": product_data.get("description"),
+        "description_ko": product_data.get("description_ko"),
+        "category": product_data.get("category"),
+        "brand": product_data.get("brand"),
+        "external_url": product_data.get("url"),
+        "original_price": price_usd,
+        "selling_price": price_krw(price_usd, exchange_rate, margin_percent),
+        "currency": "KRW",
+        "stock": product_data.get("stock", 0),
+        "synced_at": synced_at,
+    }
+    row["content_hash"] = content_hash(row)
+    images = [
+        {"url": url, "is_primary": i == 0, "sort_order": i}
+        for i, url in enumerate(product_data.get("images", []))
+    ]
+    variants = [
+        {
+            "external_variant_id": str(v.get("id", "")),
+            "name": v.get("name"),
+            "sku": v.get("sku"),
+            "price_krw": price_krw(v.get("price", 0), exchange_rate, margin_percent),
+            "stock": v.get("stock", 0),
+        }
+        for v in product_data.get("variants", [])
+    ]
+    return {"row": row, "images": images, "variants": variants}
+
+
+def upsert_chunk(db: Session, supplier_id: int, items: List[Dict[str, Any]]) -> ChunkResult:
+    """normalize_product 결과 묶음을 반영. 같은 external_id가 여러 번 오면 마지막 값 사용."""
+    result = ChunkResult()
+    by_external_id = {item["row"]["external_id"]: item for item in items}
+    if not by_external_id:
+        return result
+
+    existing = {
+        row.external_id: row
+        for row in db.execute(
+            select(
+                Product.external_id,
+                Product.id,
+                Product.content_hash,
+                Product.removed_at,
+                *[getattr(Product, c) for c in SYNC_COLUMNS],
+            )
+            .where(Product.supplier_id == supplier_id, Product.external_id.in_(list(by_external_id)))
+        )
+    }
+
+    new_rows = []
+    changes: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+    for external_id, item in by_external_id.items():
+        row = item["row"]
+        old = existing.get(external_id)
+        if old is None:
+            new_rows.append({**row, "name": row["name"] or "Unknown"})
+            result.categories.add(row["category"])
+            continue
+        restore = old.removed_at is not None
+        if old.content_hash == row["content_hash"] and not restore:
+            result.unchanged += 1
+            continue
+        diff = {
+            c: row[c]
+            for c in SYNC_COLUMNS
+            if row[c] is not None and _comparable(c, row[c]) != _comparable(c, getattr(old, c))
+        }
+        if restore:
+            diff.update(is_active=True, removed_at=None)
+        if not diff:
+            # None(기존 값 유지)만 달라 해시가 바뀐 경우 또는 해시 없는 기존 행: 해시만 기록
+            result.unchanged += 1
+        else:
+            if restore:
+                result.restored += 1
+            else:
+                result.changed += 1
+            result.product_ids.add(old.id)
+            result.categories.update({old.category, diff.get("category", old.category)})
+            diff["synced_at"] = row["synced_at"]
+        diff["content_hash"] = row["content_hash"]
+        changes.setdefault(frozenset(diff), []).append({"_id": old.id, **{f"v_{c}": v for c, v in diff.items()}})
+
+    products = Product.__table__
+    for columns, params in changes.items():
+        stmt = (
+            update(products)
+            .where(products.c.id == bindparam("_id"))
+            .values({c: bindparam(f"v_{c}") for c in columns})
+        )
+        if columns != {"content_hash"}:
+            stmt = stmt.values(updated_at=func.now())
+        db.execute(stmt, params)
+
+    if new_rows:
+        stmt = (
+            dialect_insert(db)(Product)
+            .values(new_rows)
+            .on_conflict_do_nothing(index_elements=[Product.supplier_id, Product.external_id])
+            .returning(Product.id, Product.external_id)
+        )
+        image_rows, variant_rows = [], []
+        for product_id, external_id in db.execute(stmt):
+            result.created += 1
+            result.product_ids.add(product_id)
+            item = by_external_id[external_id]
+            image_rows += [{**image, "product_id": product_id} for image in item["images"]]
+            variant_rows += [{**variant, "product_id": product_id} for variant in item["variants"]]
+        if image_rows:
+            db.execute(insert(ProductImage), image_rows)
+        if variant_rows:
+            db.execute(insert(ProductVariant), variant_rows)
+    return result
+
+
+def deactivate_missing(
+    db: Session,
+    supplier_id: int,
+    seen_external_ids: Set[str],
+    removed_at: datetime,
+    max_ratio: float = 1.0,
+    chunk_size: int = 1000,
+) -> Optional[ChunkResult]:
+    """
+    전체 동기화에서 보지 못한 공급처의 활성 상품을 비활성화. 커밋은 호출자.
+    대상이 활성 상품의 max_ratio를 넘으면 (공급처 응답 누락 의심) 아무것도 하지 않고 None.
+    """
+    active = db.execute(
+        select(Product.id, Product.external_id, Product.category)
+        .where(Product.supplier_id == supplier_id, Product.is_active == True)
+    ).all()
+    missing = [row for row in active if row.external_id not in seen_external_ids]
+    if active and len(missing) > len(active) * max_ratio:
+        return None
+
+    result = ChunkResult(removed=len(missing))
+    products = Product.__table__
+    for rows in chunked(missing, chunk_size):
+        ids = [row.id for row in rows]
+        db.execute(
+            update(products)
+            .where(products.c.id.in_(ids))
+            .values(is_active=False, removed_at=removed_at, updated_at=func.now())
+        )
+        result.product_ids.update(ids)
+        result.categories.update(row.category for row in rows)
+    return result
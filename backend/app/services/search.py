@@ -0,0 +1,51 @@
+"""
+상품 검색
+- Product.search_text: name/name_ko/brand/category를 소문자로 합친 생성 컬럼 (DB가 INSERT/UPDATE 시 갱신)
+- PostgreSQL: pg_trgm GIN 인덱스 (ix_products_search_trgm)
+  - 단어별 부분 일치 LIKE '%단어%' → 인덱스 사용 (3글자 미만 단어는 인덱스 효과 제한)
+  - 오타 허용: 검색어 <% search_text (word_similarity, pg_trgm.word_similarity_threshold)
+  - 정렬: word_similarity 내림차순
+- 그 외 DB(SQLite 테스트 등): 단어별 LIKE만, 관련도 정렬 없음
+- 한글은 형태소 분석 없이 trigram(3글자 조각) 단위로 매칭
+"""
+from typing import List, Optional
+
+from sqlalchemy import and_, func, literal, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import Product
+
+MAX_QUERY_LENGTH = 100
+MAX_QUERY_WORDS = 8
+
+
+def normalize_query(term: Optional[str]) -> str:
+    """검색어 정규화: 소문자, 공백 정리, 길이 제한. 빈 문자열이면 검색 안 함."""
+    if not term:
+        return ""
+    return " ".join(term.lower().split())[:MAX_QUERY_LENGTH].strip()
+
+
+def _words(term: str) -> List[str]:
+    return term.split(" ")[:MAX_QUERY_WORDS]
+
+
+def _escape_like(word: str) -> str:
+    return word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_filter(term: str, dialect: str) -> ColumnElement:
+    """정규화된 검색어의 WHERE 조건. 모든 단어가 포함되거나 (PostgreSQL) 유사하면 일치."""
+    contains_all = and_(
+        *[Product.search_text.like(f"%{_escape_like(w)}%", escape="\\") for w in _words(term)]
+    )
+    if dialect != "postgresql":
+        return contains_all
+    return or_(contains_all, literal(term).op("<%")(Product.search_text))
+
+
+def search_rank(term: str, dialect: str) -> Optional[ColumnElement]:
+    """관련도 (높을수록 앞). 지원하지 않는 DB면 None."""
+    if dialect != "postgresql":
+        return None
+    return func.word_similarity(term, Product.search_text)
@@ -0,0 +1,93 @@
+"""
+배송 추적 갱신 (조회 시각 계산, 이벤트 일괄 저장)
+- 조회 대상: 진행 중 배송 중 next_poll_at이 지난 것 (인덱스 (status, next_poll_at) 범위 조회)
+- 다음 조회 시각 = 조회 시각 + 주기
+  - 상태별 기본 주기 TRACKING_POLL_MINUTES (picked_up 드물게, out_for_delivery 자주), 없으면 TRACKING_REFRESH_MINUTES
+  - 마지막 이벤트 이후 TRACKING_BACKOFF_IDLE_HOURS마다 2배 (새 이벤트가 오면 기본 주기로), 최대 TRACKING_POLL_MAX_MINUTES
+  - 택배사별 최소 주기 TRACKING_COURIER_REFRESH_MINUTES {"cj": 60, ...} (택배사 코드 소문자)
+- 이벤트: (shipment_id, event_time) 유니크 제약 + INSERT ... ON CONFLICT DO NOTHING 배치당 1회
+  (이벤트마다 존재 여부를 조회하지 않음. 시각 없는 이벤트는 중복 판단이 불가능해 저장하지 않음)
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.db.dialect import dialect_insert
+from app.db.models import Shipment, ShipmentEvent, ShipmentStatus
+
+ACTIVE_STATUSES = (ShipmentStatus.PICKED_UP, ShipmentStatus.IN_TRANSIT, ShipmentStatus.OUT_FOR_DELIVERY)
+
+
+def courier_refresh_minutes() -> Dict[str, int]:
+    """택배사 코드(소문자) → 최소 조회 주기(분)"""
+    return {courier.lower(): minutes for courier, minutes in settings.TRACKING_COURIER_REFRESH_MINUTES.items()}
+
+
+def due_for_poll(now: Optional[datetime] = None) -> ColumnElement:
+    """다음 조회 시각이 지난 진행 중 배송 조건"""
+    return and_(
+        Shipment.status.in_(ACTIVE_STATUSES),
+        Shipment.next_poll_at <= (now or datetime.now(timezone.utc)),
+        Shipment.tracking_number.isnot(None),
+    )
+
+
+def poll_interval(
+    status: str, courier: Optional[str], last_event_at: Optional[datetime], now: datetime
+) -> timedelta:
+    """상태, 마지막 이벤트 이후 경과 시간, 택배사에 따른 다음 조회까지 간격"""
+    minutes = settings.TRACKING_POLL_MINUTES.get(ShipmentStatus(status).value, settings.TRACKING_REFRESH_MINUTES)
+    if last_event_at is not None:
+        idle_hours = (now - as_utc(last_event_at)).total_seconds() / 3600
+        doublings = int(max(idle_hours, 0) // settings.TRACKING_BACKOFF_IDLE_HOURS)
+        minutes = min(minutes * 2 ** min(doublings, 16), settings.TRACKING_POLL_MAX_MINUTES)
+    minutes = max(minutes, courier_refresh_minutes().get((courier or "").lower(), 0))
+    return timedelta(minutes=minutes)
+
+
+def as_utc(value: datetime) -> datetime:
+    """timezone 없는 값(SQLite, 커넥터 응답 등)은 UTC로 간주."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _event_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value if isinstance(value, datetime) else None
+
+
+def event_rows(shipment_id: int, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """커넥터 이벤트 [{status, description, location, time}] → shipment_events 행 (시각 없는 이벤트 제외)"""
+    rows = []
+    for event in events:
+        event_time = _event_time(event.get("time"))
+        if event_time is None:
+            continue
+        rows.append({
+            "shipment_id": shipment_id,
+            "status": event.get("status"),
+            "description": event.get("description"),
+            "location": event.get("location"),
+            "event_time": event_time,
+        })
+    return rows
+
+
+def insert_shipment_events(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """이벤트 일괄 저장 (이미 있는 (shipment_id, event_time)은 무시). Returns: 새로 저장한 수"""
+    if not rows:
+        return 0
+    result = db.execute(
+        dialect_insert(db)(ShipmentEvent)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[ShipmentEvent.shipment_id, ShipmentEvent.event_time])
+        .returning(ShipmentEvent.id)
+    )
+    return len(result.all())
@@ -3,29 +3,75 @@ Order Processing Tasks
 주문 처리 Celery 태스크
 """
 from celery import shared_task
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 import logging
 import uuid
 
 from app.celery_app import celery_app
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.db.models import (
-    Order, OrderItem, ExternalOrder, Shipment, ShipmentEvent,
+    Order, OrderItem, ExternalOrder, Shipment,
     Supplier, Product, OrderStatus, ExternalOrderStatus, ShipmentStatus, PaymentStatus
 )
-from app.connectors import get_connector
+from app.connectors import fan_out_by_supplier, get_supplier_connector
+from app.connectors.exceptions import ConnectorCircuitOpenError, retry_after_seconds
+from app.services.order_status import rollup_order_statuses
+from app.services.shipment_tracking import (
+    as_utc, due_for_poll, event_rows, insert_shipment_events, poll_interval,
+)
+from app.tasks.notifications import send_delivery_complete, send_shipping_notification
 
 logger = logging.getLogger(__name__)
 
 
+def _supplier_item_groups(db: Session, order_id: int, supplier_id: Optional[int] = None) -> Dict[int, List[OrderItem]]:
+    """주문 아이템을 상품/옵션과 함께 한 번에 조회해 공급자별로 묶음 (item.product 지연 로딩 없음)"""
+    query = (
+        db.query(OrderItem)
+        .join(Product, OrderItem.product_id == Product.id)
+        .options(contains_eager(OrderItem.product), joinedload(OrderItem.variant))
+        .filter(OrderItem.order_id == order_id)
+        .order_by(OrderItem.id)
+    )
+    if supplier_id is not None:
+        query = query.filter(Product.supplier_id == supplier_id)
+    groups: Dict[int, List[OrderItem]] = {}
+    for item in query.all():
+        groups.setdefault(item.product.supplier_id, []).append(item)
+    return groups
+
+
+def _order_payload(order: Order, items: List[OrderItem]) -> dict:
+    """공급자 발주 데이터"""
+    return {
+        "items": [
+            {
+                "external_id": item.product.external_id,
+                "quantity": item.quantity,
+                "variant_id": item.variant.external_variant_id if item.variant else None
+            }
+            for item in items
+        ],
+        "shipping": {
+            "name": order.shipping_name,
+            "phone": order.shipping_phone,
+            "zip_code": order.shipping_zip_code,
+            "address1": order.shipping_address1,
+            "address2": order.shipping_address2 or ""
+        }
+    }
+
+
 @celery_app.task(bind=True, name="app.tasks.order_process.process_order")
 def process_order(self, order_id: int) -> dict:
     """
     주문 처리 (결제 완료 후)
     - 공급자별로 ExternalOrder 생성
-    - 각 공급자에 주문 발주
+    - 각 공급자에 주문 발주 (공급자끼리 동시에: 전체 소요 시간 = 가장 느린 공급자)
     
     Args:
         order_id: 주문 ID
@@ -51,84 +97,71 @@ def process_order(self, order_id: int) -> dict:
         order.status = OrderStatus.PROCESSING
         db.commit()
         
-        # 상품별로 공급자 그룹화
-        supplier_items = {}
-        for item in order.items:
-            if item.product:
-                supplier_id = item.product.supplier_id
-                if supplier_id not in supplier_items:
-                    supplier_items[supplier_id] = []
-                supplier_items[supplier_id].append(item)
+        # 상품별로 공급자 그룹화 (아이템/상품/옵션 1회 조회, 공급자 1회 조회)
+        supplier_items = _supplier_item_groups(db, order_id)
+        suppliers = {
+            supplier.id: supplier
+            for supplier in db.query(Supplier).filter(Supplier.id.in_(list(supplier_items))).all()
+        } if supplier_items else {}
         
-        # 공급자별 발주 생성
+        # 공급자별 ExternalOrder 생성 (001: order_item_id 필수, 002: order_id 추가)
+        external_orders = {}
         for supplier_id, items in supplier_items.items():
-            supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
-            if not supplier:
+            if supplier_id not in suppliers:
                 continue
-            
-            # ExternalOrder 생성 (001: order_item_id 필수, 002: order_id 추가)
-            first_item = items[0]
-            external_order = ExternalOrder(
-                order_item_id=first_item.id,
+            external_orders[supplier_id] = ExternalOrder(
+                order_item_id=items[0].id,
                 order_id=order_id,
                 supplier_id=supplier_id,
                 status=ExternalOrderStatus.PENDING,
             )
-            db.add(external_order)
-            db.flush()
-            
-            # 공급자에 주문 발주 시도
-            try:
-                connector = get_connector(supplier.supplier_type.value)
-                if connector:
-                    # 발주 데이터 구성
-                    order_data = {
-                        "items": [
-                            {
-                                "external_id": item.product.external_id,
-                                "quantity": item.quantity,
-                                "variant_id": item.variant.external_variant_id if item.variant else None
-                            }
-                            for item in items
-                        ],
-                        "shipping": {
-                            "name": order.shipping_name,
-                            "phone": order.shipping_phone,
-                            "zip_code": order.shipping_zip_code,
-                            "address1": order.shipping_address1,
-                            "address2": order.shipping_address2 or ""
-                        }
-                    }
-                    
-                    # 발주 실행
-                    response = connector.place_order(
-                        api_key=supplier.api_key,
-                        api_secret=supplier.api_secret,
-                        order_data=order_data
-                    )
-                    
-                    external_order.external_order_id = response.get("order_id")
-                    external_order.status = ExternalOrderStatus.ORDERED
-                    external_order.raw_response = response
-                    
-                    result["external_orders"].append({
-                        "supplier_id": supplier_id,
-                        "external_order_id": external_order.external_order_id,
-                        "status": "success"
-                    })
-                else:
-                    raise ValueError(f"No connector for {supplier.supplier_type}")
-                    
-            except Exception as e:
-                logger.error(f"Failed to place order with supplier {supplier_id}: {e}")
+            db.add(external_orders[supplier_id])
+        db.flush()
+        
+        # 공급자별 발주는 동시에, 결과 반영은 이후 순서대로 (공급자 한 곳의 실패가 다른 발주를 막지 않음)
+        payloads = {supplier_id: _order_payload(order, supplier_items[supplier_id]) for supplier_id in external_orders}
+        outcomes = fan_out_by_supplier(
+            (
+                supplier_id,
+                suppliers[supplier_id],
+                lambda connector, s=suppliers[supplier_id], payload=payloads[supplier_id]: connector.place_order(
+                    api_key=s.api_key, api_secret=s.api_secret, order_data=payload
+                ),
+            )
+            for supplier_id in external_orders
+        )
+        
+        for supplier_id, external_order in external_orders.items():
+            response = outcomes[supplier_id]
+            if isinstance(response, ConnectorCircuitOpenError):
+                # 공급처 장애 중: 발주 시도 없이 보류 (재시도 횟수 차감 없음, retry_failed_orders가 다시 처리)
+                logger.warning(f"Deferred order placement with supplier {supplier_id}: {response}")
+                external_order.status = ExternalOrderStatus.FAILED
+                external_order.error_message = str(response)
+                result["external_orders"].append({
+                    "supplier_id": supplier_id,
+                    "status": "deferred",
+                    "error": str(response)
+                })
+            elif isinstance(response, BaseException):
+                logger.error(f"Failed to place order with supplier {supplier_id}: {response}")
                 external_order.status = ExternalOrderStatus.FAILED
-                external_order.error_message = str(e)
+                external_order.error_message = str(response)
                 external_order.attempts += 1
-                
                 result["external_orders"].append({
                     "supplier_id": supplier_id,
                     "status": "failed",
-                    "error": str(e)
+                    "error": str(response)
+                })
+            else:
+                external_order.external_order_id = response.get("order_id")
+                external_order.status = ExternalOrderStatus.ORDERED
+                external_order.raw_response = response
+                external_order.placed_at = datetime.utcnow()
+                result["external_orders"].append({
+                    "supplier_id": supplier_id,
+                    "external_order_id": external_order.external_order_id,
+                    "status": "success"
                 })
         
         db.commit()
@@ -194,34 +227,14 @@ def process_single_external_order(self, external_order_id: int) -> dict:
         if not supplier:
             return {"error": "Supplier not found"}
         
-        connector = get_connector(supplier.supplier_type.value)
+        connector = get_supplier_connector(supplier)
         if not connector:
             return {"error": "Connector not found"}
         
-        # 주문의 아이템들 가져오기
+        # 주문의 이 공급자 아이템들 가져오기 (상품/옵션 포함 1회 조회)
         order = ext_order.order
-        items = [
-            item for item in order.items
-            if item.product and item.product.supplier_id == supplier.id
-        ]
-        
-        order_data = {
-            "items": [
-                {
-                    "external_id": item.product.external_id,
-                    "quantity": item.quantity,
-                    "variant_id": item.variant.external_variant_id if item.variant else None
-                }
-                for item in items
-            ],
-            "shipping": {
-                "name": order.shipping_name,
-                "phone": order.shipping_phone,
-                "zip_code": order.shipping_zip_code,
-                "address1": order.shipping_address1,
-                "address2": order.shipping_address2 or ""
-            }
-        }
+        items = _supplier_item_groups(db, order.id, supplier.id).get(supplier.id, [])
+        order_data = _order_payload(order, items)
         
         response = connector.place_order(
             api_key=supplier.api_key,
@@ -232,6 +245,7 @@ def process_single_external_order(self, external_order_id: int) -> dict:
         ext_order.external_order_id = response.get("order_id")
         ext_order.status = ExternalOrderStatus.ORDERED
         ext_order.raw_response = response
+        ext_order.placed_at = datetime.utcnow()
         
         db.commit()
         
@@ -244,94 +258,164 @@ def process_single_external_order(self, external_order_id: int) -> dict:
     except Exception as e:
         logger.error(f"Failed to process external order {external_order_id}: {e}")
         if 'ext_order' in locals():
-            ext_order.attempts += 1
+            if not isinstance(e, ConnectorCircuitOpenError):
+                ext_order.attempts += 1
             ext_order.error_message = str(e)
             db.commit()
-        raise self.retry(exc=e)
+        raise self.retry(exc=e, countdown=retry_after_seconds(e))
     finally:
         db.close()
 
 
+def _poll_status_batch(db: Session, rows: list, suppliers: Dict[int, Supplier]) -> dict:
+    """
+    외부 주문 한 배치의 상태 조회 + 반영
+    - 공급자별 get_order_statuses 1회 (일괄 조회 API 또는 공급처당 동시 요청 수 제한 fan-out), 공급자끼리도 동시에
+    - 상태 변경은 상태별 UPDATE 1회, 배송(Shipment) 생성은 기존 배송 조회 1회 + INSERT 1회
+    """
+    counts = {"updated": 0, "deferred": 0, "failed": 0}
+    by_supplier: Dict[int, list] = {}
+    for row in rows:
+        if row.supplier_id in suppliers:
+            by_supplier.setdefault(row.supplier_id, []).append(row)
+    outcomes = fan_out_by_supplier(
+        (
+            supplier_id,
+            suppliers[supplier_id],
+            lambda connector, s=suppliers[supplier_id], ids=[r.external_order_id for r in group]: connector.get_order_statuses(
+                api_key=s.api_key, api_secret=s.api_secret, order_ids=ids
+            ),
+        )
+        for supplier_id, group in by_supplier.items()
+    )
+    
+    new_status_ids: Dict[str, List[int]] = {ExternalOrderStatus.SHIPPED: [], ExternalOrderStatus.DELIVERED: []}
+    shipped = []
+    for supplier_id, group in by_supplier.items():
+        statuses = outcomes[supplier_id]
+        for row in group:
+            status_data = statuses if isinstance(statuses, BaseException) else statuses.get(row.external_order_id)
+            if isinstance(status_data, ConnectorCircuitOpenError):
+                counts["deferred"] += 1  # 공급처 서킷 open: 다음 주기에 다시 조회
+                continue
+            if isinstance(status_data, BaseException) or not status_data:
+                logger.error(f"Failed to update status for external order {row.id}: {status_data}")
+                counts["failed"] += 1
+                continue
+            
+            new_status = (status_data.get("status") or "").lower()
+            if new_status == "shipped":
+                if row.status != ExternalOrderStatus.SHIPPED:
+                    new_status_ids[ExternalOrderStatus.SHIPPED].append(row.id)
+                shipped.append((row, status_data))
+            elif new_status == "delivered":
+                new_status_ids[ExternalOrderStatus.DELIVERED].append(row.id)
+            counts["updated"] += 1
+    
+    for status, ids in new_status_ids.items():
+        if ids:
+            db.query(ExternalOrder).filter(ExternalOrder.id.in_(ids)).update(
+                {ExternalOrder.status: status}, synchronize_session=False
+            )
+    
+    # Shipment 생성 (없으면)
+    if shipped:
+        has_shipment = {
+            external_order_id
+            for (external_order_id,) in db.query(Shipment.external_order_id).filter(
+                Shipment.external_order_id.in_([row.id for row, _ in shipped])
+            )
+        }
+        now = datetime.utcnow()
+        new_shipments = []
+        for row, status_data in shipped:
+            if row.id in has_shipment:
+                continue
+            if not row.order_id:
+                logger.warning(f"Skipping shipment create for external order {row.id}: missing order_id")
+                continue
+            new_shipments.append({
+                "order_id": row.order_id,
+                "external_order_id": row.id,
+                "tracking_number": status_data.get("tracking_number"),
+                "courier": status_data.get("courier"),
+                "status": ShipmentStatus.IN_TRANSIT,
+                "shipped_at": now,
+            })
+        if new_shipments:
+            db.execute(insert(Shipment), new_shipments)
+    return counts
+
+
+def _notify_order_transitions(db: Session, changed: Dict[OrderStatus, List[int]]) -> None:
+    """상태가 바뀐 주문 알림 (발송: 주문의 첫 운송장, 배송 완료)"""
+    shipped_ids = changed.get(OrderStatus.SHIPPED, [])
+    if shipped_ids:
+        tracking = {}
+        for order_id, tracking_number, courier in (
+            db.query(Shipment.order_id, Shipment.tracking_number, Shipment.courier)
+            .filter(Shipment.order_id.in_(shipped_ids), Shipment.tracking_number.isnot(None))
+            .order_by(Shipment.id)
+        ):
+            tracking.setdefault(order_id, (tracking_number, courier))
+        for order_id in shipped_ids:
+            if order_id in tracking:
+                send_shipping_notification.delay(order_id, *tracking[order_id])
+    for order_id in changed.get(OrderStatus.DELIVERED, []):
+        send_delivery_complete.delay(order_id)
+
+
 @celery_app.task(name="app.tasks.order_process.update_all_order_statuses")
 def update_all_order_statuses() -> dict:
-    """모든 활성 주문의 상태 업데이트"""
+    """
+    모든 활성 주문의 상태 업데이트
+    - ORDERED/SHIPPED 외부 주문을 id 순 배치(ORDER_STATUS_BATCH_SIZE)로 읽어 공급자별 일괄 조회, 배치당 1 트랜잭션
+    - 주문 상태 집계(PROCESSING → SHIPPED → DELIVERED)는 전환당 UPDATE 1회 (app.services.order_status)
+    """
     db = SessionLocal()
-    updated = 0
+    totals = {"updated": 0, "deferred": 0, "failed": 0}
     
     try:
-        # PROCESSING 또는 SHIPPED 상태의 외부 주문 조회
-        active_external_orders = db.query(ExternalOrder).filter(
-            ExternalOrder.status.in_([
-                ExternalOrderStatus.ORDERED,
-                ExternalOrderStatus.SHIPPED
-            ])
-        ).all()
-        
-        for ext_order in active_external_orders:
-            if not ext_order.external_order_id or not ext_order.supplier:
-                continue
-            
-            connector = get_connector(ext_order.supplier.supplier_type.value)
-            if not connector:
-                continue
-            
-            try:
-                status_data = connector.get_order_status(
-                    api_key=ext_order.supplier.api_key,
-                    api_secret=ext_order.supplier.api_secret,
-                    order_id=ext_order.external_order_id
+        suppliers = {supplier.id: supplier for supplier in db.query(Supplier).all()}
+        last_id = 0
+        while True:
+            rows = (
+                db.query(
+                    ExternalOrder.id,
+                    ExternalOrder.external_order_id,
+                    ExternalOrder.supplier_id,
+                    ExternalOrder.status,
+                    func.coalesce(ExternalOrder.order_id, OrderItem.order_id).label("order_id"),
                 )
-                
-                new_status = status_data.get("status")
-                if new_status == "shipped":
-                    ext_order.status = ExternalOrderStatus.SHIPPED
-                    
-                    # Shipment 생성 (없으면)
-                    if not ext_order.shipments:
-                        shipment_order_id = ext_order.order_id or (
-                            ext_order.order_item.order_id if ext_order.order_item else None
-                        )
-                        if not shipment_order_id:
-                            logger.warning(
-                                f"Skipping shipment create for external order {ext_order.id}: missing order_id"
-                            )
-                            continue
-                        shipment = Shipment(
-                            order_id=shipment_order_id,
-                            external_order_id=ext_order.id,
-                            tracking_number=status_data.get("tracking_number"),
-                            courier=status_data.get("courier"),
-                            status=ShipmentStatus.IN_TRANSIT,
-                            shipped_at=datetime.utcnow()
-                        )
-                        db.add(shipment)
-                        
-                elif new_status == "delivered":
-                    ext_order.status = ExternalOrderStatus.DELIVERED
-                
-                updated += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to update status for external order {ext_order.id}: {e}")
-        
-        db.commit()
-        
-        # 모든 외부 주문이 배송 완료된 주문의 상태 업데이트
-        orders_to_complete = db.query(Order).filter(
-            Order.status == OrderStatus.SHIPPED
-        ).all()
-        
-        for order in orders_to_complete:
-            all_delivered = all(
-                ext.status == ExternalOrderStatus.DELIVERED
-                for ext in order.external_orders
+                .outerjoin(OrderItem, ExternalOrder.order_item_id == OrderItem.id)
+                .filter(
+                    ExternalOrder.status.in_([ExternalOrderStatus.ORDERED, ExternalOrderStatus.SHIPPED]),
+                    ExternalOrder.external_order_id.isnot(None),
+                    ExternalOrder.id > last_id,
+                )
+                .order_by(ExternalOrder.id)
+                .limit(settings.ORDER_STATUS_BATCH_SIZE)
+                .all()
             )
-            if all_delivered and order.external_orders:
-                order.status = OrderStatus.DELIVERED
+            if not rows:
+                break
+            last_id = rows[-1].id
+            for key, count in _poll_status_batch(db, rows, suppliers).items():
+                totals[key] += count
+            db.commit()
         
+        # 외부 주문 상태 → 주문 상태 (발송 시작, 모두 배송 완료)
+        changed = rollup_order_statuses(db)
         db.commit()
+        _notify_order_transitions(db, changed)
         
-        return {"updated_count": updated}
+        return {
+            "updated_count": totals["updated"],
+            "deferred_count": totals["deferred"],
+            "failed_count": totals["failed"],
+            "shipped_orders": changed[OrderStatus.SHIPPED],
+            "delivered_orders": changed[OrderStatus.DELIVERED],
+        }
         
     finally:
         db.close()
@@ -339,70 +423,106 @@ def update_all_order_statuses() -> dict:
 
 @celery_app.task(name="app.tasks.order_process.update_shipment_tracking")
 def update_shipment_tracking() -> dict:
-    """배송 추적 정보 업데이트"""
+    """
+    배송 추적 정보 업데이트 (스케줄러)
+    - 다음 조회 시각(next_poll_at)이 지난 진행 중 배송만 id 순 배치(TRACKING_BATCH_SIZE)로 조회, 배치당 1 트랜잭션
+    - 조회 후 상태/마지막 이벤트 경과 시간으로 다음 조회 시각 재계산 (app.services.shipment_tracking)
+    - 조회 실패는 상태 기본 주기만큼 미룸, 서킷 open은 retry_after만큼
+    - 이벤트는 배치당 INSERT ... ON CONFLICT DO NOTHING 1회, 배송 변경은 변경 컬럼 조합별 executemany UPDATE 1회
+    """
     db = SessionLocal()
-    updated = 0
+    totals = {"updated": 0, "deferred": 0, "failed": 0, "events": 0}
     
     try:
-        # 활성 배송 조회
-        active_shipments = db.query(Shipment).filter(
-            Shipment.status.in_([
-                ShipmentStatus.PICKED_UP,
-                ShipmentStatus.IN_TRANSIT,
-                ShipmentStatus.OUT_FOR_DELIVERY
-            ]),
-            Shipment.tracking_number.isnot(None)
-        ).all()
-        
-        for shipment in active_shipments:
-            ext_order = shipment.external_order
-            if not ext_order or not ext_order.supplier:
-                continue
-            
-            connector = get_connector(ext_order.supplier.supplier_type.value)
-            if not connector:
-                continue
-            
-            try:
-                tracking_data = connector.get_tracking_info(
-                    tracking_number=shipment.tracking_number,
-                    courier=shipment.courier
+        suppliers = {supplier.id: supplier for supplier in db.query(Supplier).all()}
+        due = due_for_poll()
+        last_id = 0
+        while True:
+            rows = (
+                db.query(
+                    Shipment.id,
+                    Shipment.tracking_number,
+                    Shipment.courier,
+                    Shipment.status,
+                    func.coalesce(Shipment.shipped_at, Shipment.created_at).label("started_at"),
+                    ExternalOrder.supplier_id,
                 )
-                
-                # 이벤트 추가
-                events = tracking_data.get("events", [])
-                for event_data in events:
-                    # 중복 체크
-                    existing = db.query(ShipmentEvent).filter(
-                        ShipmentEvent.shipment_id == shipment.id,
-                        ShipmentEvent.event_time == event_data.get("time")
-                    ).first()
-                    
-                    if not existing:
-                        event = ShipmentEvent(
-                            shipment_id=shipment.id,
-                            status=event_data.get("status"),
-                            description=event_data.get("description"),
-                            location=event_data.get("location"),
-                            event_time=event_data.get("time")
-                        )
-                        db.add(event)
-                
-                # 상태 업데이트
-                current_status = tracking_data.get("current_status")
-                if current_status == "delivered":
-                    shipment.status = ShipmentStatus.DELIVERED
-                    shipment.delivered_at = datetime.utcnow()
-                elif current_status == "out_for_delivery":
-                    shipment.status = ShipmentStatus.OUT_FOR_DELIVERY
-                updated += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to update tracking for shipment {shipment.id}: {e}")
-        
-        db.commit()
+                .join(ExternalOrder, Shipment.external_order_id == ExternalOrder.id)
+                .filter(due, Shipment.id > last_id)
+                .order_by(Shipment.id)
+                .limit(settings.TRACKING_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            for key, count in _refresh_tracking_batch(db, rows, suppliers).items():
+                totals[key] += count
+            db.commit()
         
-        return {"updated_count": updated}
+        return {
+            "updated_count": totals["updated"],
+            "deferred_count": totals["deferred"],
+            "failed_count": totals["failed"],
+            "new_events": totals["events"],
+        }
         
     finally:
         db.close()
+
+
+def _refresh_tracking_batch(db: Session, rows: list, suppliers: Dict[int, Supplier]) -> Dict[str, int]:
+    """배송 배치 추적 조회 후 이벤트/상태/다음 조회 시각 일괄 반영 (커밋은 호출자)"""
+    counts = {"updated": 0, "deferred": 0, "failed": 0, "events": 0}
+    targets = [row for row in rows if row.supplier_id in suppliers]
+    outcomes = fan_out_by_supplier(
+        (
+            row.id,
+            suppliers[row.supplier_id],
+            lambda connector, number=row.tracking_number, courier=row.courier: connector.get_tracking_info(
+                tracking_number=number, courier=courier
+            ),
+        )
+        for row in targets
+    )
+    
+    now = datetime.now(timezone.utc)
+    events = []
+    changes: Dict[frozenset, List[dict]] = {}
+    for row in targets:
+        tracking_data = outcomes[row.id]
+        if isinstance(tracking_data, ConnectorCircuitOpenError):
+            # 서킷이 닫힐 때까지 다음 조회 미룸
+            change = {"next_poll_at": now + timedelta(seconds=retry_after_seconds(tracking_data))}
+            counts["deferred"] += 1
+        elif isinstance(tracking_data, BaseException):
+            # 잘못된/만료된 운송장이 스윕마다 조회되지 않도록 상태 기본 주기만큼 미룸
+            # (일시 장애일 수 있으므로 이벤트 경과 시간 배수는 적용하지 않음)
+            logger.error(f"Failed to update tracking for shipment {row.id}: {tracking_data}")
+            change = {"next_poll_at": now + poll_interval(row.status, row.courier, None, now)}
+            counts["failed"] += 1
+        else:
+            row_events = event_rows(row.id, tracking_data.get("events", []))
+            events.extend(row_events)
+            status = ShipmentStatus(row.status)
+            change = {"last_checked_at": now}
+            current_status = tracking_data.get("current_status")
+            if current_status in (ShipmentStatus.DELIVERED, ShipmentStatus.OUT_FOR_DELIVERY):
+                status = change["status"] = ShipmentStatus(current_status)
+                if status == ShipmentStatus.DELIVERED:
+                    change["delivered_at"] = now
+            last_event_at = max((e["event_time"] for e in row_events), key=as_utc, default=row.started_at)
+            change["next_poll_at"] = now + poll_interval(status, row.courier, last_event_at, now)
+            counts["updated"] += 1
+        changes.setdefault(frozenset(change), []).append({"_id": row.id, **{f"v_{c}": v for c, v in change.items()}})
+    
+    counts["events"] = insert_shipment_events(db, events)
+    shipments = Shipment.__table__
+    for columns, params in changes.items():
+        db.execute(
+            update(shipments)
+            .where(shipments.c.id == bindparam("_id"))
+            .values({c: bindparam(f"v_{c}") for c in columns}),
+            params,
+        )
+    return counts
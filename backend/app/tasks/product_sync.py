@@ -2,41 +2,62 @@
 Product Sync Tasks
 상품 동기화 Celery 태스크
 """
-from celery import shared_task
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta, timezone
 import logging
+import time
+from typing import Optional
 
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
-from app.db.models import Supplier, Product, ProductImage, ProductVariant
-from app.connectors import get_connector
+from app.db.models import Supplier, SupplierSyncState, Product
+from app.connectors import get_supplier_connector
+from app.connectors.exceptions import retry_after_seconds
+from app.core.config import settings
+from app.core.cache import CATEGORIES_TAG, FACETS_TAG, catalog_change_tags, invalidate_tags_sync
+from app.services.facets import refresh_facet_counts
+from app.services.product_upsert import chunked, deactivate_missing, normalize_product, upsert_chunk
 
 logger = logging.getLogger(__name__)
 
+SYNC_MODES = ("full", "delta")
+
 
 @celery_app.task(bind=True, name="app.tasks.product_sync.sync_supplier_products")
-def sync_supplier_products(self, supplier_id: int, limit: int = 100) -> dict:
+def sync_supplier_products(self, supplier_id: int, limit: Optional[int] = None, mode: str = "full") -> dict:
     """
     특정 공급자의 상품 동기화
     
     Args:
         supplier_id: 공급자 ID
-        limit: 동기화할 최대 상품 수
+        limit: 동기화할 최대 상품 수 (None이면 공급처 카탈로그 전체).
+            지정하면 부분 동기화: 워터마크를 올리지 않고 사라진 상품도 비활성화하지 않음
+        mode: full(전체 카탈로그 + 사라진 상품 비활성화) 또는
+            delta(워터마크 이후 변경분만, since 필터를 지원하는 커넥터만. 워터마크가 없으면 full)
     
     Returns:
-        동기화 결과 (신규, 업데이트, 실패 수)
+        동기화 결과 (신규, 변경, 변경 없음, 재활성화, 비활성화, 파싱 불가(invalid), 저장 실패(failed) 수, rows_per_sec)
+        파싱 불가 상품은 건너뛰고 진행 (external_id는 invalid_ids, 워터마크/비활성화를 막지 않음)
     """
+    if mode not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode: {mode}")
     db = SessionLocal()
+    run_started_at = datetime.now(timezone.utc)
     result = {
         "supplier_id": supplier_id,
+        "mode": mode,
         "limit": limit,
         "created": 0,
-        "updated": 0,
+        "changed": 0,
+        "unchanged": 0,
+        "restored": 0,
+        "removed": 0,
+        "invalid": 0,
+        "invalid_ids": [],
         "failed": 0,
         "errors": []
     }
+    touched_categories = set()  # facet 재집계 대상 (변경 전/후 카테고리)
+    touched_products = set()  # 응답 캐시 무효화 대상
     
     try:
         supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
@@ -48,113 +69,132 @@ def sync_supplier_products(self, supplier_id: int, limit: int = 100) -> dict:
             return result
         
         # 커넥터 가져오기
-        connector = get_connector(supplier.supplier_type.value)
+        connector = get_supplier_connector(supplier)
         if not connector:
             raise ValueError(f"No connector for {supplier.supplier_type}")
         
-        # 상품 목록 가져오기
-        logger.info(f"Fetching products from {supplier.name}...")
-        products_data = connector.fetch_products(
-            api_key=supplier.api_key,
-            api_secret=supplier.api_secret,
-            config=supplier.config or {},
-            limit=limit,
+        state = db.get(SupplierSyncState, supplier_id) or SupplierSyncState(supplier_id=supplier_id)
+        since = None
+        if mode == "delta":
+            if not connector.SUPPORTS_SINCE:
+                # 변경분 조회가 없는 공급처는 전체 동기화(beat)로만 갱신
+                result["skipped"] = "delta sync not supported by connector"
+                return result
+            if state.watermark is None:
+                mode = result["mode"] = "full"
+            else:
+                since = _as_utc(state.watermark) - timedelta(seconds=settings.SYNC_DELTA_OVERLAP_SECONDS)
+                result["since"] = since.isoformat()
+        # 카탈로그 전체를 본 full 동기화만 사라진 상품을 판단할 수 있음
+        seen_external_ids = set() if mode == "full" and limit is None else None
+        
+        # 상품 목록: 페이지 단위로 받아 청크로 소비 (메모리는 페이지 + 청크 크기로 제한)
+        logger.info(f"Fetching products from {supplier.name} ({mode}, since={since})...")
+        config = supplier.config or {}
+        products_data = connector.iter_products(
+            supplier.api_key,
+            supplier.api_secret,
+            config,
+            since=since,
+            page_size=settings.SYNC_PAGE_SIZE or connector.MAX_PAGE_SIZE,
+            max_items=limit,
         )
         
-        for product_data in products_data:
-            try:
-                external_id = product_data.get("external_id") or product_data.get("id")
-                if not external_id:
+        exchange_rate = config.get("exchange_rate", 1350)
+        margin_percent = config.get("margin_percent", 30)
+        started = time.perf_counter()
+        processed = 0
+        
+        for chunk in chunked(products_data, settings.SYNC_CHUNK_SIZE):
+            synced_at = datetime.utcnow()
+            items = []
+            for product_data in chunk:
+                # 파싱 오류는 해당 상품만 건너뜀 (DB 왕복 없음). 공급처 데이터 문제라 재시도해도 같으므로
+                # 워터마크/비활성화를 막지 않음. 공급처에는 있는 상품이므로 사라진 상품으로 보지 않음
+                try:
+                    item = normalize_product(product_data, supplier_id, exchange_rate, margin_percent, synced_at)
+                except (TypeError, ValueError) as e:
+                    external_id = product_data.get("external_id") or product_data.get("id")
+                    logger.error(f"Error parsing product {external_id}: {e}")
+                    result["invalid"] += 1
+                    if external_id:
+                        result["invalid_ids"].append(str(external_id))
+                        if seen_external_ids is not None:
+                            seen_external_ids.add(str(external_id))
+                    result["errors"].append(f"{external_id}: {e}")
                     continue
-                
-                external_id = str(external_id)
-                
-                # 기존 상품 찾기
-                existing = db.query(Product).filter(
-                    Product.supplier_id == supplier_id,
-                    Product.external_id == external_id
-                ).first()
-                
-                # 가격 계산 (마진 적용)
-                price_usd = float(product_data.get("price", 0))
-                exchange_rate = supplier.config.get("exchange_rate", 1350)
-                margin_percent = supplier.config.get("margin_percent", 30)
-                price_krw = int(price_usd * exchange_rate * (1 + margin_percent / 100))
-                
-                if existing:
-                    existing.name = product_data.get("title", product_data.get("name", existing.name))
-                    existing.name_ko = product_data.get("title_ko", product_data.get("name_ko", existing.name_ko))
-                    existing.description = product_data.get("description", existing.description)
-                    existing.description_ko = product_data.get("description_ko", existing.description_ko)
-                    existing.original_price = price_usd
-                    existing.selling_price = price_krw
-                    existing.stock = product_data.get("stock", 0)
-                    existing.synced_at = datetime.utcnow()
-                    result["updated"] += 1
-                else:
-                    new_product = Product(
-                        supplier_id=supplier_id,
-                        external_id=external_id,
-                        name=product_data.get("title", product_data.get("name", "Unknown")),
-                        name_ko=product_data.get("title_ko", product_data.get("name_ko")),
-                        description=product_data.get("description"),
-                        description_ko=product_data.get("description_ko"),
-                        original_price=price_usd,
-                        selling_price=price_krw,
-                        currency="KRW",
-                        stock=product_data.get("stock", 0),
-                        category=product_data.get("category"),
-                        external_url=product_data.get("url"),
-                        synced_at=datetime.utcnow()
-                    )
-                    db.add(new_product)
-                    db.flush()
-                    images = product_data.get("images", [])
-                    for i, img_url in enumerate(images):
-                        img = ProductImage(
-                            product_id=new_product.id,
-                            url=img_url,
-                            is_primary=(i == 0),
-                            sort_order=i
-                        )
-                        db.add(img)
-                    
-                    # 옵션 추가
-                    variants = product_data.get("variants", [])
-                    for var_data in variants:
-                        variant = ProductVariant(
-                            product_id=new_product.id,
-                            external_variant_id=str(var_data.get("id", "")),
-                            name=var_data.get("name"),
-                            sku=var_data.get("sku"),
-                            price_krw=int(float(var_data.get("price", 0)) * exchange_rate * (1 + margin_percent / 100)),
-                            stock=var_data.get("stock", 0)
-                        )
-                        db.add(variant)
-                    
-                    result["created"] += 1
-                
+                if item:
+                    items.append(item)
+                    if seen_external_ids is not None:
+                        seen_external_ids.add(item["row"]["external_id"])
+            
+            # 청크 단위 트랜잭션: 실패 시 이 청크만 롤백하고 다음 청크 계속
+            try:
+                chunk_result = upsert_chunk(db, supplier_id, items)
                 db.commit()
-                
             except Exception as e:
-                logger.error(f"Error processing product {product_data}: {e}")
-                result["failed"] += 1
-                result["errors"].append(str(e))
                 db.rollback()
+                logger.error(f"Error upserting chunk of {len(items)} products for supplier {supplier_id}: {e}")
+                result["failed"] += len(items)
+                result["errors"].append(str(e))
+                continue
+            processed += len(items)
+            result["created"] += chunk_result.created
+            result["changed"] += chunk_result.changed
+            result["unchanged"] += chunk_result.unchanged
+            result["restored"] += chunk_result.restored
+            touched_products |= chunk_result.product_ids
+            touched_categories |= chunk_result.categories
+        
+        elapsed = time.perf_counter() - started
+        result["elapsed_sec"] = round(elapsed, 3)
+        result["rows_per_sec"] = round(processed / elapsed, 1) if elapsed > 0 else None
+        
+        # 끝까지 받고 저장 실패가 없는 경우만: 사라진 상품 비활성화 + 워터마크 전진 (파싱 불가 상품은 무관)
+        completed = limit is None and result["failed"] == 0
+        if completed and seen_external_ids is not None:
+            removal = deactivate_missing(
+                db, supplier_id, seen_external_ids, run_started_at, settings.SYNC_MAX_REMOVAL_RATIO
+            )
+            if removal is None:
+                logger.warning(
+                    f"Supplier {supplier.name}: too many products missing from full sync, deactivation skipped"
+                )
+                result["removal_skipped"] = True
+            else:
+                result["removed"] = removal.removed
+                touched_products |= removal.product_ids
+                touched_categories |= removal.categories
+        if completed:
+            state.watermark = run_started_at
+            if mode == "full":
+                state.last_full_sync_at = run_started_at
+        state.last_result = {
+            **result, "errors": result["errors"][:10], "invalid_ids": result["invalid_ids"][:100],
+        }
+        db.add(state)
+        result.update(_publish_catalog_changes(db, touched_products, touched_categories))
         
         logger.info(f"Sync completed for {supplier.name}: {result}")
         return result
         
     except Exception as e:
         logger.error(f"Sync failed for supplier {supplier_id}: {e}")
-        raise self.retry(exc=e)
+        # 이미 커밋된 청크의 변경은 재시도에서 content_hash상 '변경 없음'이 되므로 지금 facet/캐시에 반영
+        db.rollback()
+        try:
+            _publish_catalog_changes(db, touched_products, touched_categories)
+        except Exception as publish_error:
+            db.rollback()
+            logger.error(f"Failed to publish partial sync changes for supplier {supplier_id}: {publish_error}")
+        raise self.retry(exc=e, countdown=retry_after_seconds(e))
     finally:
         db.close()
 
 
 @celery_app.task(name="app.tasks.product_sync.sync_all_suppliers")
-def sync_all_suppliers() -> dict:
-    """모든 활성 공급자의 상품 동기화"""
+def sync_all_suppliers(mode: str = "full") -> dict:
+    """모든 활성 공급자의 상품 동기화 (beat: delta 자주, full 드물게)"""
     db = SessionLocal()
     results = []
     
@@ -163,7 +203,7 @@ def sync_all_suppliers() -> dict:
         
         for supplier in suppliers:
             # 각 공급자별로 별도 태스크 실행
-            task = sync_supplier_products.delay(supplier.id)
+            task = sync_supplier_products.delay(supplier.id, mode=mode)
             results.append({
                 "supplier_id": supplier.id,
                 "supplier_name": supplier.name,
@@ -171,6 +211,7 @@ def sync_all_suppliers() -> dict:
             })
         
         return {
+            "mode": mode,
             "total_suppliers": len(suppliers),
             "tasks": results
         }
@@ -178,6 +219,35 @@ def sync_all_suppliers() -> dict:
         db.close()
 
 
+def _publish_catalog_changes(db, product_ids: set, categories: set) -> dict:
+    """커밋된 상품 변경 반영: facet 재집계(세션의 다른 변경과 함께 커밋) 후 응답 캐시 태그 무효화"""
+    published = {}
+    if categories:
+        published["facet_rows"] = refresh_facet_counts(db, categories)
+    db.commit()
+    if categories:
+        published["cache_invalidated"] = invalidate_tags_sync(catalog_change_tags(product_ids, categories))
+    return published
+
+
+def _as_utc(value: datetime) -> datetime:
+    """timezone 없는 값(SQLite 등)은 UTC로 간주."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@celery_app.task(name="app.tasks.product_sync.rebuild_product_facets")
+def rebuild_product_facets() -> dict:
+    """facet 집계 전체 재계산 (sync 외 경로의 상품 변경 보정)"""
+    db = SessionLocal()
+    try:
+        rows = refresh_facet_counts(db)
+        db.commit()
+        invalidate_tags_sync([FACETS_TAG, CATEGORIES_TAG])
+        return {"facet_rows": rows}
+    finally:
+        db.close()
+
+
 @celery_app.task(name="app.tasks.product_sync.translate_product")
 def translate_product(product_id: int) -> dict:
     """상품 번역 (한글)"""
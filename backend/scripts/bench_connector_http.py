@@ -0,0 +1,109 @@
+"""
+커넥터 HTTP 벤치마크: 요청마다 새 httpx.Client vs 프로세스 재사용 클라이언트 (app.connectors.http)
+사용법: backend 디렉터리에서
+  python -m scripts.bench_connector_http                      # 로컬 stub 서버, 200회
+  python -m scripts.bench_connector_http --requests 500 --connect-delay-ms 30
+stub 서버는 127.0.0.1의 HTTP/1.1 keep-alive 서버. 새 연결마다 --connect-delay-ms만큼 지연해
+공급처까지의 TCP+TLS 핸드셰이크(수십 ms)를 흉내냄 (0이면 순수 로컬 TCP 비용만 측정).
+TemuConnector._request 경로(서명 헤더 + 재시도 루프 포함)로 Temu 상품 목록 응답을 받아 측정.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.connectors import http as connector_http
+from app.connectors.temu import TemuConnector
+
+BODY = json.dumps({"products": [], "next_cursor": None}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # 헤더/본문 분할 쓰기의 Nagle + delayed ACK 지연(~40ms) 제거
+    connect_delay = 0.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+        time.sleep(self.connect_delay)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PerRequestClientTemu(TemuConnector):
+    """기존 동작: 요청마다 httpx.Client 생성/종료."""
+
+    def _http(self):
+        return _OneShotClient(self.TIMEOUT_SECONDS)
+
+
+class _OneShotClient:
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def request(self, **kwargs):
+        with httpx.Client(timeout=self.timeout) as client:
+            return client.request(**kwargs)
+
+
+def _timed(connector, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connector._request("GET", "/v1/products", api_key="bench", api_secret="bench", params={"limit": 100})
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _summary(label: str, samples: list, connections: int) -> str:
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    return (
+        f"{label:<22} {statistics.median(samples):>9.2f} {p95:>9.2f} "
+        f"{sum(samples) / 1000:>9.2f} {connections:>12}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--connect-delay-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    StubHandler.connect_delay = args.connect_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{'client':<22} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9} {'connections':>12}")
+    try:
+        for label, cls in (("new client / request", PerRequestClientTemu), ("pooled (keep-alive)", TemuConnector)):
+            connector = cls({"http": {"http2": False}})  # stub은 HTTP/1.1 (h2c 미지원)
+            connector.BASE_URL = base_url
+            StubHandler.connections = 0
+            samples = _timed(connector, args.requests)
+            print(_summary(label, samples, StubHandler.connections))
+    finally:
+        connector_http.close_clients()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
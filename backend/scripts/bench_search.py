@@ -0,0 +1,123 @@
+"""
+상품 검색 벤치마크: 기존 ILIKE '%term%' vs search_text + pg_trgm (004)
+사용법: backend 디렉터리에서 (PostgreSQL, alembic upgrade head 후)
+  python -m scripts.bench_search                # 100만 건 생성(없으면) 후 측정
+  python -m scripts.bench_search --rows 200000 --repeat 10
+  python -m scripts.bench_search --cleanup      # 벤치 데이터 삭제
+벤치 상품은 code='bench_search' 공급자의 활성 상품으로 생성되어 목록에 노출되므로 운영 DB에서 실행 금지.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text
+
+from app.db.session import engine
+from app.db.models import Product
+from app.services.search import normalize_query, search_filter, search_rank
+
+BENCH_SUPPLIER_CODE = "bench_search"
+TERMS = ["무선 이어폰", "nike", "가죽 지갑", "bluetooth speaker", "스테인리스", "kitchen"]
+
+# 단어 조합으로 상품명 생성 (generate_series 한 번으로 삽입)
+GENERATE_SQL = """
+INSERT INTO products (supplier_id, external_id, name, name_ko, brand, category,
+                      original_price, selling_price, currency, stock, is_active)
+SELECT :supplier_id,
+       'bench-' || g,
+       (ARRAY['wireless','leather','bluetooth','stainless','cotton','smart','mini','portable'])[1 + g % 8]
+         || ' ' || (ARRAY['earphone','wallet','speaker','bottle','shirt','watch','lamp','kitchen tool'])[1 + (g / 8) % 8]
+         || ' ' || g,
+       (ARRAY['무선','가죽','블루투스','스테인리스','면','스마트','미니','휴대용'])[1 + g % 8]
+         || ' ' || (ARRAY['이어폰','지갑','스피커','텀블러','셔츠','시계','조명','주방용품'])[1 + (g / 8) % 8],
+       (ARRAY['nike','adidas','xiaomi','anker','muji','lg','samsung',NULL])[1 + (g / 64) % 8],
+       (ARRAY['digital','fashion','home','kitchen','sports'])[1 + g % 5],
+       10 + g % 90, 10000 + (g % 900) * 100, 'KRW', 10, true
+FROM generate_series(:start, :stop) AS g
+"""
+
+
+def _supplier_id(conn) -> int:
+    supplier_id = conn.scalar(text("SELECT id FROM suppliers WHERE code = :code"), {"code": BENCH_SUPPLIER_CODE})
+    if supplier_id is None:
+        supplier_id = conn.scalar(
+            text(
+                "INSERT INTO suppliers (name, code, connector_type, is_active) "
+                "VALUES ('Bench', :code, 'temu', false) RETURNING id"
+            ),
+            {"code": BENCH_SUPPLIER_CODE},
+        )
+    return supplier_id
+
+
+def ensure_fixture(rows: int) -> None:
+    with engine.begin() as conn:
+        supplier_id = _supplier_id(conn)
+        existing = conn.scalar(select(func.count()).where(Product.supplier_id == supplier_id))
+        if existing >= rows:
+            print(f"fixture: {existing:,} rows (재사용)")
+            return
+        started = time.perf_counter()
+        batch = 100_000
+        for start in range(existing + 1, rows + 1, batch):
+            conn.execute(
+                text(GENERATE_SQL),
+                {"supplier_id": supplier_id, "start": start, "stop": min(start + batch - 1, rows)},
+            )
+        conn.execute(text("ANALYZE products"))
+        print(f"fixture: {rows - existing:,} rows 생성 ({time.perf_counter() - started:.1f}s)")
+
+
+def cleanup() -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM suppliers WHERE code = :code"), {"code": BENCH_SUPPLIER_CODE}
+        )  # products는 ON DELETE CASCADE
+    print("bench 데이터 삭제 완료")
+
+
+def _timed(conn, query, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(query).all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(repeat: int) -> None:
+    print(f"{'term':<20} {'ilike ms':>10} {'trgm ms':>10}")
+    with engine.connect() as conn:
+        for raw in TERMS:
+            term = normalize_query(raw)
+            base = select(Product.id).where(Product.is_active == True)
+            old = base.where(Product.name_ko.ilike(f"%{raw}%") | Product.name.ilike(f"%{raw}%")).limit(20)
+            new = (
+                base.where(search_filter(term, "postgresql"))
+                .order_by(search_rank(term, "postgresql").desc())
+                .limit(20)
+            )
+            print(f"{raw:<20} {_timed(conn, old, repeat):>10.1f} {_timed(conn, new, repeat):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+    if engine.dialect.name != "postgresql":
+        sys.exit("PostgreSQL(DATABASE_URL)에서만 실행할 수 있습니다.")
+    if args.cleanup:
+        cleanup()
+        return
+    ensure_fixture(args.rows)
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
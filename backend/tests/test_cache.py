@@ -0,0 +1,172 @@
+"""응답 캐시 (app.core.cache) 검증. Redis 대신 필요한 명령만 구현한 메모리 fake 사용."""
+import pytest
+import redis
+
+from app.core.cache import ResponseCache, catalog_change_tags, response_cache
+from app.core.config import settings
+from tests.test_products import _seed_products
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def register_script(self, source):
+        script = FakeStoreScript(self)
+        script.registered_client = self
+        return script
+
+
+class FakeStoreScript:
+    """_STORE_IF_CURRENT와 같은 동작: 세대가 그대로일 때만 SET + SADD"""
+
+    def __init__(self, redis_):
+        self.redis = redis_
+
+    async def __call__(self, keys, args):
+        n = int(args[1])
+        key, gen_keys, tag_keys = keys[0], keys[1:1 + n], keys[1 + n:]
+        if [str(self.redis.data.get(g, 0)) for g in gen_keys] != list(args[3:]):
+            return 0
+        self.redis.data[key] = args[2]
+        for tag_key in tag_keys:
+            self.redis.data.setdefault(tag_key, set()).add(key)
+        return 1
+
+
+class FakePipeline:
+    def __init__(self, redis_):
+        self.redis = redis_
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append(lambda: self.redis.data.get(key))
+
+    def incr(self, key):
+        def call():
+            self.redis.data[key] = self.redis.data.get(key, 0) + 1
+            return self.redis.data[key]
+        self.calls.append(call)
+
+    def expire(self, key, seconds):
+        self.calls.append(lambda: None)
+
+    def smembers(self, key):
+        self.calls.append(lambda: set(self.redis.data.get(key, set())))
+
+    def delete(self, *keys):
+        self.calls.append(lambda: [self.redis.data.pop(key, None) for key in keys])
+
+    def srem(self, key, *members):
+        self.calls.append(lambda: self.redis.data.get(key, set()).difference_update(members))
+
+    async def execute(self):
+        return [call() for call in self.calls]
+
+
+@pytest.fixture
+def fake_redis(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "client", FakeRedis())
+    monkeypatch.setattr(response_cache, "_down_until", 0.0)
+    return response_cache.client
+
+
+@pytest.mark.asyncio
+async def test_listing_is_served_from_cache_until_invalidated(async_client, db_session_factory, fake_redis):
+    ids = await _seed_products(db_session_factory, count=2)
+    first = await async_client.get("/api/products/", params={"limit": 5})
+    assert first.headers["X-Cache"] == "MISS"
+    second = await async_client.get("/api/products/", params={"limit": 5})
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+
+    # 다른 파라미터는 별도 키
+    other = await async_client.get("/api/products/", params={"limit": 1})
+    assert other.headers["X-Cache"] == "MISS"
+
+    detail = await async_client.get(f"/api/products/{ids[0]}")
+    assert detail.headers["X-Cache"] == "MISS"
+    assert (await async_client.get(f"/api/products/{ids[0]}")).headers["X-Cache"] == "HIT"
+
+    await response_cache.invalidate(catalog_change_tags([ids[0]], ["fashion"]))
+    assert (await async_client.get("/api/products/", params={"limit": 5})).headers["X-Cache"] == "MISS"
+    assert (await async_client.get(f"/api/products/{ids[0]}")).headers["X-Cache"] == "MISS"
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_cached(async_client, fake_redis):
+    assert (await async_client.get("/api/products/999")).status_code == 404
+    assert not any(key.startswith("resp:") for key in fake_redis.data)
+
+
+@pytest.mark.asyncio
+async def test_response_built_before_invalidation_is_not_stored(fake_redis):
+    cache = ResponseCache()
+    cache.client = fake_redis
+
+    async def build():
+        # build()가 DB를 읽은 뒤 sync가 커밋 + 무효화
+        await cache.invalidate(["product-list"])
+        return {"version": "before-sync"}
+
+    first = await cache.respond("products", {"page": 1}, ["product-list"], build, dict)
+    assert first.headers["X-Cache"] == "MISS"
+    assert not any(key.startswith("resp:") for key in fake_redis.data)
+    assert cache.stats.stale_skipped == 1
+
+    async def build_after():
+        return {"version": "after-sync"}
+
+    await cache.respond("products", {"page": 1}, ["product-list"], build_after, dict)
+    cached = await cache.respond("products", {"page": 1}, ["product-list"], build, dict)
+    assert cached.headers["X-Cache"] == "HIT"
+    assert cached.body == b'{"version":"after-sync"}'
+
+
+@pytest.mark.asyncio
+async def test_invalidation_keeps_keys_registered_meanwhile(fake_redis, monkeypatch):
+    """무효화는 읽은 멤버만 SREM하므로 SMEMBERS 이후 등록된 키는 다음 무효화 대상으로 남음"""
+    fake_redis.data.update({"tag:product-list": {"resp:a"}, "resp:a": b"a"})
+    execute = FakePipeline.execute
+    registered = []
+
+    async def execute_then_register(self):
+        results = await execute(self)
+        if not registered:  # 첫 SMEMBERS 직후 다른 요청이 등록
+            registered.append("resp:b")
+            self.redis.data["resp:b"] = b"b"
+            self.redis.data["tag:product-list"].add("resp:b")
+        return results
+
+    monkeypatch.setattr(FakePipeline, "execute", execute_then_register)
+    await response_cache.invalidate(["product-list"])
+    assert "resp:a" not in fake_redis.data
+    assert fake_redis.data["tag:product-list"] == {"resp:b"}
+
+    await response_cache.invalidate(["product-list"])
+    assert "resp:b" not in fake_redis.data
+
+
+@pytest.mark.asyncio
+async def test_cache_backs_off_when_redis_is_down(monkeypatch):
+    class DownRedis:
+        calls = 0
+
+        async def get(self, key):
+            DownRedis.calls += 1
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    cache = ResponseCache()
+    cache.client = DownRedis()
+    assert await cache.get("k") is None
+    assert await cache.get("k") is None  # 재시도 대기 중에는 Redis를 호출하지 않음
+    assert DownRedis.calls == 1
+    assert cache.stats.as_dict()["errors"] == 1
@@ -0,0 +1,493 @@
+"""커넥터 페이지네이션, HTTP 클라이언트 재사용(비동기 fan-out 포함), 커넥터 레지스트리/토큰 캐시, 호출 제한, 서킷 브레이커 검증."""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import redis
+
+from app.connectors import (
+    clear_connector_registry, close_async_connectors, fan_out_by_supplier, get_supplier_connector,
+)
+from app.connectors import amazon as amazon_module
+from app.connectors import circuit
+from app.connectors import http as connector_http
+from app.connectors import ratelimit
+from app.connectors.aliexpress import AliExpressConnector
+from app.connectors.amazon import AmazonConnector, AsyncAmazonConnector
+from app.connectors.base import BaseConnector, ProductPage
+from app.connectors.exceptions import (
+    ConnectorAPIError,
+    ConnectorAuthError,
+    ConnectorCircuitOpenError,
+    ConnectorRateLimitError,
+    ConnectorResponseError,
+    ConnectorTimeoutError,
+    retry_after_seconds,
+)
+from app.connectors.temu import AsyncTemuConnector, TemuConnector
+from app.connectors.tokens import TokenCache, token_key
+
+
+class _PagedConnector(BaseConnector):
+    """고정 페이지 목록을 돌려주는 커넥터 (요청 기록)."""
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.calls = []
+
+    def fetch_product_page(self, api_key=None, api_secret=None, config=None, *, cursor=None, page_size=100, since=None, category=None):
+        self.calls.append({"cursor": cursor, "page_size": page_size, "since": since})
+        return self.pages[int(cursor or 0)]
+
+    def get_product(self, api_key, api_secret, external_id):
+        return None
+
+    def place_order(self, api_key, api_secret, order_data):
+        return {}
+
+    def get_order_status(self, api_key, api_secret, order_id):
+        return {}
+
+
+@pytest.mark.parametrize(
+    "connector, prefix",
+    [(TemuConnector(), "temu-test"), (AliExpressConnector(), "ali-test"), (AmazonConnector(), "amz-test")],
+)
+def test_iter_products_follows_cursor_in_test_mode(connector, prefix):
+    config = {"test_mode": True, "test_catalog_size": 12}
+    items = list(connector.iter_products(config=config, page_size=5))
+    assert [p["external_id"] for p in items] == [f"{prefix}-{i}" for i in range(12)]
+
+
+def test_iter_products_is_lazy_and_stops_at_max_items():
+    connector = _PagedConnector([
+        ProductPage([{"external_id": "a"}, {"external_id": "b"}], "1"),
+        ProductPage([{"external_id": "c"}, {"external_id": "d"}], "2"),
+        ProductPage([{"external_id": "e"}], None),
+    ])
+    iterator = connector.iter_products(max_items=3)
+    assert connector.calls == []  # 첫 next() 전에는 요청하지 않음
+    assert [p["external_id"] for p in iterator] == ["a", "b", "c"]
+    assert [c["cursor"] for c in connector.calls] == [None, "1"]
+
+
+def test_iter_products_clamps_page_size_and_passes_since():
+    connector = _PagedConnector([ProductPage([{"external_id": "a"}], None)])
+    list(connector.iter_products(page_size=1000, since="2026-01-01"))
+    assert connector.calls == [{"cursor": None, "page_size": BaseConnector.MAX_PAGE_SIZE, "since": "2026-01-01"}]
+
+
+def test_fetch_products_keeps_list_interface():
+    products = AmazonConnector().fetch_products(config={"test_mode": True, "test_catalog_size": 50}, limit=30)
+    assert len(products) == 30  # Amazon 페이지 최대 20 → 2페이지
+
+
+def test_http_client_is_reused_per_connector_and_settings(monkeypatch):
+    monkeypatch.setattr(connector_http, "_clients", {})
+    temu = TemuConnector()
+    assert temu._http() is TemuConnector()._http()
+    assert temu._http() is not AmazonConnector()._http()
+    tuned = TemuConnector({"http": {"max_connections": 5, "http2": False}})
+    assert tuned._http() is not temu._http()
+    assert tuned._http()._transport._pool._max_connections == 5
+
+    assert connector_http.close_clients() == 3
+    assert temu._http() is not None and not temu._http().is_closed  # 닫힌 뒤 다시 생성
+    connector_http.close_clients()
+
+
+def test_http_clients_are_dropped_after_fork(monkeypatch):
+    monkeypatch.setattr(connector_http, "_clients", {})
+    parent = TemuConnector()._http()
+    monkeypatch.setattr(connector_http, "_pid", -1)  # fork된 자식 프로세스 흉내
+    child = TemuConnector()._http()
+    assert child is not parent and not parent.is_closed
+    connector_http.close_clients()
+    parent.close()
+
+
+class FakeSyncRedis:
+    """TokenCache가 쓰는 명령만 구현 (스레드 안전)."""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def eval(self, script, numkeys, key, value):
+        with self.lock:
+            if self.data.get(key) == value:
+                del self.data[key]
+
+
+def test_supplier_connector_is_reused_until_config_changes():
+    clear_connector_registry()
+    supplier = SimpleNamespace(id=1, connector_type="amazon", config={"refresh_token": "r1"})
+    first = get_supplier_connector(supplier)
+    assert get_supplier_connector(supplier) is first
+    supplier.config = {"refresh_token": "r2"}
+    second = get_supplier_connector(supplier)
+    assert second is not first and second.config["refresh_token"] == "r2"
+    assert get_supplier_connector(SimpleNamespace(id=2, connector_type="unknown", config=None)) is None
+    clear_connector_registry()
+
+
+def test_token_refresh_is_single_flight_across_workers():
+    shared = FakeSyncRedis()
+    workers = [TokenCache(lambda: shared) for _ in range(10)]  # 워커 프로세스 10개
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        time.sleep(0.1)
+        return "token-1", 3600
+
+    key = token_key("amazon", "client", "refresh")
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda c=cache: tokens.append(c.get(key, refresh)))
+        for cache in workers for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert tokens == ["token-1"] * 50
+    assert not any(k.endswith(":lock") for k in shared.data)
+
+
+def test_token_cache_refreshes_before_expiry_and_after_invalidate():
+    shared = FakeSyncRedis()
+    cache = TokenCache(lambda: shared)
+    issued = iter(["short", "long", "renewed"])
+    refresh = lambda: (next(issued), 30 if cache.refreshes == 1 else 3600)
+    key = token_key("amazon", "client", "refresh")
+
+    assert cache.get(key, refresh) == "short"  # 만료 여유(60초)보다 짧게 남은 토큰
+    assert cache.get(key, refresh) == "long"
+    assert cache.get(key, refresh) == "long"
+    cache.invalidate(key)
+    assert cache.get(key, refresh) == "renewed"
+    assert cache.refreshes == 3
+
+
+def test_token_cache_falls_back_to_local_refresh_when_redis_is_down():
+    def down():
+        raise redis.ConnectionError("down")
+
+    cache = TokenCache(down)
+    key = token_key("amazon", "client", "refresh")
+    assert cache.get(key, lambda: ("local", 3600)) == "local"
+    assert cache.get(key, lambda: ("again", 3600)) == "local"
+
+
+def _mock_async(connector, handler):
+    connector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return connector
+
+
+@pytest.mark.asyncio
+async def test_async_fan_out_is_bounded_and_keeps_order():
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        order_id = request.url.path.rsplit("/", 1)[-1]
+        if order_id == "7":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"status": f"shipped-{order_id}"})
+
+    async with _mock_async(AsyncTemuConnector(), handler) as connector:
+        results = await connector.fan_out(
+            [lambda i=i: connector.get_order_status("key", "secret", str(i)) for i in range(20)],
+            concurrency=5,
+        )
+    assert peak == 5
+    assert [r["status"] for i, r in enumerate(results) if i != 7] == [f"shipped-{i}" for i in range(20) if i != 7]
+    assert results[7].status_code == 404  # 실패는 예외 객체로, 나머지는 계속
+
+
+@pytest.mark.asyncio
+async def test_async_connector_retries_upstream_errors(monkeypatch):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"products": [{"product_id": 1}]})])
+    connector = _mock_async(AsyncTemuConnector(), lambda request: next(responses))
+    monkeypatch.setattr(connector, "_backoff", lambda attempt: 0)
+    async with connector:
+        page = await connector.fetch_product_page("key", "secret")
+    assert [p["external_id"] for p in page.items] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_async_amazon_refreshes_token_after_401(monkeypatch):
+    cache = TokenCache(lambda: FakeSyncRedis())
+    monkeypatch.setattr(amazon_module, "token_cache", cache)
+    tokens = iter(["expired", "fresh"])
+    monkeypatch.setattr(AsyncAmazonConnector, "_refresh_access_token", lambda self, k, s: (next(tokens), 3600))
+
+    def handler(request):
+        if request.headers["x-amz-access-token"] == "expired":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"payload": {"OrderStatus": "Shipped"}})
+
+    async with _mock_async(AsyncAmazonConnector({"refresh_token": "r"}), handler) as connector:
+        status = await connector.get_order_status("client", "secret", "A-1")
+    assert status["status"] == "Shipped" and cache.refreshes == 2
+
+
+def test_sync_connector_shares_response_handling(monkeypatch):
+    connector = TemuConnector()
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(401)))
+    monkeypatch.setattr(connector, "_http", lambda: client)
+    with pytest.raises(ConnectorAuthError):
+        connector.get_order_status("key", "secret", "1")
+
+
+def test_fan_out_by_supplier_from_sync_code():
+    temu = SimpleNamespace(id=1, connector_type="temu", config={"test_mode": True})
+    unknown = SimpleNamespace(id=2, connector_type="unknown", config=None)
+    outcomes = fan_out_by_supplier(
+        [("a", temu, lambda c: c.get_tracking_info("T1")), ("b", unknown, lambda c: c.get_tracking_info("T2"))]
+    )
+    assert outcomes["a"]["current_status"] == "in_transit" and len(outcomes["a"]["events"]) == 2
+    assert isinstance(outcomes["b"], ValueError)
+
+
+def test_fan_out_by_supplier_reuses_async_client_per_supplier():
+    supplier = SimpleNamespace(id=101, connector_type="temu", config={"test_mode": True})
+    http_clients = lambda: fan_out_by_supplier([("c", supplier, lambda c: _async_value(c._http()))])["c"]
+    try:
+        first, second = http_clients(), http_clients()
+        # 워커 루프에서 같은 커넥터(AsyncClient, keep-alive 풀) 재사용
+        assert first is second and not first.is_closed
+        supplier.config = {"test_mode": True, "http": {"max_connections": 5}}
+        third = http_clients()
+        assert third is not first and first.is_closed  # 설정이 바뀌면 이전 클라이언트를 닫고 새로 생성
+    finally:
+        assert close_async_connectors() >= 1
+    assert third.is_closed
+
+
+async def _async_value(value):
+    return value
+
+
+class _RecordingLimiter:
+    """RateLimiter 대역: acquire마다 waits를 차례로 반환 (없으면 즉시 획득)."""
+
+    def __init__(self, waits=()):
+        self.waits = list(waits)
+        self.acquired = []
+        self.blocked = []
+
+    def acquire(self, bucket, rate, burst):
+        self.acquired.append((bucket, rate, burst))
+        return self.waits.pop(0) if self.waits else 0.0
+
+    def block(self, bucket, seconds):
+        self.blocked.append((bucket, seconds))
+        return True
+
+
+def _mock_sync(monkeypatch, connector, handler):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(connector, "_http", lambda: client)
+    return connector
+
+
+def test_requests_acquire_from_supplier_endpoint_bucket(monkeypatch):
+    limiter = _RecordingLimiter(waits=[0.01])
+    monkeypatch.setattr(ratelimit, "rate_limiter", limiter)
+    config = {"rate_limits": {"catalog": {"rate": 5, "burst": 2}}}
+    connector = _mock_sync(
+        monkeypatch, TemuConnector(config, supplier_id=3), lambda request: httpx.Response(200, json={"products": [], "status": "ok"})
+    )
+    connector.fetch_product_page("key", "secret")
+    connector.get_order_status("key", "secret", "1")  # orders 분류는 한도 없음 → 버킷 미사용
+    assert limiter.acquired == [("connector-rate:3:catalog", 5.0, 2)] * 2  # 첫 시도는 대기 후 재획득
+
+
+def test_default_quota_and_max_wait(monkeypatch):
+    limiter = _RecordingLimiter(waits=[20.0, 20.0])
+    monkeypatch.setattr(ratelimit, "rate_limiter", limiter)
+    monkeypatch.setattr("app.connectors.base.time.sleep", lambda seconds: None)
+    connector = TemuConnector({"rate_limits": {"default": {"rate": 1}}})
+    with pytest.raises(ConnectorRateLimitError):  # 누적 대기 40초 > CONNECTOR_RATE_LIMIT_MAX_WAIT
+        connector.get_order_status("key", "secret", "1")
+    assert limiter.acquired[0] == ("connector-rate:temu:orders", 1.0, 1)
+    assert AmazonConnector()._rate_limit("orders") == (0.5, 30)  # 커넥터 기본 한도
+
+
+def test_retry_after_pauses_shared_bucket(monkeypatch):
+    limiter = _RecordingLimiter()
+    monkeypatch.setattr(ratelimit, "rate_limiter", limiter)
+    sleeps = []
+    monkeypatch.setattr("app.connectors.base.time.sleep", sleeps.append)
+    responses = iter([httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, json={"status": "ok"})])
+    config = {"rate_limits": {"orders": {"rate": 1, "burst": 1}}}
+    connector = _mock_sync(monkeypatch, TemuConnector(config, supplier_id=3), lambda request: next(responses))
+    assert connector.get_order_status("key", "secret", "1")["status"] == "ok"
+    assert limiter.blocked == [("connector-rate:3:orders", 2.0)]
+    assert sleeps == []  # 대기는 버킷 차단으로 (다음 acquire가 남은 시간을 반환)
+    assert len(limiter.acquired) == 2
+
+
+def test_retry_after_without_quota_waits_locally(monkeypatch):
+    monkeypatch.setattr(ratelimit, "rate_limiter", _RecordingLimiter())
+    sleeps = []
+    monkeypatch.setattr("app.connectors.base.time.sleep", sleeps.append)
+    responses = iter([httpx.Response(503, headers={"Retry-After": "3"}), httpx.Response(200, json={"status": "ok"})])
+    connector = _mock_sync(monkeypatch, TemuConnector(), lambda request: next(responses))
+    connector.get_order_status("key", "secret", "1")
+    assert sleeps == [3.0]
+
+
+def test_parse_retry_after():
+    assert ratelimit.parse_retry_after("1.5") == 1.5
+    assert ratelimit.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # 지난 시각
+    assert ratelimit.parse_retry_after("86400") == 300.0  # CONNECTOR_RETRY_AFTER_MAX
+    assert ratelimit.parse_retry_after("soon") is None
+    assert ratelimit.parse_retry_after(None) is None
+
+
+def test_rate_limiter_fails_open_when_redis_is_down():
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise redis.ConnectionError("down")
+
+    limiter = ratelimit.RateLimiter(down)
+    assert limiter.acquire("connector-rate:1:catalog", 1, 1) == 0.0
+    assert limiter.block("connector-rate:1:catalog", 5) is False
+    assert calls == [1]  # 장애 후 CONNECTOR_RATE_LIMIT_RETRY_SECONDS 동안 Redis 재시도 안 함
+
+
+@pytest.mark.asyncio
+async def test_async_connector_acquires_before_each_attempt(monkeypatch):
+    limiter = _RecordingLimiter()
+    monkeypatch.setattr(ratelimit, "rate_limiter", limiter)
+    responses = iter([httpx.Response(429, headers={"Retry-After": "0.5"}), httpx.Response(200, json={"status": "ok"})])
+    config = {"rate_limits": {"default": {"rate": 2, "burst": 4}}}
+    async with _mock_async(AsyncTemuConnector(config, supplier_id=9), lambda request: next(responses)) as connector:
+        await connector.get_order_status("key", "secret", "1")
+    assert limiter.acquired == [("connector-rate:9:orders", 2.0, 4)] * 2
+    assert limiter.blocked == [("connector-rate:9:orders", 0.5)]
+
+
+class _StubBreaker:
+    """CircuitBreaker 대역: open이면 거부, 결과 기록."""
+
+    def __init__(self, open_for=None):
+        self.open_for = open_for
+        self.recorded = []
+
+    def allow(self, owner, name, options):
+        if self.open_for is not None:
+            raise ConnectorCircuitOpenError(f"{name} circuit open", retry_after=self.open_for)
+        return circuit.CircuitPermit(circuit.circuit_key(owner), failures=1)
+
+    def record(self, permit, name, options, exc=None):
+        self.recorded.append((permit.key, type(exc).__name__ if exc else None))
+
+
+def test_open_circuit_fails_fast_without_request(monkeypatch):
+    monkeypatch.setattr(circuit, "circuit_breaker", _StubBreaker(open_for=42.5))
+    sent = []
+    connector = _mock_sync(monkeypatch, TemuConnector(supplier_id=4), lambda request: sent.append(request))
+    with pytest.raises(ConnectorCircuitOpenError) as info:
+        connector.get_order_status("key", "secret", "1")
+    assert sent == [] and retry_after_seconds(info.value) == 43
+
+
+def test_circuit_records_failure_after_retries_and_success(monkeypatch):
+    breaker = _StubBreaker()
+    monkeypatch.setattr(circuit, "circuit_breaker", breaker)
+    monkeypatch.setattr("app.connectors.base.time.sleep", lambda seconds: None)
+
+    def handler(request):
+        if request.url.path.endswith("/down"):
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"status": "ok"})
+
+    connector = _mock_sync(monkeypatch, TemuConnector(supplier_id=4), handler)
+    with pytest.raises(ConnectorTimeoutError):
+        connector.get_order_status("key", "secret", "down")
+    connector.get_order_status("key", "secret", "1")
+    assert breaker.recorded == [
+        ("connector-circuit:4", "ConnectorTimeoutError"),  # MAX_RETRIES 시도 후 1회만 기록
+        ("connector-circuit:4", None),
+    ]
+
+
+def test_circuit_failure_classification():
+    assert circuit.is_circuit_failure(ConnectorTimeoutError())
+    assert circuit.is_circuit_failure(ConnectorAPIError("5xx", status_code=503, retryable=True))
+    assert not circuit.is_circuit_failure(ConnectorAPIError("not found", status_code=404))
+    assert not circuit.is_circuit_failure(ConnectorAuthError())
+    assert circuit.circuit_options({"failure_threshold": 2, "unknown": 1})["failure_threshold"] == 2
+
+
+def test_circuit_breaker_fails_open_when_redis_is_down():
+    def down():
+        raise redis.ConnectionError("down")
+
+    breaker = circuit.CircuitBreaker(down)
+    options = circuit.circuit_options()
+    permit = breaker.allow("4", "Temu", options)
+    assert permit.key is None and not permit.dirty
+    breaker.record(permit, "Temu", options, ConnectorTimeoutError())
+    assert breaker.snapshot() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_fan_out_stops_calling_open_supplier(monkeypatch):
+    monkeypatch.setattr(circuit, "circuit_breaker", _StubBreaker(open_for=10))
+    sent = []
+    async with _mock_async(AsyncTemuConnector(), lambda request: sent.append(request)) as connector:
+        results = await connector.fan_out(
+            [lambda i=i: connector.get_order_status("key", "secret", str(i)) for i in range(5)]
+        )
+    assert sent == [] and all(isinstance(r, ConnectorCircuitOpenError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_amazon_order_statuses_use_bulk_endpoint(monkeypatch):
+    monkeypatch.setattr(ratelimit, "rate_limiter", _RecordingLimiter())
+    monkeypatch.setattr(AsyncAmazonConnector, "_get_access_token", lambda self, k, s: "token")
+    requests = []
+
+    def handler(request):
+        ids = request.url.params["AmazonOrderIds"].split(",")
+        requests.append(len(ids))
+        orders = [{"AmazonOrderId": order_id, "OrderStatus": "Shipped"} for order_id in ids if order_id != "A-7"]
+        return httpx.Response(200, json={"payload": {"Orders": orders}})
+
+    order_ids = [f"A-{i}" for i in range(60)]
+    async with _mock_async(AsyncAmazonConnector(supplier_id=5), handler) as connector:
+        statuses = await connector.get_order_statuses("client", "secret", order_ids)
+    assert sorted(requests) == [10, 50]  # getOrders 한 번에 최대 50건
+    assert statuses["A-0"]["status"] == "Shipped"
+    assert isinstance(statuses["A-7"], ConnectorResponseError)
+    assert ratelimit.rate_limiter.acquired[0] == ("connector-rate:5:order_list", 1 / 60, 20)
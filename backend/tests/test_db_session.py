@@ -0,0 +1,32 @@
+"""읽기 복제본 라우팅 검증."""
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import session as db_session
+from app.db.session import ReplicaRouter
+
+
+def test_replica_router_round_robin_and_mark_down():
+    router = ReplicaRouter(["r0", "r1", "r2"], retry_seconds=60)
+    assert list(router.candidates())[0] == "r0"
+    assert list(router.candidates())[0] == "r1"
+
+    router.mark_down("r1")
+    assert "r1" not in list(router.candidates())
+    assert router.status() == {"replica0": "up", "replica1": "down", "replica2": "up"}
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_skips_unreachable_replica(monkeypatch, tmp_path):
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/dir/db.sqlite")
+    healthy = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/ok.sqlite")
+    router = ReplicaRouter([broken, healthy], retry_seconds=60)
+    monkeypatch.setattr(db_session, "replica_router", router)
+
+    gen = db_session.get_read_db()
+    db = await gen.__anext__()
+    assert db.bind is healthy
+    assert router.status()["replica0"] == "down"
+    await gen.aclose()
+    await broken.dispose()
+    await healthy.dispose()
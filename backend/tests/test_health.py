@@ -17,3 +17,14 @@ def test_root(client):
     data = response.json()
     assert "message" in data
     assert "version" in data
+
+
+def test_metrics_exposes_db_pools(client):
+    """GET /metrics returns per-process pool usage for the API and task engines."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    data = response.json()["db_pool"]
+    assert "pid" in data
+    for name in ("primary", "sync"):
+        pool = data["pools"][name]
+        assert {"size", "checked_out", "idle", "overflow", "wait_seconds_avg"} <= pool.keys()
@@ -0,0 +1,83 @@
+"""ETag / Last-Modified 조건부 요청 검증."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models import Product
+from tests.test_products import _refresh_facets, _seed_products, count_queries
+
+
+@pytest.mark.asyncio
+async def test_product_detail_etag_and_304(async_client, db_session_factory, db_engine):
+    ids = await _seed_products(db_session_factory, count=1)
+    first = await async_client.get(f"/api/products/{ids[0]}")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert "Last-Modified" in first.headers
+
+    # nginx gzip이 붙이는 약한 ETag도 일치로 처리, 검증 쿼리 1개만 실행
+    with count_queries(db_engine) as statements:
+        response = await async_client.get(f"/api/products/{ids[0]}", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1, statements
+
+    response = await async_client.get(
+        f"/api/products/{ids[0]}", headers={"If-Modified-Since": first.headers["Last-Modified"]}
+    )
+    assert response.status_code == 304
+
+    async with db_session_factory() as db:
+        product = await db.scalar(select(Product).where(Product.id == ids[0]))
+        product.stock = 1
+        product.synced_at = datetime(2026, 2, 1)  # sync가 갱신 (SQLite now()는 초 단위라 updated_at만으론 같을 수 있음)
+        await db.commit()
+    response = await async_client.get(f"/api/products/{ids[0]}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_product_list_etag_changes_with_page(async_client, db_session_factory):
+    await _seed_products(db_session_factory, count=3)
+    first = await async_client.get("/api/products/", params={"limit": 2})
+    etag = first.headers["ETag"]
+    response = await async_client.get("/api/products/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # 다른 파라미터는 다른 ETag
+    other = await async_client.get("/api/products/", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_product_list_ignores_if_modified_since(async_client, db_session_factory):
+    ids = await _seed_products(db_session_factory, count=3)
+    first = await async_client.get("/api/products/")
+    assert "Last-Modified" not in first.headers
+
+    # 상품이 목록에서 빠져도 남은 행의 최신 시각은 그대로 → If-Modified-Since로 304를 주면 안 됨
+    async with db_session_factory() as db:
+        product = await db.scalar(select(Product).where(Product.id == ids[0]))
+        product.is_active = False
+        await db.commit()
+    since = {"If-Modified-Since": "Sun, 01 Jan 2100 00:00:00 GMT"}
+    response = await async_client.get("/api/products/", headers=since)
+    assert response.status_code == 200
+    assert ids[0] not in [item["id"] for item in response.json()["items"]]
+    stale = await async_client.get("/api/products/", headers={"If-None-Match": first.headers["ETag"]})
+    assert stale.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_categories_etag(async_client, db_session_factory):
+    await _seed_products(db_session_factory, count=2)
+    await _refresh_facets(db_session_factory)
+    first = await async_client.get("/api/products/categories/list")
+    response = await async_client.get(
+        "/api/products/categories/list", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert response.status_code == 304
@@ -0,0 +1,307 @@
+"""주문 처리 태스크 (공급자별 동시 발주, 상태 일괄 조회, 주문 상태 집계, 배송 추적 갱신) 검증. 태스크는 동기 세션이므로 SQLite 동기 엔진으로 실행."""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.connectors.temu import AsyncTemuConnector
+from app.db.models import (
+    ExternalOrder, ExternalOrderStatus, Order, OrderItem, OrderStatus, Product, Shipment, ShipmentEvent,
+    ShipmentStatus, Supplier, User,
+)
+from app.db.session import Base
+from app.services.order_status import rollup_order_statuses
+from app.services.shipment_tracking import as_utc, poll_interval
+from app.tasks import order_process
+
+
+@pytest.fixture
+def sync_session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(order_process, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _seed_order(factory, supplier_count: int = 3, items_per_supplier: int = 2) -> int:
+    with factory() as db:
+        user = User(email="buyer@example.com", hashed_password="x", name="구매자")
+        order = Order(
+            user=user, order_number="KM-1", status=OrderStatus.PAID, total_amount=Decimal("30000"),
+            recipient_name="홍길동", recipient_phone="010", recipient_address="서울", recipient_postal_code="12345",
+        )
+        db.add(order)
+        for s in range(supplier_count):
+            supplier = Supplier(name=f"S{s}", code=f"s{s}", connector_type="temu", config={"test_mode": True})
+            for i in range(items_per_supplier):
+                product = Product(
+                    supplier=supplier, external_id=f"ext-{s}-{i}", name=f"P{s}{i}",
+                    original_price=10, selling_price=10000, stock=10,
+                )
+                order.items.append(OrderItem(
+                    product=product, product_name=product.name, quantity=1,
+                    unit_price=Decimal("10000"), total_price=Decimal("10000"),
+                ))
+        db.commit()
+        return order.id
+
+
+def test_process_order_places_supplier_orders_concurrently(sync_session_factory, monkeypatch):
+    order_id = _seed_order(sync_session_factory)
+    placed = []
+
+    async def slow_place_order(self, api_key, api_secret, order_data):
+        await asyncio.sleep(0.2)
+        placed.append([item["external_id"] for item in order_data["items"]])
+        if order_data["items"][0]["external_id"].startswith("ext-2-"):
+            raise ValueError("supplier down")
+        return {"order_id": f"EXT-{order_data['items'][0]['external_id']}", "status": "placed"}
+
+    monkeypatch.setattr(AsyncTemuConnector, "place_order", slow_place_order)
+    statements = []
+    engine = sync_session_factory.kw["bind"]
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+
+    started = time.perf_counter()
+    result = order_process.process_order.run(order_id)
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", listener)
+
+    assert elapsed < 0.5  # 순차 발주면 0.6초 이상
+    assert sorted(placed) == [[f"ext-{s}-0", f"ext-{s}-1"] for s in range(3)]
+    assert [eo["status"] for eo in result["external_orders"]] == ["success", "success", "failed"]
+    assert result["success"] is False
+    # 아이템/상품/옵션, 공급자는 각각 1회 조회 (공급자 수와 무관)
+    assert sum("FROM order_items" in s for s in statements) == 1
+    assert sum(s.lstrip().startswith("SELECT") and "FROM suppliers" in s for s in statements) == 1
+
+    with sync_session_factory() as db:
+        rows = {eo.supplier_id: eo for eo in db.query(ExternalOrder).all()}
+        assert [rows[k].status for k in sorted(rows)] == [
+            ExternalOrderStatus.ORDERED, ExternalOrderStatus.ORDERED, ExternalOrderStatus.FAILED,
+        ]
+        assert rows[min(rows)].external_order_id == "EXT-ext-0-0" and rows[max(rows)].attempts == 1
+        assert db.get(Order, order_id).status == OrderStatus.PROCESSING
+
+
+def test_update_all_order_statuses_batches_polling_and_updates(sync_session_factory, monkeypatch):
+    monkeypatch.setattr(order_process.settings, "ORDER_STATUS_BATCH_SIZE", 2)
+    with sync_session_factory() as db:
+        user = User(email="buyer@example.com", hashed_password="x", name="구매자")
+        suppliers = [Supplier(name=f"S{s}", code=f"s{s}", connector_type="temu") for s in range(2)]
+        orders = []
+        for n, status in enumerate([OrderStatus.SHIPPED, OrderStatus.PROCESSING, OrderStatus.SHIPPED]):
+            order = Order(user=user, order_number=f"KM-{n}", status=status, total_amount=Decimal("10000"))
+            order.items.append(OrderItem(product_name="P", quantity=1, unit_price=Decimal("1"), total_price=Decimal("1")))
+            orders.append(order)
+        db.add_all(orders)
+        db.flush()
+        # (주문, 공급자, 외부 주문 번호, 현재 상태)
+        for order, supplier, external_id, status in [
+            (orders[0], suppliers[0], "D1", ExternalOrderStatus.SHIPPED),
+            (orders[0], suppliers[1], "D2", ExternalOrderStatus.ORDERED),
+            (orders[1], suppliers[0], "S1", ExternalOrderStatus.ORDERED),
+            (orders[2], suppliers[1], "X1", ExternalOrderStatus.ORDERED),
+            (orders[2], suppliers[0], "D3", ExternalOrderStatus.ORDERED),
+        ]:
+            db.add(ExternalOrder(
+                order_item_id=order.items[0].id, order_id=order.id, supplier=supplier,
+                external_order_id=external_id, status=status,
+            ))
+        db.commit()
+        order_ids = [order.id for order in orders]
+
+    polled = []
+
+    async def get_order_status(self, api_key, api_secret, order_id):
+        polled.append(order_id)
+        if order_id == "X1":
+            raise ValueError("upstream error")
+        status = "shipped" if order_id.startswith("S") else "delivered"
+        return {"order_id": order_id, "status": status, "tracking_number": f"T-{order_id}"}
+
+    monkeypatch.setattr(AsyncTemuConnector, "get_order_status", get_order_status)
+    notified = []
+    monkeypatch.setattr(order_process.send_shipping_notification, "delay", lambda *a: notified.append(("shipped", *a)))
+    monkeypatch.setattr(order_process.send_delivery_complete, "delay", lambda *a: notified.append(("delivered", *a)))
+    result = order_process.update_all_order_statuses.run()
+
+    assert sorted(polled) == ["D1", "D2", "D3", "S1", "X1"]
+    assert result == {
+        "updated_count": 4, "deferred_count": 0, "failed_count": 1,
+        "shipped_orders": [order_ids[1]], "delivered_orders": [order_ids[0]],
+    }
+    assert notified == [("shipped", order_ids[1], "T-S1", None), ("delivered", order_ids[0])]
+    with sync_session_factory() as db:
+        statuses = dict(db.query(ExternalOrder.external_order_id, ExternalOrder.status).all())
+        assert statuses == {"D1": "delivered", "D2": "delivered", "S1": "shipped", "X1": "ordered", "D3": "delivered"}
+        shipments = db.query(order_process.Shipment).all()
+        assert [(s.order_id, s.tracking_number) for s in shipments] == [(order_ids[1], "T-S1")]
+        # 발송된 외부 주문이 생긴 주문은 SHIPPED, 모두 배송 완료된 주문만 DELIVERED (X1이 남은 주문은 그대로)
+        assert [db.get(Order, i).status for i in order_ids] == [
+            OrderStatus.DELIVERED, OrderStatus.SHIPPED, OrderStatus.SHIPPED,
+        ]
+
+
+def test_rollup_order_statuses_is_set_based(sync_session_factory):
+    with sync_session_factory() as db:
+        user = User(email="buyer@example.com", hashed_password="x", name="구매자")
+        supplier = Supplier(name="S", code="s", connector_type="temu")
+        # 주문별 (현재 상태, 외부 주문 상태들)
+        cases = [
+            (OrderStatus.PROCESSING, ["shipped", "ordered"]),  # 일부 발송 → SHIPPED
+            (OrderStatus.PROCESSING, ["delivered", "delivered"]),  # 한 번에 → SHIPPED → DELIVERED
+            (OrderStatus.PROCESSING, ["ordered"]),  # 그대로
+            (OrderStatus.SHIPPED, ["delivered", "shipped"]),  # 그대로
+            (OrderStatus.SHIPPED, []),  # 외부 주문 없음 → 그대로
+            (OrderStatus.PAID, ["shipped"]),  # 대상 상태 아님
+        ]
+        orders = []
+        for n, (status, external_statuses) in enumerate(cases):
+            order = Order(user=user, order_number=f"KM-{n}", status=status, total_amount=Decimal("1"))
+            item = OrderItem(product_name="P", quantity=1, unit_price=Decimal("1"), total_price=Decimal("1"))
+            order.items.append(item)
+            for external_status in external_statuses:
+                order.external_orders.append(ExternalOrder(order_item=item, supplier=supplier, status=external_status))
+            orders.append(order)
+        db.add_all(orders)
+        db.commit()
+        ids = [order.id for order in orders]
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        engine = sync_session_factory.kw["bind"]
+        event.listen(engine, "before_cursor_execute", listener)
+        changed = rollup_order_statuses(db)
+        event.remove(engine, "before_cursor_execute", listener)
+        db.commit()
+
+        assert len(statements) == 2 and all(s.lstrip().startswith("UPDATE") for s in statements)
+        assert changed == {OrderStatus.SHIPPED: [ids[0], ids[1]], OrderStatus.DELIVERED: [ids[1]]}
+        assert [db.get(Order, i).status for i in ids] == [
+            OrderStatus.SHIPPED, OrderStatus.DELIVERED, OrderStatus.PROCESSING,
+            OrderStatus.SHIPPED, OrderStatus.SHIPPED, OrderStatus.PAID,
+        ]
+
+
+def test_update_shipment_tracking_polls_due_shipments_and_dedups_events(sync_session_factory, monkeypatch):
+    monkeypatch.setattr(order_process.settings, "TRACKING_BATCH_SIZE", 2)
+    monkeypatch.setattr(order_process.settings, "TRACKING_COURIER_REFRESH_MINUTES", {"EMS": 240})
+    now = datetime.now(timezone.utc)
+    with sync_session_factory() as db:
+        user = User(email="buyer@example.com", hashed_password="x", name="구매자")
+        supplier = Supplier(name="S", code="s", connector_type="temu")
+        order = Order(user=user, order_number="KM-1", status=OrderStatus.SHIPPED, total_amount=Decimal("1"))
+        item = OrderItem(product_name="P", quantity=1, unit_price=Decimal("1"), total_price=Decimal("1"))
+        order.items.append(item)
+        # (운송장, 택배사, 다음 조회 시각, 상태)
+        for number, courier, next_poll_at, status in [
+            ("T1", "cj", None, ShipmentStatus.PICKED_UP),  # 새 배송: 즉시
+            ("T2", "cj", now - timedelta(minutes=1), ShipmentStatus.IN_TRANSIT),
+            ("T3", "cj", now + timedelta(minutes=10), ShipmentStatus.IN_TRANSIT),  # 아직
+            ("T4", "ems", now - timedelta(minutes=1), ShipmentStatus.OUT_FOR_DELIVERY),
+            ("T5", "cj", now - timedelta(minutes=1), ShipmentStatus.IN_TRANSIT),
+            ("T6", "cj", None, ShipmentStatus.DELIVERED),  # 완료된 배송
+        ]:
+            external = ExternalOrder(order_item=item, order=order, supplier=supplier, status="shipped")
+            db.add(Shipment(
+                order=order, external_order=external, tracking_number=number, courier=courier,
+                status=status, next_poll_at=next_poll_at,
+            ))
+        db.commit()
+        shipment_id = db.query(Shipment.id).filter(Shipment.tracking_number == "T2").scalar()
+        db.add(ShipmentEvent(shipment_id=shipment_id, status="picked_up", event_time=now - timedelta(hours=60)))
+        db.commit()
+
+    polled = []
+    recent = (now - timedelta(hours=1)).replace(tzinfo=None).isoformat()
+    stale = (now - timedelta(hours=60)).replace(tzinfo=None).isoformat()
+
+    async def get_tracking_info(self, tracking_number, courier=None):
+        polled.append(tracking_number)
+        if tracking_number == "T5":
+            return {"current_status": "delivered", "events": [{"status": "delivered", "time": recent}]}
+        events = [
+            {"status": "picked_up", "time": stale},  # T2는 이미 저장됨
+            {"status": "picked_up", "time": stale},  # 응답 내 중복
+            {"status": "unknown"},  # 시각 없음
+        ]
+        if tracking_number != "T2":
+            events.append({"status": "in_transit", "time": recent})
+        return {"current_status": "in_transit", "events": events}
+
+    monkeypatch.setattr(AsyncTemuConnector, "get_tracking_info", get_tracking_info)
+    result = order_process.update_shipment_tracking.run()
+
+    assert sorted(polled) == ["T1", "T2", "T4", "T5"]
+    assert result == {"updated_count": 4, "deferred_count": 0, "failed_count": 0, "new_events": 5}
+
+    def minutes_until(shipment):
+        return round((as_utc(shipment.next_poll_at) - now).total_seconds() / 60)
+
+    with sync_session_factory() as db:
+        shipments = {s.tracking_number: s for s in db.query(Shipment).all()}
+        assert [len(shipments[n].events) for n in ("T1", "T2", "T3", "T4", "T5")] == [2, 1, 0, 2, 1]
+        assert shipments["T5"].status == ShipmentStatus.DELIVERED and shipments["T5"].delivered_at is not None
+        assert shipments["T1"].last_checked_at is not None
+        # 상태별 주기: picked_up 360분, out_for_delivery 30분 → EMS 최소 240분
+        # T2는 마지막 이벤트가 60시간 전 → in_transit 120분 × 4
+        assert {n: minutes_until(shipments[n]) for n in ("T1", "T2", "T3", "T4")} == {
+            "T1": 360, "T2": 480, "T3": 10, "T4": 240,
+        }
+
+    # 다음 조회 시각 전까지 다시 조회하지 않음
+    polled.clear()
+    assert order_process.update_shipment_tracking.run()["updated_count"] == 0
+    assert polled == []
+
+
+def test_update_shipment_tracking_backs_off_failed_polls(sync_session_factory, monkeypatch):
+    now = datetime.now(timezone.utc)
+    with sync_session_factory() as db:
+        user = User(email="buyer@example.com", hashed_password="x", name="구매자")
+        supplier = Supplier(name="S", code="s", connector_type="temu")
+        order = Order(user=user, order_number="KM-1", status=OrderStatus.SHIPPED, total_amount=Decimal("1"))
+        item = OrderItem(product_name="P", quantity=1, unit_price=Decimal("1"), total_price=Decimal("1"))
+        order.items.append(item)
+        external = ExternalOrder(order_item=item, order=order, supplier=supplier, status="shipped")
+        db.add(Shipment(
+            order=order, external_order=external, tracking_number="BAD", courier="cj",
+            status=ShipmentStatus.OUT_FOR_DELIVERY, shipped_at=now - timedelta(days=5),
+        ))
+        db.commit()
+
+    polled = []
+
+    async def get_tracking_info(self, tracking_number, courier=None):
+        polled.append(tracking_number)
+        raise ValueError("unknown tracking number")
+
+    monkeypatch.setattr(AsyncTemuConnector, "get_tracking_info", get_tracking_info)
+    assert order_process.update_shipment_tracking.run()["failed_count"] == 1
+    with sync_session_factory() as db:
+        shipment = db.query(Shipment).one()
+        assert shipment.last_checked_at is None
+        # 발송 5일 경과여도 실패 1회는 out_for_delivery 기본 주기(30분)만 미룸
+        assert round((as_utc(shipment.next_poll_at) - now).total_seconds() / 60) == 30
+
+    # 다음 스윕에서는 조회 대상이 아님
+    assert order_process.update_shipment_tracking.run()["failed_count"] == 0
+    assert polled == ["BAD"]
+
+
+def test_poll_interval_backs_off_without_new_events(monkeypatch):
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr(order_process.settings, "TRACKING_POLL_MAX_MINUTES", 600)
+    assert poll_interval("out_for_delivery", None, now - timedelta(hours=1), now) == timedelta(minutes=30)
+    assert poll_interval("in_transit", None, now - timedelta(hours=25), now) == timedelta(minutes=240)
+    assert poll_interval("in_transit", "CJ", now - timedelta(days=30), now) == timedelta(minutes=600)
+    assert poll_interval("exception", None, None, now) == timedelta(minutes=120)
@@ -0,0 +1,151 @@
+"""상품 동기화 태스크 (delta/full 모드, 워터마크, 부분 실패) 검증. 태스크는 동기 세션이므로 SQLite 동기 엔진으로 실행."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.connectors.exceptions import ConnectorCircuitOpenError
+from app.db.models import Product, ProductFacetCount, Supplier, SupplierSyncState
+from app.db.session import Base
+from app.tasks import product_sync
+from tests.test_product_upsert import _payload
+
+
+@pytest.fixture
+def sync_session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(product_sync, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+class _FailingConnector:
+    """첫 청크 분량을 넘긴 뒤 페이지 조회 중 실패하는 커넥터"""
+    SUPPORTS_SINCE = False
+    MAX_PAGE_SIZE = 100
+
+    def iter_products(self, api_key, api_secret, config, since=None, page_size=None, max_items=None):
+        for i in range(3):
+            yield _payload(i)
+        raise ConnectorCircuitOpenError("temu circuit open", retry_after=30)
+
+
+def test_sync_failure_publishes_committed_chunks_before_retry(sync_session_factory, monkeypatch):
+    monkeypatch.setattr(product_sync.settings, "SYNC_CHUNK_SIZE", 2)
+    monkeypatch.setattr(product_sync, "get_supplier_connector", lambda supplier: _FailingConnector())
+    invalidated = []
+    monkeypatch.setattr(product_sync, "invalidate_tags_sync", lambda tags: invalidated.append(set(tags)) or 0)
+    with sync_session_factory() as db:
+        supplier = Supplier(name="Temu", code="temu", connector_type="temu")
+        db.add(supplier)
+        db.commit()
+        supplier_id = supplier.id
+
+    with pytest.raises(ConnectorCircuitOpenError):
+        product_sync.sync_supplier_products.run(supplier_id)
+
+    with sync_session_factory() as db:
+        # 첫 청크(2건)는 커밋됨, 실패한 페이지의 나머지 청크는 반영되지 않음
+        product_ids = {pid for (pid,) in db.query(Product.id).filter(Product.supplier_id == supplier_id)}
+        assert len(product_ids) == 2
+        # 재시도 전에 facet 재집계 + 캐시 무효화
+        assert db.query(func.sum(ProductFacetCount.product_count)).filter(
+            ProductFacetCount.category == "fashion"
+        ).scalar() > 0
+    assert len(invalidated) == 1
+    assert {f"product:{pid}" for pid in product_ids} | {"category:fashion"} <= invalidated[0]
+
+
+class _ScriptedConnector:
+    """정해진 상품 목록을 돌려주고 since 인자를 기록하는 커넥터"""
+    MAX_PAGE_SIZE = 100
+
+    def __init__(self, products, supports_since=True):
+        self.SUPPORTS_SINCE = supports_since
+        self.products = products
+        self.calls = []
+
+    def iter_products(self, api_key, api_secret, config, since=None, page_size=None, max_items=None):
+        self.calls.append(since)
+        yield from self.products
+
+
+def _sync_setup(factory, monkeypatch, connector, watermark=None, existing=()):
+    monkeypatch.setattr(product_sync, "get_supplier_connector", lambda supplier: connector)
+    monkeypatch.setattr(product_sync, "invalidate_tags_sync", lambda tags: 0)
+    with factory() as db:
+        supplier = Supplier(name="Temu", code="temu", connector_type="temu")
+        db.add(supplier)
+        db.flush()
+        if watermark is not None:
+            db.add(SupplierSyncState(supplier_id=supplier.id, watermark=watermark))
+        for external_id in existing:
+            db.add(Product(
+                supplier_id=supplier.id, external_id=external_id, name=external_id,
+                original_price=10, selling_price=10000, stock=1,
+            ))
+        db.commit()
+        return supplier.id
+
+
+def _state(factory, supplier_id):
+    with factory() as db:
+        return db.get(SupplierSyncState, supplier_id)
+
+
+def test_delta_sync_skipped_without_since_support(sync_session_factory, monkeypatch):
+    connector = _ScriptedConnector([_payload(0)], supports_since=False)
+    supplier_id = _sync_setup(sync_session_factory, monkeypatch, connector, watermark=datetime(2026, 1, 1))
+    result = product_sync.sync_supplier_products.run(supplier_id, mode="delta")
+    assert result["skipped"] and connector.calls == []
+    assert _as_utc(_state(sync_session_factory, supplier_id).watermark) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_delta_sync_without_watermark_runs_full(sync_session_factory, monkeypatch):
+    connector = _ScriptedConnector([_payload(0), _payload(1)])
+    supplier_id = _sync_setup(sync_session_factory, monkeypatch, connector)
+    started = datetime.now(timezone.utc)
+    result = product_sync.sync_supplier_products.run(supplier_id, mode="delta")
+    assert result["mode"] == "full" and result["created"] == 2
+    assert connector.calls == [None]
+    state = _state(sync_session_factory, supplier_id)
+    assert _as_utc(state.watermark) >= started - timedelta(seconds=1)
+    assert state.last_full_sync_at == state.watermark
+
+
+def test_delta_sync_passes_since_with_overlap_and_advances_watermark(sync_session_factory, monkeypatch):
+    monkeypatch.setattr(product_sync.settings, "SYNC_DELTA_OVERLAP_SECONDS", 300)
+    watermark = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+    connector = _ScriptedConnector([_payload(0)])
+    supplier_id = _sync_setup(sync_session_factory, monkeypatch, connector, watermark=watermark)
+    result = product_sync.sync_supplier_products.run(supplier_id, mode="delta")
+    assert connector.calls == [watermark - timedelta(seconds=300)]
+    assert result["mode"] == "delta" and result["since"] == (watermark - timedelta(seconds=300)).isoformat()
+    state = _state(sync_session_factory, supplier_id)
+    assert _as_utc(state.watermark) > watermark
+    assert state.last_full_sync_at is None  # delta는 전체 동기화 시각을 바꾸지 않음
+
+
+def test_unparseable_product_does_not_block_watermark_or_removal(sync_session_factory, monkeypatch):
+    # 기존 4개 중 ext-3은 공급처에서 사라짐, ext-2는 있지만 파싱 불가
+    connector = _ScriptedConnector([_payload(0), _payload(1), _payload(2, price="N/A")])
+    supplier_id = _sync_setup(
+        sync_session_factory, monkeypatch, connector, existing=["ext-0", "ext-1", "ext-2", "ext-3"]
+    )
+    result = product_sync.sync_supplier_products.run(supplier_id)
+    assert (result["invalid"], result["failed"], result["removed"]) == (1, 0, 1)
+    assert result["invalid_ids"] == ["ext-2"]
+    state = _state(sync_session_factory, supplier_id)
+    assert state.watermark is not None and state.last_full_sync_at is not None
+    assert state.last_result["invalid_ids"] == ["ext-2"]
+    with sync_session_factory() as db:
+        active = dict(db.query(Product.external_id, Product.is_active).all())
+    assert active == {"ext-0": True, "ext-1": True, "ext-2": True, "ext-3": False}
+
+
+def _as_utc(value):
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
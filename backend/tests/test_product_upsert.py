@@ -0,0 +1,152 @@
+"""상품 일괄 upsert (app.services.product_upsert) 검증."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.models import Product, ProductImage, ProductVariant, Supplier
+from app.services.product_upsert import chunked, deactivate_missing, normalize_product, upsert_chunk
+from tests.test_products import count_queries
+
+SYNCED_AT = datetime(2026, 3, 1)
+
+
+def _payload(i, **overrides):
+    data = {
+        "external_id": f"ext-{i}",
+        "title": f"Product {i}",
+        "title_ko": f"상품 {i}",
+        "price": 10,
+        "stock": 5,
+        "category": "fashion",
+        "images": [f"https://img/{i}/0.jpg", f"https://img/{i}/1.jpg"],
+        "variants": [{"id": "v1", "name": "옵션", "price": 12, "stock": 3}],
+    }
+    data.update(overrides)
+    return data
+
+
+async def _supplier_id(session_factory) -> int:
+    async with session_factory() as db:
+        supplier = Supplier(name="Temu", code="temu_upsert", connector_type="temu")
+        db.add(supplier)
+        await db.commit()
+        return supplier.id
+
+
+async def _upsert(session_factory, supplier_id, payloads):
+    items = [normalize_product(p, supplier_id, 1350, 30, SYNCED_AT) for p in payloads]
+    async with session_factory() as db:
+        result = await db.run_sync(upsert_chunk, supplier_id, [i for i in items if i])
+        await db.commit()
+        return result
+
+
+@pytest.mark.asyncio
+async def test_upsert_chunk_inserts_and_updates_in_fixed_round_trips(db_session_factory, db_engine):
+    supplier_id = await _supplier_id(db_session_factory)
+    with count_queries(db_engine) as statements:
+        result = await _upsert(db_session_factory, supplier_id, [_payload(i) for i in range(20)])
+    assert (result.created, result.changed, result.unchanged) == (20, 0, 0)
+    # 기존 조회 1 + upsert 1 + 이미지 1 + 옵션 1 (executemany)
+    assert len(statements) == 4, statements
+
+    result = await _upsert(
+        db_session_factory,
+        supplier_id,
+        [_payload(0, price=20, title_ko=None), _payload(0, price=30), _payload(99)],
+    )
+    assert (result.created, result.changed, result.unchanged) == (1, 1, 0)
+    assert result.categories == {"fashion"}
+
+    async with db_session_factory() as db:
+        product = await db.scalar(select(Product).where(Product.external_id == "ext-0"))
+        assert product.selling_price == int(30 * 1350 * 1.3)  # 같은 청크의 마지막 값
+        assert product.name_ko == "상품 0"
+        assert await db.scalar(select(func.count()).select_from(Product)) == 21
+        # 이미지/옵션은 신규 상품만 추가
+        assert await db.scalar(select(func.count()).select_from(ProductImage)) == 42
+        assert await db.scalar(select(func.count()).select_from(ProductVariant)) == 21
+
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_existing_values_when_missing(db_session_factory):
+    supplier_id = await _supplier_id(db_session_factory)
+    await _upsert(db_session_factory, supplier_id, [_payload(1, brand="Nike")])
+    await _upsert(db_session_factory, supplier_id, [{"external_id": "ext-1", "price": 11}])
+    async with db_session_factory() as db:
+        product = await db.scalar(select(Product).where(Product.external_id == "ext-1"))
+    assert (product.name, product.name_ko, product.brand, product.category) == (
+        "Product 1", "상품 1", "Nike", "fashion",
+    )
+
+
+def test_chunked_and_normalize_skip_missing_external_id():
+    assert [len(c) for c in chunked(range(7), 3)] == [3, 3, 1]
+    assert normalize_product({"title": "no id"}, 1, 1350, 30, SYNCED_AT) is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_products_are_not_written(db_session_factory, db_engine):
+    supplier_id = await _supplier_id(db_session_factory)
+    payloads = [_payload(i) for i in range(5)]
+    await _upsert(db_session_factory, supplier_id, payloads)
+
+    with count_queries(db_engine) as statements:
+        result = await _upsert(db_session_factory, supplier_id, payloads)
+    assert (result.created, result.changed, result.unchanged) == (0, 0, 5)
+    assert not result.product_ids
+    assert len(statements) == 1, statements  # 기존 조회만
+
+
+@pytest.mark.asyncio
+async def test_changed_products_update_only_changed_columns(db_session_factory, db_engine):
+    supplier_id = await _supplier_id(db_session_factory)
+    await _upsert(db_session_factory, supplier_id, [_payload(i) for i in range(4)])
+
+    payloads = [_payload(0, stock=1), _payload(1, stock=2), _payload(2, price=99), _payload(3)]
+    with count_queries(db_engine) as statements:
+        result = await _upsert(db_session_factory, supplier_id, payloads)
+    assert (result.created, result.changed, result.unchanged) == (0, 3, 1)
+
+    updates = [s for s in statements if s.startswith("UPDATE")]
+    assert len(updates) == 2  # 컬럼 조합별 1회: {stock}, {original_price, selling_price}
+    stock_update = next(s for s in updates if "stock=" in s)
+    assert "name=" not in stock_update and "selling_price=" not in stock_update
+
+    async with db_session_factory() as db:
+        stocks = (await db.execute(select(Product.external_id, Product.stock).order_by(Product.id))).all()
+    assert [s for _, s in stocks] == [1, 2, 5, 5]
+
+
+@pytest.mark.asyncio
+async def test_full_sync_deactivates_missing_and_restores_reappearing(db_session_factory):
+    supplier_id = await _supplier_id(db_session_factory)
+    await _upsert(db_session_factory, supplier_id, [_payload(i) for i in range(4)])
+    async with db_session_factory() as db:
+        admin_off = await db.scalar(select(Product).where(Product.external_id == "ext-3"))
+        admin_off.is_active = False  # 관리자가 끈 상품: 재활성화 대상 아님
+        await db.commit()
+
+        removal = await db.run_sync(deactivate_missing, supplier_id, {"ext-0", "ext-1"}, SYNCED_AT)
+        await db.commit()
+    assert removal.removed == 1 and removal.categories == {"fashion"}
+
+    result = await _upsert(db_session_factory, supplier_id, [_payload(i) for i in range(4)])
+    assert (result.restored, result.changed, result.unchanged) == (1, 0, 3)
+    async with db_session_factory() as db:
+        rows = (await db.execute(
+            select(Product.external_id, Product.is_active, Product.removed_at).order_by(Product.id)
+        )).all()
+    assert [(e, a, r) for e, a, r in rows] == [
+        ("ext-0", True, None), ("ext-1", True, None), ("ext-2", True, None), ("ext-3", False, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_deactivate_missing_refuses_mass_removal(db_session_factory):
+    supplier_id = await _supplier_id(db_session_factory)
+    await _upsert(db_session_factory, supplier_id, [_payload(i) for i in range(4)])
+    async with db_session_factory() as db:
+        assert await db.run_sync(deactivate_missing, supplier_id, {"ext-0"}, SYNCED_AT, 0.5) is None
+        assert await db.scalar(select(func.count()).where(Product.is_active == True)) == 4
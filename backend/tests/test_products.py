@@ -0,0 +1,276 @@
+"""상품 API (AsyncSession) 검증."""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.models import Supplier, Product, ProductImage, ProductVariant
+from app.services.facets import refresh_facet_counts
+
+
+async def _seed_products(session_factory, count: int = 3) -> list[int]:
+    # created_at을 명시: SQLite server_default(CURRENT_TIMESTAMP)는 바인딩 값과 문자열 형식이 달라 keyset 비교가 어긋남
+    base_time = datetime(2026, 1, 1)
+    async with session_factory() as db:
+        supplier = Supplier(name="Temu", code="temu_test", connector_type="temu")
+        db.add(supplier)
+        await db.flush()
+        ids = []
+        for i in range(count):
+            product = Product(
+                supplier_id=supplier.id,
+                external_id=f"ext-{i}",
+                name=f"Product {i}",
+                name_ko=f"상품 {i}",
+                category="fashion" if i % 2 == 0 else "digital",
+                original_price=10 + i,
+                selling_price=10000 + i * 1000,
+                stock=10,
+                is_active=True,
+                created_at=base_time + timedelta(minutes=i // 2),
+            )
+            product.images = [ProductImage(url=f"https://img/{i}/{j}.jpg", sort_order=j) for j in range(2)]
+            product.variants = [ProductVariant(name=f"옵션 {j}", price_krw=10000, stock=5) for j in range(2)]
+            db.add(product)
+            await db.flush()
+            ids.append(product.id)
+        await db.commit()
+        return ids
+
+
+@contextmanager
+def count_queries(engine):
+    """블록 안에서 실행된 SQL 문 수를 센다."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_list_products_includes_relations(async_client, db_session_factory):
+    await _seed_products(db_session_factory)
+    response = await async_client.get("/api/products/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["total_exact"] is True
+    assert len(data["items"]) == 3
+    assert all(len(p["images"]) == 2 and len(p["variants"]) == 2 for p in data["items"])
+
+
+@pytest.mark.asyncio
+async def test_get_product_detail_and_404(async_client, db_session_factory):
+    ids = await _seed_products(db_session_factory, count=1)
+    response = await async_client.get(f"/api/products/{ids[0]}")
+    assert response.status_code == 200
+    assert response.json()["title_ko"] == "상품 0"
+
+    response = await async_client.get("/api/products/999999")
+    assert response.status_code == 404
+
+
+async def _refresh_facets(session_factory, categories=None):
+    async with session_factory() as db:
+        await db.run_sync(refresh_facet_counts, categories)
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_categories_list(async_client, db_session_factory):
+    await _seed_products(db_session_factory)
+    async with db_session_factory() as db:
+        db.add(Product(
+            supplier_id=1, external_id="inactive", name="Old", category="outlet",
+            original_price=1, selling_price=1000, is_active=False,
+        ))
+        await db.commit()
+    await _refresh_facets(db_session_factory)
+    response = await async_client.get("/api/products/categories/list")
+    assert response.status_code == 200
+    assert response.json() == ["digital", "fashion"]  # 비활성 상품만 있는 카테고리 제외
+
+
+@pytest.mark.asyncio
+async def test_list_products_query_count_is_constant(async_client, db_session_factory, db_engine):
+    """100개 페이지도 ETag 검증 1 + count 1 + 페이지 1 + images 1 + variants 1 = 5 쿼리 (N+1 없음)."""
+    await _seed_products(db_session_factory, count=100)
+    with count_queries(db_engine) as statements:
+        response = await async_client.get("/api/products/?limit=100")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 100
+    assert len(statements) == 5, statements
+
+
+@pytest.mark.asyncio
+async def test_get_product_query_count(async_client, db_session_factory, db_engine):
+    """상세: ETag 검증 1 + 상품 1 + images 1 + variants 1 = 4 쿼리."""
+    ids = await _seed_products(db_session_factory, count=1)
+    with count_queries(db_engine) as statements:
+        response = await async_client.get(f"/api/products/{ids[0]}")
+    assert response.status_code == 200
+    assert len(statements) == 4, statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["newest", "price_asc", "price_desc"])
+async def test_cursor_pagination_walks_all_products(async_client, db_session_factory, sort):
+    ids = await _seed_products(db_session_factory, count=5)
+    seen, prices, cursor = [], [], None
+    for _ in range(10):  # 5개 / 2개씩 = 3페이지, 무한 루프 방지
+        params = {"limit": 2, "sort": sort}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("/api/products/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen += [p["id"] for p in data["items"]]
+        prices += [p["price_final"] for p in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids)
+    if sort == "price_asc":
+        assert prices == sorted(prices)
+    elif sort == "price_desc":
+        assert prices == sorted(prices, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_returns_400(async_client, db_session_factory):
+    await _seed_products(db_session_factory, count=3)
+    response = await async_client.get("/api/products/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    first = (await async_client.get("/api/products/", params={"limit": 1, "sort": "newest"})).json()
+    response = await async_client.get(
+        "/api/products/", params={"cursor": first["next_cursor"], "sort": "price_asc"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_total_above_threshold_is_cached_estimate(async_client, db_session_factory, db_engine, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "PRODUCT_COUNT_EXACT_THRESHOLD", 3)
+    await _seed_products(db_session_factory, count=6)
+    data = (await async_client.get("/api/products/")).json()
+    assert (data["total"], data["total_exact"]) == (6, False)
+
+    # 같은 필터는 캐시값 사용: ETag 검증 + 페이지 + images + variants = 4 쿼리 (count 없음)
+    with count_queries(db_engine) as statements:
+        data = (await async_client.get("/api/products/", params={"sort": "price_asc"})).json()
+    assert (data["total"], data["total_exact"]) == (6, False)
+    assert len(statements) == 4, statements
+
+    data = (await async_client.get("/api/products/", params={"category": "fashion"})).json()
+    assert (data["total"], data["total_exact"]) == (3, True)
+
+
+@pytest.mark.asyncio
+async def test_list_products_without_total(async_client, db_session_factory, db_engine):
+    await _seed_products(db_session_factory, count=3)
+    with count_queries(db_engine) as statements:
+        data = (await async_client.get("/api/products/", params={"with_total": "false"})).json()
+    assert data["total"] is None
+    assert len(data["items"]) == 3
+    assert len(statements) == 4, statements
+
+
+async def _seed_search_products(session_factory):
+    async with session_factory() as db:
+        supplier = Supplier(name="Temu", code="temu_search", connector_type="temu")
+        db.add(supplier)
+        await db.flush()
+        rows = [
+            ("Wireless Earphone", "무선 이어폰", "Xiaomi", "digital"),
+            ("Leather Wallet", "가죽 지갑", "Nike", "fashion"),
+            ("100% Cotton Shirt", "면 셔츠", None, "fashion"),
+        ]
+        for i, (name, name_ko, brand, category) in enumerate(rows):
+            db.add(Product(
+                supplier_id=supplier.id, external_id=f"s-{i}", name=name, name_ko=name_ko,
+                brand=brand, category=category, original_price=10, selling_price=10000,
+                stock=1, is_active=True, created_at=datetime(2026, 1, 1) + timedelta(minutes=i),
+            ))
+        await db.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "search, expected",
+    [
+        ("이어폰", ["무선 이어폰"]),
+        ("NIKE", ["가죽 지갑"]),  # 브랜드, 대소문자 무시
+        ("  가죽   wallet ", ["가죽 지갑"]),  # 모든 단어 포함
+        ("fashion", ["면 셔츠", "가죽 지갑"]),  # 카테고리
+        ("%", ["면 셔츠"]),  # LIKE 와일드카드는 문자 그대로
+        ("없는상품", []),
+    ],
+)
+async def test_search_matches_name_brand_category(async_client, db_session_factory, search, expected):
+    await _seed_search_products(db_session_factory)
+    data = (await async_client.get("/api/products/", params={"search": search})).json()
+    assert [p["title_ko"] for p in data["items"]] == expected
+    assert data["total"] == len(expected)
+
+
+@pytest.mark.asyncio
+async def test_relevance_sort_rejects_cursor(async_client, db_session_factory):
+    await _seed_search_products(db_session_factory)
+    response = await async_client.get("/api/products/", params={"search": "지갑", "cursor": "abc"})
+    assert response.status_code == 400
+    response = await async_client.get(
+        "/api/products/", params={"search": "지갑", "sort": "price_asc", "limit": 1}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_facets_from_summary_table(async_client, db_session_factory):
+    await _seed_search_products(db_session_factory)
+    await _refresh_facets(db_session_factory)
+
+    data = (await async_client.get("/api/products/facets")).json()
+    assert data["source"] == "summary"
+    assert data["categories"] == [{"value": "fashion", "count": 2}, {"value": "digital", "count": 1}]
+    assert [b["value"] for b in data["brands"]] == ["Nike", "Xiaomi"]
+    assert data["price_buckets"][1] == {"bucket": 1, "min": 10000, "max": 30000, "count": 3}
+
+    # 선택한 카테고리는 다른 facet에만 적용
+    data = (await async_client.get("/api/products/facets", params={"category": "fashion"})).json()
+    assert len(data["categories"]) == 2
+    assert data["brands"] == [{"value": "Nike", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_facets_refresh_only_touched_categories(async_client, db_session_factory):
+    await _seed_search_products(db_session_factory)
+    await _refresh_facets(db_session_factory)
+    async with db_session_factory() as db:
+        product = await db.scalar(select(Product).where(Product.external_id == "s-0"))
+        product.category = "fashion"
+        await db.commit()
+    await _refresh_facets(db_session_factory, ["digital", "fashion"])
+
+    data = (await async_client.get("/api/products/facets")).json()
+    assert data["categories"] == [{"value": "fashion", "count": 3}]
+
+
+@pytest.mark.asyncio
+async def test_facets_with_search_are_live_and_match_listing(async_client, db_session_factory):
+    await _seed_search_products(db_session_factory)
+    data = (await async_client.get("/api/products/facets", params={"search": "fashion"})).json()
+    assert data["source"] == "live"
+    assert data["categories"] == [{"value": "fashion", "count": 2}]
+
+    listing = (await async_client.get("/api/products/", params={"brand": "Nike", "price_bucket": 1})).json()
+    assert [p["title_ko"] for p in listing["items"]] == ["가죽 지갑"]
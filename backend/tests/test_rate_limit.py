@@ -0,0 +1,74 @@
+"""API 요청 제한 (GCRA, Redis 장애 시 로컬 제한, RateLimit-* 헤더) 검증. 테스트 환경에는 Redis가 없어 로컬 경로만 실행."""
+import pytest
+import redis
+
+from app.api import users
+from app.core import deps
+from app.core.rate_limit import LocalRateLimiter, RateLimiter
+
+
+def test_local_gcra_allows_burst_then_spaces_requests():
+    limiter = LocalRateLimiter(max_keys=100)
+    results = [limiter.hit("k", limit=3, window=60) for _ in range(4)]
+    assert [allowed for allowed, *_ in results] == [True, True, True, False]
+    assert [remaining for _, remaining, *_ in results] == [2, 1, 0, 0]
+    # 한도 소진 후에는 window/limit(20초) 뒤 1건 회복
+    assert results[-1][3] == pytest.approx(20_000, abs=50)
+    assert limiter.hit("other", limit=3, window=60)[0]
+
+
+def test_local_gcra_evicts_least_recent_keys():
+    limiter = LocalRateLimiter(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        limiter.hit(key, limit=1, window=60)
+    assert list(limiter._tat) == ["a", "c"]
+
+
+class _DownScript:
+    registered_client = None
+
+    async def __call__(self, keys, args):
+        raise redis.ConnectionError("connection refused")
+
+
+class _DownRedis:
+    def register_script(self, source):
+        script = _DownScript()
+        script.registered_client = self
+        return script
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_falls_back_to_local_when_redis_is_down(monkeypatch):
+    limiter = RateLimiter()
+    client = _DownRedis()
+    monkeypatch.setattr(limiter, "_client", lambda: None if limiter._down_until else client)
+    first = await limiter.hit("k", limit=1, window=10)
+    second = await limiter.hit("k", limit=1, window=10)
+    assert (first.allowed, second.allowed) == (True, False)
+    assert limiter._down_until > 0  # 재접속 보류
+    assert limiter.stats.as_dict() == {"allowed": 1, "limited": 1, "local": 2}
+    assert second.headers()["Retry-After"] == "10"
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limit_headers_and_429(async_client, monkeypatch):
+    limiter = RateLimiter()
+    limiter._down_until = float("inf")  # 로컬 제한
+    monkeypatch.setattr(deps, "rate_limiter", limiter)
+    monkeypatch.setattr(users.auth_rate_limit, "max_requests", 2)
+    monkeypatch.setattr(users.auth_rate_limit, "user_max_requests", 2)
+
+    body = {"email": "nobody@example.com", "password": "wrong-password"}
+    responses = [await async_client.post("/api/users/login/json", json=body) for _ in range(3)]
+    assert [r.status_code for r in responses] == [401, 401, 429]
+    assert [r.headers["RateLimit-Remaining"] for r in responses] == ["1", "0", "0"]
+    assert responses[0].headers["RateLimit-Limit"] == "2"
+    assert responses[0].headers["RateLimit-Policy"] == "2;w=60"
+    assert int(responses[2].headers["Retry-After"]) == 30
+    assert "Retry-After" not in responses[0].headers
+
+    # 라우트별로 따로 셈: 다른 로그인 라우트는 아직 허용
+    other = await async_client.post("/api/users/login", data={"username": "nobody@example.com", "password": "x"})
+    assert other.status_code == 401
+    assert other.headers["RateLimit-Remaining"] == "1"